@@ -5,10 +5,11 @@
 """
 
 import json
-import urllib.request
 from datetime import datetime
 import re
 
+from daily_tech_digest.http_pool import get_pool
+
 API_BASE_URL = "http://10.0.0.23:30080/api/knowledge_items"
 
 def fetch_all_items():
@@ -25,25 +26,26 @@ def fetch_all_items():
         print(f"  获取第 {page} 页...", end=" ")
 
         try:
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode('utf-8'))
+            # 所有分页请求复用同一个长连接
+            data = json.loads(get_pool().get(url, timeout=30).decode('utf-8'))
 
-                if total is None:
-                    total = data.get('total', 0)
-                    print(f"(总计: {total} 条)")
+            if total is None:
+                total = data.get('total', 0)
+                print(f"(总计: {total} 条)")
 
-                items = data.get('items', [])
-                all_items.extend(items)
-                print(f"已获取 {len(items)} 条, 累计 {len(all_items)} 条")
+            items = data.get('items', [])
+            all_items.extend(items)
+            print(f"已获取 {len(items)} 条, 累计 {len(all_items)} 条")
 
-                if len(all_items) >= total:
-                    break
+            if len(all_items) >= total:
+                break
 
-                page += 1
+            page += 1
         except Exception as e:
             print(f"❌ 获取数据失败: {e}")
             break
 
+    print(f"🔌 连接池: {get_pool().format_stats()}")
     return all_items
 
 def check_spelling_basic(word):
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+每日技术摘要
+
+流水线：fetch → parse → normalize → dedupe → score → select → enrich → render → deliver，
+原来的七个 daily_tech_digest_* 脚本对应 config.VARIANTS 中的方案。
+
+命令行入口：python3 -m daily_tech_digest [--variant NAME] [--test]
+性能基准：python3 -m daily_tech_digest.benchmark [--scales 10,1000,100000]
+"""
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+import sys
+
+from daily_tech_digest.cli import main
+
+sys.exit(main())
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+增量文章库（SQLite）
+文章按（源, 规范化链接）保存，每个源记录已见过的最新发布时间（高水位）；
+下次运行只解析比高水位更新的文章，已有文章的新鲜度和分数用 SQL 就地更新
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from daily_tech_digest.config import ARTICLE_DB_FILE
+from daily_tech_digest.dedupe import canonical_url
+
+RETENTION_DAYS = 30
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS articles (
+    url_key TEXT NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    published TEXT,
+    summary TEXT,
+    pub_ts INTEGER,
+    first_seen INTEGER NOT NULL,
+    freshness INTEGER DEFAULT 5,
+    topic_hits INTEGER,
+    topics_key TEXT,
+    score REAL,
+    PRIMARY KEY (source, url_key)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source_pub ON articles (source, pub_ts);
+CREATE TABLE IF NOT EXISTS watermarks (
+    source TEXT PRIMARY KEY,
+    pub_ts INTEGER NOT NULL
+);
+'''
+
+# 与 scoring.calculate_freshness 相同的分档
+_FRESHNESS_SQL = '''
+UPDATE articles SET freshness = CASE
+    WHEN pub_ts IS NULL THEN 5
+    WHEN (:now - pub_ts) / 86400 <= 1 THEN 10
+    WHEN (:now - pub_ts) / 86400 <= 3 THEN 8
+    WHEN (:now - pub_ts) / 86400 <= 7 THEN 6
+    WHEN (:now - pub_ts) / 86400 <= 14 THEN 4
+    WHEN (:now - pub_ts) / 86400 <= 30 THEN 2
+    ELSE 0 END
+'''
+
+_COLUMNS = ('url_key', 'source', 'title', 'link', 'published', 'summary', 'pub_ts',
+            'freshness', 'topic_hits', 'topics_key')
+
+
+class ArticleStore:
+    def __init__(self, path: str = ARTICLE_DB_FILE):
+        self.path = path
+        # 抓取线程只读高水位，写入都在主线程，一个连接加锁即可
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+
+    def watermarks(self, now_ts: Optional[int] = None) -> Dict[str, int]:
+        """各源已入库文章的最新发布时间；晚于 now_ts 的（日期错误或时钟偏差）按 now_ts 计算，不挡住之后的新文章"""
+        with self._lock:
+            marks = dict(self.conn.execute('SELECT source, pub_ts FROM watermarks'))
+        if now_ts is not None:
+            marks = {source: min(pub_ts, now_ts) for source, pub_ts in marks.items()}
+        return marks
+
+    def add(self, articles: Iterable[Dict], now_ts: int) -> int:
+        """保存新文章（同一源已存在的链接忽略），返回实际新增的篇数，并更新各源高水位"""
+        rows = []
+        for article in articles:
+            url_key = article.get('url_key') or canonical_url(article['link'])
+            article['url_key'] = url_key
+            rows.append((url_key, article['source'], article['title'], article['link'],
+                         article.get('published', ''), article.get('summary', ''),
+                         article.get('pub_ts'), now_ts))
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO articles (url_key, source, title, link, published, summary, pub_ts, first_seen)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            added = self.conn.total_changes - before
+            self.conn.execute(
+                'INSERT OR REPLACE INTO watermarks (source, pub_ts)'
+                ' SELECT source, MAX(pub_ts) FROM articles WHERE pub_ts IS NOT NULL GROUP BY source')
+        return added
+
+    def refresh_freshness(self, now_ts: int):
+        """按当前时间就地重算所有文章的新鲜度"""
+        with self._lock, self.conn:
+            self.conn.execute(_FRESHNESS_SQL, {'now': now_ts})
+
+    def candidates(self, source: str, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        """某个源最新的文章（since 为最早发布时间戳，不含）"""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM articles WHERE source = ?"
+        params: list = [source]
+        if since is not None:
+            sql += ' AND (pub_ts IS NULL OR pub_ts > ?)'
+            params.append(since)
+        sql += ' ORDER BY pub_ts IS NULL, pub_ts DESC, first_seen DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        articles = []
+        for row in rows:
+            article = dict(zip(_COLUMNS, row))
+            article['freshness_score'] = article.pop('freshness')
+            articles.append(article)
+        return articles
+
+    def update_scores(self, articles: Iterable[Dict]):
+        """保存主题命中数和分数，主题不变时下次直接复用"""
+        rows = [(a.get('topic_hits'), a.get('topics_key'), a.get('score'), a['source'], a['url_key'])
+                for a in articles if a.get('url_key')]
+        with self._lock, self.conn:
+            self.conn.executemany('UPDATE articles SET topic_hits = ?, topics_key = ?, score = ?'
+                                  ' WHERE source = ? AND url_key = ?',
+                                  rows)
+
+    def prune(self, now_ts: int, retention_days: int = RETENTION_DAYS) -> int:
+        """删除超过保留天数的文章"""
+        oldest = now_ts - retention_days * 86400
+        with self._lock, self.conn:
+            cursor = self.conn.execute('DELETE FROM articles WHERE COALESCE(pub_ts, first_seen) < ?', (oldest,))
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
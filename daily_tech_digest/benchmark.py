@@ -0,0 +1,633 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准
+把 fixtures/ 中录制的 RSS/Atom 样本按指定篇数放大，由本地 HTTP 服务回放（可设置延迟、错误率和摘要长度），
+分别测量解析、选择、抓取和完整摘要生成在 10 ~ 100k 篇文章规模下的耗时、峰值内存和内存分配，
+以及命令行冷启动的耗时和 -X importtime 导入开销、多个进程同时记录点击和归档时偏好数据是否完整，
+结果输出为 JSON，可与上一次的结果对比：
+
+    python3 -m daily_tech_digest.benchmark                                  # 默认规模 10,1000,10000
+    python3 -m daily_tech_digest.benchmark --scales 10,100000 --latency 50 --error-rate 0.1
+    python3 -m daily_tech_digest.benchmark --output bench.json --compare old_bench.json
+    python3 -m daily_tech_digest.benchmark --cases startup                  # 只测启动耗时
+    python3 -m daily_tech_digest.benchmark --cases writers --writers 16     # 16 个进程并发记录点击
+
+每个用例在独立的子进程中运行（状态文件放在临时目录），峰值内存互不影响
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import gzip
+import hashlib
+import http.server
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DEFAULT_SCALES = [10, 1000, 10000]
+CASES = ('startup', 'writers', 'parse', 'select', 'fetch', 'digest')
+# startup 用例：冷启动执行的命令（python 之后的参数）
+STARTUP_COMMANDS = {
+    'list': ['-m', 'daily_tech_digest', '--list'],
+    'simple': ['-m', 'daily_tech_digest', '--variant', 'simple', '--test'],
+    'pipeline': ['-c', 'import daily_tech_digest.pipeline'],
+}
+TOP_IMPORTS = 8
+# writers 用例：journal 为点击日志 + 锁，rewrite 为原来不加锁的整文件读改写（对照）
+WRITER_VARIANTS = ('journal', 'rewrite')
+# 使用 Atom 格式回放的源
+ATOM_SOURCES = ('github_trending',)
+
+
+# ---------- 样本 ----------
+
+def load_fixture_items() -> List[Dict]:
+    """读取 fixtures/ 下所有样本中的文章"""
+    from daily_tech_digest.stream_parser import iter_feed_items
+
+    items = []
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+            items.extend(iter_feed_items([f.read()]))
+    return items
+
+
+def build_feed(items: List[Dict], count: int, source_key: str, now_ts: int,
+               summary_bytes: int = 200, atom: bool = False) -> bytes:
+    """
+    用样本文章生成 count 篇的 feed
+
+    标题由样本标题中的词随机组合（避免被标题指纹去重），链接按源和序号区分，
+    发布时间从 now_ts 开始均匀分布在最近 30 天内
+    """
+    rng = random.Random(f"{source_key}:{count}")
+    words = [w for item in items for w in item['title'].split()] or ['article']
+    span = 30 * 86400 / max(count, 1)
+
+    parts = []
+    for i in range(count):
+        sample = items[i % len(items)]
+        title = ' '.join(rng.choice(words) for _ in range(6))
+        link = f"{sample['link'].rstrip('/')}/{source_key}-{i}"
+        summary = (sample['summary'] * (summary_bytes // max(len(sample['summary']), 1) + 1))[:summary_bytes]
+        pub_ts = now_ts - int(i * span)
+        if atom:
+            updated = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(pub_ts))
+            parts.append(f'<entry><title>{escape(title)}</title><link href="{escape(link)}" rel="alternate"/>'
+                         f'<updated>{updated}</updated><summary>{escape(summary)}</summary></entry>')
+        else:
+            pub_date = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(pub_ts))
+            parts.append(f'<item><title>{escape(title)}</title><link>{escape(link)}</link>'
+                         f'<pubDate>{pub_date}</pubDate><description>{escape(summary)}</description></item>')
+
+    if atom:
+        head = f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>{source_key}</title>'
+        tail = '</feed>'
+    else:
+        head = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{source_key}</title>'
+        tail = '</channel></rss>'
+    return (head + ''.join(parts) + tail).encode('utf-8')
+
+
+# ---------- 本地 HTTP 服务 ----------
+
+class _QuietHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 流式解析取够文章后客户端会提前断开，属于正常情况
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class BenchServer:
+    """
+    在后台线程中回放 feed：GET /<source_key>
+
+    latency 为每个请求的延迟（秒），error_rate 为返回 503 的比例；支持 ETag/304 和 gzip
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.feeds: Dict[str, tuple] = {}
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                feed = server.feeds.get(self.path.lstrip('/').split('?')[0])
+                if feed is None or random.random() < server.error_rate:
+                    self.send_response(404 if feed is None else 503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body, gzipped, etag = feed
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/xml')
+                self.send_header('ETag', etag)
+                if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                    body = gzipped
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = _QuietHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def set_feed(self, source_key: str, body: bytes):
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        self.feeds[source_key] = (body, gzip.compress(body, 6), etag)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        return False
+
+
+# ---------- 子进程中执行的用例 ----------
+
+def _synthetic_articles(count: int) -> List[Dict]:
+    rng = random.Random(count)
+    categories = ['programming', 'ai', 'product']
+    return [{'title': f'article {i}', 'link': f'https://bench.local/{i}', 'category': rng.choice(categories),
+             'score': rng.randint(40, 120), 'source': 'bestblogs_featured'} for i in range(count)]
+
+
+def _case_func(spec: Dict):
+    """返回执行一次用例的函数；fetch/digest 第一次执行时缓存为空，之后为热缓存"""
+    case, scale = spec['case'], spec['scale']
+
+    if case == 'parse':
+        from daily_tech_digest.config import get_variant
+        from daily_tech_digest.pipeline import DigestRun
+        from daily_tech_digest.stages import get_backend
+        from daily_tech_digest.stream_parser import CHUNK_SIZE
+
+        body = build_feed(load_fixture_items(), scale, 'bench', int(time.time()), spec['summary_bytes'])
+        chunks = [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+        config = dict(get_variant('system'), max_items=None, max_age_days=None)
+        run = DigestRun(config)
+        parse = get_backend('parse', spec['variant'])
+        return lambda: parse(iter(chunks), run)
+
+    if case == 'select':
+        from daily_tech_digest.config import DEFAULT_RATIOS
+        from daily_tech_digest.selection import select_articles, select_top
+
+        articles = _synthetic_articles(scale)
+        if spec['variant'] == 'top':
+            return lambda: select_top(iter(articles))
+        return lambda: select_articles(iter(articles), DEFAULT_RATIOS)
+
+    # fetch / digest：源地址指向本地服务
+    from daily_tech_digest.config import RSS_SOURCES
+    from daily_tech_digest.pipeline import DigestPipeline
+
+    for key, source in RSS_SOURCES.items():
+        source['url'] = f"{spec['server']}/{key}"
+    overrides = {'use_preferences': False, 'retries': 0, 'deadline': spec['deadline'], 'metrics': False}
+
+    def run_once():
+        pipeline = DigestPipeline.from_variant(spec['variant'], test_mode=True, **overrides)
+        if case == 'fetch':
+            return pipeline.run(stages=('fetch',))
+        return pipeline.run()
+
+    return run_once
+
+
+def peak_rss_kb() -> int:
+    """进程峰值内存（KB）；Linux 上读 VmHWM，ru_maxrss 会带上 fork 时父进程的内存"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_child(spec: Dict) -> Dict:
+    """在当前进程中执行用例并返回测量结果"""
+    func = _case_func(spec)
+    sink = io.StringIO()
+    result = dict(spec)
+    result.pop('server', None)
+
+    timings = []
+    for _ in range(spec['repeat']):
+        gc.collect()
+        with contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        sink.seek(0)
+        sink.truncate()
+
+    # 单独再跑一次统计内存分配（tracemalloc 会明显拖慢执行，不计入耗时）
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(sink):
+        func()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result.update({
+        'wall_seconds': round(timings[0], 6),
+        'wall_seconds_warm': round(min(timings[1:]), 6) if len(timings) > 1 else None,
+        'peak_rss_kb': peak_rss_kb(),
+        'alloc_peak_bytes': alloc_peak,
+        'alloc_net_blocks': sys.getallocatedblocks() - blocks_before,
+    })
+    return result
+
+
+# ---------- 并发写入 ----------
+
+def _bench_click(writer: int, i: int, old: bool) -> Dict:
+    from daily_tech_digest.click_journal import make_click
+
+    # 一半点击的时间在一年多以前，供归档进程移走
+    stamp = datetime.datetime.now() - datetime.timedelta(days=400 if old else 0)
+    return make_click(f'writer {writer} click {i}', f'https://bench.local/{writer}/{i}', 'ai', ['python'],
+                      'hackernews', timestamp=stamp.isoformat())
+
+
+def _wait_start(spec: Dict):
+    # 所有子进程约定同一时刻开始，尽量同时写入
+    time.sleep(max(0.0, spec['start_at'] - time.time()))
+
+
+def run_writer(spec: Dict) -> Dict:
+    """并发写入子进程：writer 记录点击（journal 通过点击日志，rewrite 模拟原来的整文件读改写），archiver 反复归档"""
+    import daily_tech_digest.click_journal as click_journal
+    from daily_tech_digest.config import USER_PREFERENCES_FILE
+
+    click_journal.COMPACT_BYTES = spec['compact_bytes']
+    stats = {'clicks': 0, 'errors': 0, 'compactions': 0, 'archive_rounds': 0}
+    _wait_start(spec)
+
+    if spec['role'] == 'writer' and spec['variant'] == 'rewrite':
+        for i in range(spec['clicks']):
+            try:
+                data = click_journal.PreferenceStore(USER_PREFERENCES_FILE)._load_snapshot()
+                click_journal.apply_click(data, _bench_click(spec['writer'], i, i % 2 == 0))
+                with open(USER_PREFERENCES_FILE, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                stats['clicks'] += 1
+            except (OSError, ValueError):
+                stats['errors'] += 1
+        return stats
+
+    store = click_journal.PreferenceStore(USER_PREFERENCES_FILE)
+    if spec['role'] == 'writer':
+        for i in range(spec['clicks']):
+            store.record(_bench_click(spec['writer'], i, i % 2 == 0))
+            stats['clicks'] += 1
+            if store.needs_compaction() and store.compact(only_if_needed=True) is not None:
+                stats['compactions'] += 1
+        store.close()
+        return stats
+
+    # archiver：把一年前的点击移到压缩归档文件，直到 writer 全部结束
+    from daily_tech_digest.click_archive import ClickArchive
+
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=365)
+    archive = ClickArchive(USER_PREFERENCES_FILE)
+
+    while True:
+        finished = os.path.exists(spec['done_flag'])
+        try:
+            archive.archive(store, cutoff)
+            stats['archive_rounds'] += 1
+        except click_journal.ConflictError:
+            stats['errors'] += 1
+        if finished:
+            break
+        time.sleep(spec['archive_interval'])
+    store.close()
+    return stats
+
+
+def _spawn_writer(spec: Dict, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, '-m', 'daily_tech_digest.benchmark', '--writer', json.dumps(spec)],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
+
+
+def _collect(proc: subprocess.Popen) -> Dict:
+    stdout, stderr = proc.communicate()
+    if proc.returncode != 0:
+        return {'error': stderr.strip().splitlines()[-1] if stderr.strip() else 'failed'}
+    return json.loads(stdout.strip().splitlines()[-1])
+
+
+def measure_writers(variant: str, writers: int, clicks: int, compact_bytes: int = 16 * 1024) -> Dict:
+    """
+    多个进程同时记录点击，journal 方案另有一个进程同时归档；结束后检查每条点击
+    恰好出现一次（偏好数据或归档文件中），以及类别计数是否等于点击总数
+    """
+    from daily_tech_digest.click_archive import ClickArchive
+    from daily_tech_digest.click_journal import PreferenceStore
+
+    result = {'case': 'writers', 'variant': variant, 'scale': writers * clicks, 'writers': writers}
+    with tempfile.TemporaryDirectory(prefix='digest-bench-') as workspace:
+        env = _child_env(workspace)
+        base = {'variant': variant, 'clicks': clicks, 'compact_bytes': compact_bytes,
+                'start_at': time.time() + 0.5, 'done_flag': os.path.join(workspace, 'writers.done'),
+                'archive_interval': 0.05}
+        start = time.perf_counter()
+        procs = [_spawn_writer(dict(base, role='writer', writer=w), env) for w in range(writers)]
+        archiver = _spawn_writer(dict(base, role='archiver'), env) if variant == 'journal' else None
+        stats = [_collect(proc) for proc in procs]
+        wall = time.perf_counter() - start - 0.5
+        with open(base['done_flag'], 'w'):
+            pass
+        if archiver is not None:
+            stats.append(_collect(archiver))
+        errors = [s['error'] for s in stats if 'error' in s]
+        if errors:
+            return dict(result, error=errors[0])
+
+        path = os.path.join(workspace, 'user_preferences.json')
+        try:
+            data = PreferenceStore(path).load()
+        except ValueError as e:
+            return dict(result, error=f'偏好文件已损坏: {e}')
+        seen = [c['articleUrl'] for c in data['clickHistory']]
+        seen.extend(c['articleUrl'] for c in ClickArchive(path).iter_range())
+
+    expected = writers * clicks
+    unique = len(set(seen))
+    result.update({
+        'wall_seconds': round(wall, 6),
+        'clicks_per_second': round(expected / wall, 1) if wall > 0 else None,
+        'lost': expected - unique,
+        'duplicated': len(seen) - unique,
+        'archived': len(seen) - len(data['clickHistory']),
+        'counter_drift': data['preferences']['categories']['ai']['clicks'] - expected,
+        'compactions': sum(s['compactions'] for s in stats),
+        'archive_rounds': sum(s['archive_rounds'] for s in stats),
+        'write_errors': sum(s['errors'] for s in stats),
+    })
+    return result
+
+
+# ---------- 主进程 ----------
+
+def _child_env(workspace: str) -> Dict[str, str]:
+    env = dict(os.environ, OPENCLAW_WORKSPACE=workspace)
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = package_root + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def parse_importtime(stderr: str) -> List[tuple]:
+    """解析 -X importtime 的输出，返回 [(模块, 自身耗时 µs, 累计耗时 µs)]"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure_startup(name: str, repeat: int) -> Dict:
+    """冷启动耗时：先正常执行 repeat 次计时，再加 -X importtime 执行一次统计导入开销"""
+    command = [sys.executable] + STARTUP_COMMANDS[name]
+    result = {'case': 'startup', 'variant': name, 'scale': 0, 'repeat': repeat}
+    with tempfile.TemporaryDirectory(prefix='digest-bench-') as workspace:
+        env = _child_env(workspace)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            proc = subprocess.run(command, capture_output=True, text=True, env=env)
+            timings.append(time.perf_counter() - start)
+            if proc.returncode != 0:
+                return dict(result, error=proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed')
+        proc = subprocess.run([sys.executable, '-X', 'importtime'] + STARTUP_COMMANDS[name],
+                              capture_output=True, text=True, env=env)
+
+    modules = parse_importtime(proc.stderr)
+    package_us = sum(self_us for module, self_us, _ in modules if module.startswith('daily_tech_digest'))
+    result.update({
+        'wall_seconds': round(timings[0], 6),
+        'wall_seconds_warm': round(min(timings[1:]), 6) if len(timings) > 1 else None,
+        'import_seconds': round(sum(self_us for _, self_us, _ in modules) / 1e6, 6),
+        'package_import_seconds': round(package_us / 1e6, 6),
+        'modules': len(modules),
+        'top_imports': [[module, round(self_us / 1000, 2)]
+                        for module, self_us, _ in sorted(modules, key=lambda m: -m[1])[:TOP_IMPORTS]],
+    })
+    return result
+
+
+def _variants_for(case: str, variants: List[str]) -> List[str]:
+    if case == 'startup':
+        return list(STARTUP_COMMANDS)
+    if case == 'parse':
+        names = ['stdlib', 'auto']
+        try:
+            import feedparser  # noqa: F401
+            names.append('feedparser')
+        except ImportError:
+            pass
+        return names
+    if case == 'select':
+        return ['ratio', 'top']
+    if case == 'fetch':
+        return [v for v in variants if v != 'simple']
+    return variants
+
+
+def _spawn(spec: Dict, workspace: str) -> Dict:
+    env = _child_env(workspace)
+    proc = subprocess.run([sys.executable, '-m', 'daily_tech_digest.benchmark', '--child', json.dumps(spec)],
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        return dict(spec, error=proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed')
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(scales: List[int], cases: List[str], variants: List[str], latency: float = 0.0,
+                   error_rate: float = 0.0, summary_bytes: int = 200, repeat: int = 2,
+                   deadline: float = 60, writers: int = 8, writer_clicks: int = 200) -> Dict:
+    from daily_tech_digest.config import RSS_SOURCES
+
+    results = []
+    if 'startup' in cases:
+        for name in _variants_for('startup', variants):
+            results.append(measure_startup(name, max(repeat, 2)))
+            _print_result(results[-1])
+        cases = [case for case in cases if case != 'startup']
+    if 'writers' in cases:
+        for name in WRITER_VARIANTS:
+            results.append(measure_writers(name, writers, writer_clicks))
+            _print_result(results[-1])
+        cases = [case for case in cases if case != 'writers']
+
+    items = load_fixture_items()
+    with BenchServer(latency, error_rate) as server:
+        for scale in scales if cases else []:
+            # 每个源放 scale 篇，所有源使用同一批样本
+            now_ts = int(time.time())
+            for key in RSS_SOURCES:
+                server.set_feed(key, build_feed(items, scale, key, now_ts, summary_bytes, key in ATOM_SOURCES))
+
+            for case in cases:
+                for variant in _variants_for(case, variants):
+                    spec = {'case': case, 'variant': variant, 'scale': scale, 'server': server.url,
+                            'summary_bytes': summary_bytes, 'repeat': repeat, 'deadline': deadline}
+                    with tempfile.TemporaryDirectory(prefix='digest-bench-') as workspace:
+                        result = _spawn(spec, workspace)
+                    results.append(result)
+                    _print_result(result)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'latency': latency,
+            'error_rate': error_rate,
+            'summary_bytes': summary_bytes,
+        },
+        'results': results,
+    }
+
+
+def _key(result: Dict) -> tuple:
+    return result['case'], result['variant'], result['scale']
+
+
+def _print_result(result: Dict):
+    if 'error' in result:
+        print(f"  ❌ {result['case']:<7} {result['variant']:<11} {result['scale']:>7}  {result['error']}",
+              file=sys.stderr)
+        return
+    if result['case'] == 'startup':
+        top = ', '.join(f"{module} {ms:.1f}ms" for module, ms in result['top_imports'][:3])
+        print(f"  {result['case']:<7} {result['variant']:<11} {'-':>7}  "
+              f"{result['wall_seconds'] * 1000:>9.1f}ms  导入 {result['import_seconds'] * 1000:.1f}ms"
+              f"（{result['modules']} 个模块，本包 {result['package_import_seconds'] * 1000:.1f}ms）  {top}",
+              file=sys.stderr)
+        return
+    if result['case'] == 'writers':
+        flag = '✅' if not result['lost'] and not result['duplicated'] and not result['counter_drift'] else '⚠️'
+        print(f"  {result['case']:<7} {result['variant']:<11} {result['scale']:>7}  "
+              f"{result['wall_seconds'] * 1000:>9.1f}ms  {result['clicks_per_second']:.0f} 次/秒  "
+              f"{flag} 丢失 {result['lost']} 重复 {result['duplicated']} 计数偏差 {result['counter_drift']}  "
+              f"归档 {result['archived']}（{result['archive_rounds']} 轮） 合并 {result['compactions']} 次 "
+              f"错误 {result['write_errors']}", file=sys.stderr)
+        return
+    print(f"  {result['case']:<7} {result['variant']:<11} {result['scale']:>7}  "
+          f"{result['wall_seconds'] * 1000:>9.1f}ms  rss {result['peak_rss_kb'] / 1024:>7.1f}MB  "
+          f"alloc {result['alloc_peak_bytes'] / 1024 / 1024:>7.1f}MB", file=sys.stderr)
+
+
+def compare(current: Dict, previous: Dict) -> List[str]:
+    """与上一次的结果逐项比较耗时"""
+    old = {_key(r): r for r in previous.get('results', []) if 'error' not in r}
+    lines = []
+    for result in current['results']:
+        before = old.get(_key(result))
+        if before is None or 'error' in result:
+            continue
+        ratio = result['wall_seconds'] / before['wall_seconds'] if before['wall_seconds'] else 0
+        flag = '⚠️' if ratio > 1.2 else '✅' if ratio < 0.8 else '  '
+        lines.append(f"{flag} {result['case']:<7} {result['variant']:<11} {result['scale']:>7}  "
+                     f"{before['wall_seconds'] * 1000:>9.1f}ms → {result['wall_seconds'] * 1000:>9.1f}ms "
+                     f"（×{ratio:.2f}）")
+    return lines
+
+
+def main(argv=None) -> int:
+    from daily_tech_digest.config import VARIANTS
+
+    parser = argparse.ArgumentParser(description='每日技术摘要性能基准')
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)), help='每个源的文章数，逗号分隔')
+    parser.add_argument('--cases', default=','.join(CASES), help=f"用例（{', '.join(CASES)}）")
+    parser.add_argument('--variants', default=','.join(VARIANTS), help='fetch/digest 用例使用的方案')
+    parser.add_argument('--latency', type=float, default=0.0, help='本地服务每个请求的延迟（毫秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='本地服务返回 503 的比例')
+    parser.add_argument('--summary-bytes', type=int, default=200, help='每篇文章摘要的长度')
+    parser.add_argument('--repeat', type=int, default=2, help='每个用例的执行次数（第一次为冷缓存）')
+    parser.add_argument('--output', help='结果 JSON 文件（默认输出到标准输出）')
+    parser.add_argument('--compare', help='与之前的结果 JSON 比较')
+    parser.add_argument('--writers', type=int, default=8, help='writers 用例中并发记录点击的进程数')
+    parser.add_argument('--writer-clicks', type=int, default=200, help='writers 用例中每个进程记录的点击数')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--writer', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(json.loads(args.child)), ensure_ascii=False))
+        return 0
+    if args.writer:
+        print(json.dumps(run_writer(json.loads(args.writer)), ensure_ascii=False))
+        return 0
+
+    report = run_benchmarks(
+        scales=[int(s) for s in args.scales.split(',') if s],
+        cases=[c for c in args.cases.split(',') if c],
+        variants=[v for v in args.variants.split(',') if v],
+        latency=args.latency / 1000,
+        error_rate=args.error_rate,
+        summary_bytes=args.summary_bytes,
+        repeat=max(1, args.repeat),
+        writers=max(1, args.writers),
+        writer_clicks=max(1, args.writer_clicks),
+    )
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+        print(f"✅ 结果已保存到: {args.output}", file=sys.stderr)
+    else:
+        print(data)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        print("\n📊 与之前结果比较：", file=sys.stderr)
+        for line in compare(report, previous):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+每日技术摘要命令行入口
+
+用法：
+    python3 -m daily_tech_digest                      # 默认方案（system），生成并推送
+    python3 -m daily_tech_digest --test               # 测试模式（只显示不推送）
+    python3 -m daily_tech_digest --variant bestblogs  # 使用原 daily_tech_digest_bestblogs.py 的方案
+    python3 -m daily_tech_digest --list               # 列出所有方案
+    python3 -m daily_tech_digest --poll-once          # 后台刷新到期的源（配合 cron）
+    python3 -m daily_tech_digest --fetch pool         # 只从后台轮询的候选池选择并渲染
+    python3 -m daily_tech_digest --deliver channels   # 直接推送到 delivery.channels 配置的渠道
+    python3 -m daily_tech_digest --sink /tmp/daily_tech_digest.sock  # 本地接收端（配合 socket 渠道）
+"""
+
+import argparse
+
+from daily_tech_digest.config import VARIANTS
+from daily_tech_digest.stages import STAGES, backend_names
+
+DEFAULT_VARIANT_NAME = "system"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='每日技术摘要推送系统')
+    parser.add_argument('--variant', default=DEFAULT_VARIANT_NAME, choices=list(VARIANTS),
+                        help=f'运行方案（默认 {DEFAULT_VARIANT_NAME}）')
+    parser.add_argument('--test', action='store_true', help='测试模式（只显示不推送）')
+    parser.add_argument('--list', action='store_true', help='列出所有方案和各阶段可用后端')
+    parser.add_argument('--timings', action='store_true', help='输出各阶段耗时')
+    parser.add_argument('--prometheus', metavar='PATH', help='同时以 Prometheus 文本格式写入运行指标')
+    parser.add_argument('--sink', metavar='SOCKET', help='作为本地接收端监听 Unix socket，打印收到的摘要')
+    parser.add_argument('--poll', action='store_true', help='常驻后台，按各源间隔刷新候选池')
+    parser.add_argument('--poll-once', action='store_true', help='刷新一次到期的源后退出')
+    for stage in STAGES:
+        parser.add_argument(f'--{stage}', dest=f'backend_{stage}', metavar='BACKEND',
+                            help=f'替换 {stage} 阶段的后端')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.list:
+        import daily_tech_digest.pipeline  # noqa: F401  注册各阶段后端
+        print("可用方案：")
+        for name, variant in VARIANTS.items():
+            print(f"  {name:<12} {variant['description']}")
+        print("\n各阶段后端：")
+        for stage in STAGES:
+            print(f"  {stage:<10} {', '.join(backend_names(stage))}")
+        return 0
+
+    if args.sink:
+        from daily_tech_digest.deliver import serve_socket
+        try:
+            serve_socket(args.sink)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.poll or args.poll_once:
+        from daily_tech_digest.poller import FeedPoller
+        poller = FeedPoller(args.variant)
+        if args.poll:
+            poller.run_forever()
+        elif not poller.poll_once():
+            print("✅ 没有到期的源")
+        return 0
+
+    # 流水线和指标模块只在真正运行时导入，--list/--sink 等保持快速启动
+    from daily_tech_digest.metrics import collect, format_summary, write_prometheus
+    from daily_tech_digest.pipeline import DigestPipeline, format_timings
+
+    backends = {stage: getattr(args, f'backend_{stage}') for stage in STAGES
+                if getattr(args, f'backend_{stage}')}
+
+    print("🚀 每日技术摘要推送系统启动")
+    print("=" * 50)
+
+    pipeline = DigestPipeline.from_variant(args.variant, test_mode=args.test, backends=backends)
+    run = pipeline.run()
+
+    if args.timings or args.test:
+        print(format_timings(run))
+    if args.test and (run.source_metrics or run.delivery_metrics):
+        print(format_summary(run.metrics or collect(run)))
+    if args.prometheus:
+        write_prometheus(run.metrics or collect(run), args.prometheus)
+
+    if args.test:
+        return 0
+    if run.delivered:
+        print("\n✅ 推送任务已完成")
+        return 0
+    print("\n❌ 推送任务失败")
+    return 1
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+点击归档
+旧点击逐条写入 gzip 压缩的 JSON lines 文件（user_preferences_archive/clicks_*.jsonl.gz），不再整体 dump；
+点击历史按时间排序时从头扫描到截止时间就停止。manifest.json 记录每个归档文件的时间范围和条数，
+按时间查询归档时跳过范围不相交的文件
+"""
+
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from daily_tech_digest.click_index import click_time
+from daily_tech_digest.click_journal import PreferenceStore
+from daily_tech_digest.config import USER_PREFERENCES_FILE
+
+MANIFEST_VERSION = 1
+ARCHIVE_SUFFIX = '.jsonl.gz'
+
+
+def archive_dir_for(preferences_path: str) -> str:
+    """user_preferences.json → user_preferences_archive/"""
+    base = preferences_path[:-5] if preferences_path.endswith('.json') else preferences_path
+    return base + '_archive'
+
+
+def plan(data: Dict, cutoff) -> Tuple[int, List[Dict], Dict]:
+    """
+    返回 (要归档的条数, 保留的点击, 点击历史的排序状态)；要归档的点击是 clickHistory 的前若干条时，
+    保留的点击就是其余部分。historyOrder 表明点击历史按时间排序时扫描到第一条不早于 cutoff 的点击即停止，
+    否则完整扫描一遍，把早于 cutoff 的点击按时间排好挪到前面并重新得到排序状态（归档文件内总是按时间排序）
+    """
+    history = data["clickHistory"]
+    cutoff_ts = click_time(cutoff)
+    order = data.get("historyOrder")
+
+    if order and order.get("ordered"):
+        count = 0
+        for click in history:
+            ts = click_time(click.get("timestamp"))
+            if ts is None or ts >= cutoff_ts:
+                break
+            count += 1
+        return count, history[count:], order
+
+    old, kept = [], []
+    ordered, last = True, None
+    for click in history:
+        ts = click_time(click.get("timestamp"))
+        if ts is None:
+            # 无法解析时间的点击保留在点击历史中
+            ordered = False
+            kept.append(click)
+            continue
+        if last is not None and ts < last:
+            ordered = False
+        last = ts if last is None else max(last, ts)
+        (old if ts < cutoff_ts else kept).append(click)
+    old.sort(key=lambda click: click_time(click["timestamp"]))
+    history[:] = old + kept
+    return len(old), kept, {"ordered": ordered, "last": last}
+
+
+class ClickArchive:
+    """归档目录：压缩的点击文件 + manifest.json"""
+
+    def __init__(self, preferences_path: str = USER_PREFERENCES_FILE):
+        self.directory = archive_dir_for(preferences_path)
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+
+    def entries(self) -> List[Dict]:
+        """manifest 中的归档文件，按归档先后排列"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('archives', [])
+        except (OSError, ValueError):
+            return []
+
+    def _save_manifest(self, entries: List[Dict]):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'archives': entries}, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def _write(self, clicks) -> Tuple[str, Dict]:
+        """逐条写入临时的压缩文件，返回 (临时路径, manifest 条目)"""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f".{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        count, first, last = 0, None, None
+        try:
+            with open(tmp_path, 'wb') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as gz:
+                    for click in clicks:
+                        gz.write((json.dumps(click, ensure_ascii=False) + '\n').encode('utf-8'))
+                        ts = click_time(click.get("timestamp"))
+                        if first is None or ts < first[0]:
+                            first = (ts, click["timestamp"])
+                        if last is None or ts > last[0]:
+                            last = (ts, click["timestamp"])
+                        count += 1
+                raw.flush()
+                os.fsync(raw.fileno())
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        start, end = first[1], last[1]
+        span = f"{start[:10].replace('-', '')}_{end[:10].replace('-', '')}"
+        name = f"clicks_{span}_{uuid.uuid4().hex[:6]}{ARCHIVE_SUFFIX}"
+        return tmp_path, {'file': name, 'start': start, 'end': end, 'count': count,
+                          'archivedAt': datetime.now().isoformat()}
+
+    def archive(self, store: PreferenceStore, cutoff) -> Tuple[Dict, Optional[Dict]]:
+        """
+        把早于 cutoff 的点击移入新的归档文件，返回 (归档后的偏好数据, manifest 条目)；没有旧点击时条目为 None。
+        压缩写入在锁外进行，锁内只做文件改名、更新 manifest 和保存快照；
+        其他进程同时保存过快照时重新读取再归档（PreferenceStore.update）
+        """
+        pending = []
+
+        def discard():
+            for path in pending:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            pending.clear()
+
+        def mutate(data: Dict):
+            discard()  # 上一次尝试因冲突作废的临时文件
+            count, kept, order = plan(data, cutoff)
+            if not count:
+                return None
+            tmp_path, entry = self._write(islice(data["clickHistory"], count))
+            pending.append(tmp_path)
+            data["clickHistory"] = kept
+            data["historyOrder"] = order
+            return tmp_path, entry
+
+        def commit(result):
+            # 先落归档文件和 manifest 再写快照：中途崩溃时点击可能同时留在两边，但不会丢失
+            tmp_path, entry = result
+            os.replace(tmp_path, os.path.join(self.directory, entry['file']))
+            pending.clear()
+            self._save_manifest(self.entries() + [entry])
+
+        try:
+            data, result = store.update(mutate, commit)
+        finally:
+            discard()
+        return data, result[1] if result else None
+
+    def read(self, entry: Dict) -> Iterator[Dict]:
+        """逐条读取一个归档文件"""
+        with gzip.open(os.path.join(self.directory, entry['file']), 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def iter_range(self, start=None, end=None) -> Iterator[Dict]:
+        """归档中 start <= 时间 <= end 的点击；时间范围与查询不相交的归档文件不打开"""
+        start_ts = None if start is None else click_time(start)
+        end_ts = None if end is None else click_time(end)
+        for entry in sorted(self.entries(), key=lambda e: click_time(e['start'])):
+            if (start_ts is not None and click_time(entry['end']) < start_ts) or \
+                    (end_ts is not None and click_time(entry['start']) > end_ts):
+                continue
+            for click in self.read(entry):
+                ts = click_time(click.get("timestamp"))
+                if (start_ts is None or ts >= start_ts) and (end_ts is None or ts <= end_ts):
+                    yield click
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+点击时间索引
+每条点击的时间戳只在建索引时解析一次，按时间排序保存；
+日期范围查询用二分查找定位起点（O(log n + k)），最近 30 天的点击数用滑动窗口计数
+"""
+
+import bisect
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def click_time(value) -> Optional[float]:
+    """
+    时间戳字符串 → 可比较的秒数；按本地时间的"钟面时间"计算，与直接比较 datetime.fromisoformat 的结果一致，
+    带时区的时间戳（如 ...Z）先换算成本地时间。无法解析时返回 None
+    """
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return (dt - _EPOCH).total_seconds()
+
+
+class ClickTimeIndex:
+    """按时间排序的 (时间, 点击) 平行数组；点击历史基本按时间追加，新点击通常直接加在末尾"""
+
+    def __init__(self, clicks: List[Dict] = None):
+        self.times: List[float] = []
+        self.clicks: List[Dict] = []
+        self.unindexed = 0   # 时间戳无法解析的点击数
+        self._window_start = 0
+        self._window_cutoff = None
+        pairs = []
+        for click in clicks or []:
+            ts = click_time(click.get("timestamp"))
+            if ts is None:
+                self.unindexed += 1
+            else:
+                pairs.append((ts, click))
+        # 已按时间排序时跳过排序；sorted 稳定，同一时刻的点击保持原来的顺序
+        if any(pairs[i][0] > pairs[i + 1][0] for i in range(len(pairs) - 1)):
+            pairs.sort(key=lambda pair: pair[0])
+        self.times = [ts for ts, _ in pairs]
+        self.clicks = [click for _, click in pairs]
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def add(self, click: Dict):
+        ts = click_time(click.get("timestamp"))
+        if ts is None:
+            self.unindexed += 1
+            return
+        if not self.times or ts >= self.times[-1]:
+            self.times.append(ts)
+            self.clicks.append(click)
+            return
+        i = bisect.bisect_right(self.times, ts)
+        self.times.insert(i, ts)
+        self.clicks.insert(i, click)
+        # 不晚于上次截止时间的点击插在窗口起点之前，不在窗口内
+        if self._window_cutoff is not None and ts <= self._window_cutoff:
+            self._window_start += 1
+
+    def iter_range(self, start=None, end=None) -> Iterator[Dict]:
+        """start <= 时间 <= end 的点击，按时间顺序；start/end 为 datetime 或 ISO 字符串，None 表示不限"""
+        lo = 0 if start is None else bisect.bisect_left(self.times, click_time(start))
+        hi = len(self.times) if end is None else bisect.bisect_right(self.times, click_time(end))
+        for i in range(lo, hi):
+            yield self.clicks[i]
+
+    def range(self, start=None, end=None) -> List[Dict]:
+        return list(self.iter_range(start, end))
+
+    def count_before(self, cutoff) -> int:
+        """时间早于 cutoff 的点击数"""
+        return bisect.bisect_left(self.times, click_time(cutoff))
+
+    def count_since(self, cutoff) -> int:
+        """
+        时间晚于 cutoff 的点击数；cutoff 通常随时间单调前移（如"最近 30 天"），
+        窗口起点只向后移动，均摊 O(1)，cutoff 回退时再用二分查找
+        """
+        ts = click_time(cutoff)
+        if self._window_cutoff is None or ts < self._window_cutoff:
+            self._window_start = bisect.bisect_right(self.times, ts)
+        else:
+            while self._window_start < len(self.times) and self.times[self._window_start] <= ts:
+                self._window_start += 1
+        self._window_cutoff = ts
+        return len(self.times) - self._window_start
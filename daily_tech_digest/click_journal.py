@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+"""
+点击日志
+user_preferences.json 作为快照，新的点击以 JSON lines 追加到旁边的日志文件，记录一次点击只写一行；
+读取时 = 快照 + 日志中快照之后的部分，日志超过 COMPACT_BYTES 时合并进快照并换一个新日志
+
+日志第一行是 {"journal": 1, "epoch": ...}；快照的 "journal" 字段记录已合并到哪个 epoch 的哪个字节位置，
+合并过程中任何一步中断都不会丢失或重复点击；多个进程通过 fcntl 建议锁和乐观版本检查并发读写
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from daily_tech_digest.click_index import click_time
+from daily_tech_digest.config import USER_PREFERENCES_FILE
+
+JOURNAL_VERSION = 1
+# 日志超过这个大小时合并进快照
+COMPACT_BYTES = 256 * 1024
+FSYNC_EVERY = 16          # 最多攒这么多条点击再 fsync
+FSYNC_INTERVAL = 1.0      # 或距上次 fsync 超过这么多秒
+# update() 因其他进程保存过快照而重试的次数
+UPDATE_ATTEMPTS = 10
+
+
+def journal_path_for(preferences_path: str) -> str:
+    """user_preferences.json → user_preferences.journal.jsonl"""
+    base = preferences_path[:-5] if preferences_path.endswith('.json') else preferences_path
+    return base + '.journal.jsonl'
+
+
+def default_preferences() -> Dict:
+    """默认偏好配置（与 UserPreferenceTracker 原来的默认值一致）"""
+    now = datetime.now().isoformat()
+    return {
+        "profile": {
+            "createdAt": now,
+            "lastUpdated": now
+        },
+        "preferences": {
+            "categories": {
+                "programming": {"weight": 0.5, "clicks": 0, "readCount": 0, "avgReadTime": 0},
+                "ai": {"weight": 0.5, "clicks": 0, "readCount": 0, "avgReadTime": 0},
+                "product": {"weight": 0.2, "clicks": 0, "readCount": 0, "avgReadTime": 0}
+            },
+            "topics": {
+                "react": 0, "python": 0, "rust": 0, "go": 0,
+                "ai-architecture": 0, "frontend": 0, "backend": 0,
+                "product-design": 0, "devops": 0
+            },
+            "sources": {
+                "bestblogs": 0, "hackernews": 0, "reddit": 0, "openai": 0
+            }
+        },
+        "clickHistory": [],
+        "readingSession": [],
+        # 点击历史是否按时间排序（归档时据此在截止时间处停止扫描）
+        "historyOrder": {"ordered": True, "last": None}
+    }
+
+
+def make_click(title: str, url: str, category: str, topics: List[str] = None, source: str = None,
+               ai_score: float = 0, timestamp: str = None) -> Dict[str, Any]:
+    """点击记录（clickHistory 中的格式）"""
+    return {
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "articleTitle": title,
+        "articleUrl": url,
+        "category": category,
+        "topics": topics or [],
+        "source": source or "bestblogs",
+        "aiScore": ai_score
+    }
+
+
+def apply_click(data: Dict, click: Dict[str, Any]):
+    """把一次点击计入偏好数据：追加到点击历史，并更新类别、主题、来源计数"""
+    data["clickHistory"].append(click)
+    order = data.get("historyOrder")
+    if order is not None and order["ordered"]:
+        ts = click_time(click.get("timestamp"))
+        if ts is None or (order["last"] is not None and ts < order["last"]):
+            order["ordered"] = False
+        else:
+            order["last"] = ts
+    prefs = data["preferences"]
+
+    category = click.get("category")
+    if category in prefs["categories"]:
+        prefs["categories"][category]["clicks"] += 1
+
+    for topic in click.get("topics") or []:
+        if topic in prefs["topics"]:
+            prefs["topics"][topic] += 1
+
+    source = click.get("source")
+    if source and source in prefs["sources"]:
+        prefs["sources"][source] += 1
+
+    data["profile"]["lastUpdated"] = click.get("timestamp") or data["profile"].get("lastUpdated")
+
+
+def read_journal(path: str, offset: int = 0, end: int = None) -> Tuple[Optional[str], List[Dict], int]:
+    """
+    读取日志，返回 (epoch, offset 之后的点击, 读到的位置)；给出 end 时只读到 end 为止
+
+    最后一行不完整（写入中途崩溃）时忽略，读到的位置停在它前面
+    """
+    try:
+        with open(path, 'rb') as f:
+            header_line = f.readline()
+            try:
+                header = json.loads(header_line)
+            except ValueError:
+                header = None
+            if isinstance(header, dict) and 'journal' in header:
+                epoch, start = header.get('epoch'), f.tell()
+            else:
+                epoch, start = None, 0  # 没有头部时第一行也是点击
+            position = max(offset, start)
+            f.seek(position)
+            clicks = []
+            for line in f:
+                if (end is not None and position >= end) or not line.endswith(b'\n'):
+                    break
+                position += len(line)
+                try:
+                    clicks.append(json.loads(line))
+                except ValueError:
+                    continue
+            return epoch, clicks, position
+    except FileNotFoundError:
+        return None, [], 0
+
+
+class ConflictError(RuntimeError):
+    """保存时发现快照已被其他进程更新（乐观并发检查失败）"""
+
+
+class FileLock:
+    """
+    fcntl 建议锁：追加点击和读取时加共享锁，互不阻塞；
+    合并快照、换新日志、归档时加排他锁，只在写快照和换日志的短时间内持有
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    @contextlib.contextmanager
+    def _held(self, mode: int):
+        if self._fd is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, mode)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def shared(self):
+        return self._held(fcntl.LOCK_SH)
+
+    def exclusive(self):
+        return self._held(fcntl.LOCK_EX)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class ClickJournal:
+    """
+    追加写点击日志：每条点击立即写入（其他进程马上可见），
+    fsync 按条数/时间批量进行，close() 或 flush() 时补上
+    """
+
+    def __init__(self, path: str, fsync_every: int = FSYNC_EVERY, fsync_interval: float = FSYNC_INTERVAL,
+                 lock: FileLock = None):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.lock = lock or FileLock(path + '.lock')
+        self._fd = None
+        self._inode = None
+        self.epoch = None       # 当前打开的日志的 epoch 和头部长度
+        self.header_size = 0
+        self.rotated = False    # 当前打开的日志是否由保存快照时换新而来（否则是首次创建的）
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _create(self):
+        """带头部创建日志：先写临时文件再 link，不会与其他进程的追加交错"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'journal': JOURNAL_VERSION, 'epoch': uuid.uuid4().hex}) + '\n')
+        try:
+            os.link(tmp_path, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+
+    def _open(self) -> int:
+        # 合并后日志会被替换成新文件，inode 变化时重新打开
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            self._create()
+            inode = os.stat(self.path).st_ino
+        if self._fd is None or inode != self._inode:
+            self._close_fd()
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND)
+            self._inode = inode
+            header_line = os.pread(self._fd, 4096, 0).split(b'\n', 1)[0]
+            try:
+                header = json.loads(header_line)
+                self.epoch, self.rotated = header.get('epoch'), bool(header.get('rotated'))
+                self.header_size = len(header_line) + 1
+            except (ValueError, AttributeError):
+                self.epoch, self.rotated, self.header_size = None, False, 0
+        return self._fd
+
+    def append(self, click: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        追加一条点击，返回这一行在日志中的起止位置；
+        整行一次 write，O_APPEND 保证多个进程的行不会交错，共享锁保证不会写进正在被换掉的旧日志
+        """
+        with self.lock.shared():
+            return self.write(click)
+
+    def write(self, click: Dict[str, Any]) -> Tuple[int, int]:
+        """同 append()，调用方已持有共享锁"""
+        line = (json.dumps(click, ensure_ascii=False) + '\n').encode('utf-8')
+        fd = self._open()
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b'\n':
+            # 上次写入中途崩溃留下半行：先换行，让它单独成为一行（读取时跳过），不与这一行粘在一起
+            line = b'\n' + line
+        os.write(fd, line)
+        end = os.lseek(fd, 0, os.SEEK_CUR)
+        self._unsynced += 1
+        if (self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.flush()
+        return end - len(line), end
+
+    def flush(self):
+        if self._fd is not None and self._unsynced:
+            os.fsync(self._fd)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close_fd(self):
+        if self._fd is not None:
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+
+    def close(self):
+        self._close_fd()
+        self.lock.close()
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+
+class PreferenceStore:
+    """
+    偏好快照 + 点击日志，多个进程可以同时使用：
+    记录点击只追加日志（共享锁），保存快照时检查日志 epoch 是否仍是读取时的 epoch ——
+    每次保存快照都会换新日志，epoch 就是快照的版本号，不一致说明期间有其他进程保存过
+    """
+
+    def __init__(self, path: str = USER_PREFERENCES_FILE, journal_path: str = None,
+                 fsync_every: int = FSYNC_EVERY):
+        self.path = path
+        self.lock = FileLock(path + '.lock')
+        self.journal = ClickJournal(journal_path or journal_path_for(path), fsync_every=fsync_every,
+                                    lock=self.lock)
+
+    def _load_snapshot(self) -> Dict:
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return default_preferences()
+
+    def _load(self) -> Dict:
+        data = self._load_snapshot()
+        data.setdefault("clickHistory", [])
+        merged = data.get("journal") or {}
+        epoch, _, _ = read_journal(self.journal.path, 0)
+        # 同一个 epoch 跳过已合并的部分；日志已换新（epoch 不同）时全部重放
+        offset = merged.get("offset", 0) if epoch is not None and merged.get("epoch") == epoch else 0
+        epoch, clicks, position = read_journal(self.journal.path, offset)
+        for click in clicks:
+            apply_click(data, click)
+        data["journal"] = {"epoch": epoch, "offset": position}
+        return data
+
+    def load(self) -> Dict:
+        """快照加上日志中尚未合并的点击；共享锁保证读到的快照和日志属于同一个版本"""
+        with self.lock.shared():
+            return self._load()
+
+    def record(self, click: Dict[str, Any], data: Dict = None) -> List[Dict[str, Any]]:
+        """
+        记录一次点击：只追加一行日志；传入 load() 得到的 data 时同时计入 data。
+        data 读取之后其他进程追加的点击（位于 data["journal"] 和这一行之间）先补进 data，
+        再把 data["journal"] 前移到这一行之后，之后 save(data) 不会重复或遗漏。
+        返回补进 data 的其他进程的点击（按日志顺序，在这次点击之前计入），调用方据此更新派生数据
+        """
+        if data is None:
+            self.journal.append(click)
+            return []
+        merged = data["journal"]
+        with self.lock.shared():
+            start, end = self.journal.write(click)
+            if merged.get("epoch") == self.journal.epoch:
+                _, foreign, _ = read_journal(self.journal.path, merged.get("offset", 0), start)
+            elif merged.get("epoch") is None and not self.journal.rotated:
+                # 读取时还没有日志，之后首次创建：开头以来的点击都是其他进程追加的
+                _, foreign, _ = read_journal(self.journal.path, 0, start)
+            else:
+                # 读取之后其他进程保存过快照，data 已过期：只计入内存，位置不前移，save(data) 会抛出 ConflictError
+                apply_click(data, click)
+                return []
+        for other in foreign:
+            apply_click(data, other)
+        apply_click(data, click)
+        merged.update(epoch=self.journal.epoch, offset=end)
+        return foreign
+
+    def needs_compaction(self) -> bool:
+        return self.journal.size() > COMPACT_BYTES
+
+    def _write_snapshot(self, data: Dict):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _rotate_journal(self, position: int) -> Dict[str, Any]:
+        """换成新 epoch 的日志，保留 position 之后（合并期间新追加）的点击；返回新日志的起始位置"""
+        try:
+            with open(self.journal.path, 'rb') as f:
+                f.seek(position)
+                tail = f.read()
+        except FileNotFoundError:
+            tail = b''
+        epoch = uuid.uuid4().hex
+        header = (json.dumps({'journal': JOURNAL_VERSION, 'epoch': epoch, 'rotated': True}) + '\n').encode('utf-8')
+        tmp_path = f"{self.journal.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal.path)
+        return {"epoch": epoch, "offset": len(header)}
+
+    def _current_epoch(self) -> Optional[str]:
+        """只读日志头部"""
+        try:
+            with open(self.journal.path, 'rb') as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        return header.get('epoch') if isinstance(header, dict) and 'journal' in header else None
+
+    def _save(self, data: Dict):
+        # 调用方持有排他锁
+        data["profile"]["lastUpdated"] = datetime.now().isoformat()
+        self._write_snapshot(data)
+        # 保留下来的尾部不在 data 中，data 从新日志的开头算起
+        data["journal"] = self._rotate_journal(data["journal"]["offset"])
+
+    def save(self, data: Dict) -> Dict:
+        """
+        写入完整快照并换新日志；data 必须来自 load()（包含日志中的点击），
+        读取之后有其他进程保存过快照时抛出 ConflictError，调用方应重新 load()。
+        其他进程在 data["journal"] 之后追加的点击先合并进 data 再保存，返回 data
+        """
+        self.journal.flush()
+        with self.lock.exclusive():
+            if self._current_epoch() != data["journal"]["epoch"]:
+                raise ConflictError("偏好数据已被其他进程更新，请重新读取")
+            _, foreign, position = read_journal(self.journal.path, data["journal"]["offset"])
+            for click in foreign:
+                apply_click(data, click)
+            data["journal"]["offset"] = max(position, data["journal"]["offset"])
+            self._save(data)
+        return data
+
+    def update(self, mutate: Callable[[Dict], Any], commit: Callable[[Any], None] = None,
+               attempts: int = UPDATE_ATTEMPTS) -> Tuple[Dict, Any]:
+        """
+        乐观并发的读-改-写：load() 后在锁外执行 mutate(data)，再加排他锁确认版本未变后保存；
+        版本变了就重新读取重试。mutate 返回 None 表示没有修改，不保存。
+        commit(mutate 的返回值) 在锁内、写快照之前执行（如写归档文件），只有最终成功的那一次会执行。
+        返回 (data, mutate 的返回值)
+        """
+        self.journal.flush()
+        for _ in range(attempts):
+            data = self.load()
+            result = mutate(data)
+            if result is None:
+                return data, None
+            with self.lock.exclusive():
+                if self._current_epoch() != data["journal"]["epoch"]:
+                    continue
+                if commit is not None:
+                    commit(result)
+                self._save(data)
+                return data, result
+        raise ConflictError(f"偏好数据持续被其他进程更新，{attempts} 次尝试均未保存成功")
+
+    def compact(self, only_if_needed: bool = False) -> Optional[Dict]:
+        """
+        把日志合并进快照，返回合并后的数据；整个过程持有排他锁，不会冲突。
+        only_if_needed 时拿到锁后再检查一次日志大小，多个进程同时发现日志过大时只合并一次，其余返回 None
+        """
+        self.journal.flush()
+        with self.lock.exclusive():
+            if only_if_needed and not self.needs_compaction():
+                return None
+            data = self._load()
+            self._save(data)
+        return data
+
+    def close(self):
+        self.journal.close()
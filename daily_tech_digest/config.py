@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+摘要系统配置
+所有 RSS 源，以及原来七个 daily_tech_digest_* 脚本对应的运行方案（variant）
+"""
+
+import copy
+import os
+
+# 所有状态文件所在目录；基准测试等场景可用 OPENCLAW_WORKSPACE 环境变量指向临时目录
+WORKSPACE_DIR = os.environ.get("OPENCLAW_WORKSPACE", "/home/lichangjiang/.openclaw/workspace")
+
+USER_PREFERENCES_FILE = os.path.join(WORKSPACE_DIR, "user_preferences.json")
+# 偏好快照缓存：偏好文件未变化（mtime/大小相同）时直接读取，不再解析整个点击历史
+PREFERENCE_SNAPSHOT_FILE = os.path.join(WORKSPACE_DIR, ".user_preferences_snapshot.json")
+# 已推送文章索引（链接哈希 + 标题指纹），用于跨天去重
+SENT_INDEX_FILE = os.path.join(WORKSPACE_DIR, ".sent_articles.idx")
+# 各源耗时和失败记录，用于自适应超时和熔断
+SOURCE_HEALTH_FILE = os.path.join(WORKSPACE_DIR, ".source_health.json")
+# 各源最近一次成功解析的文章，源不可用时使用
+LAST_GOOD_FILE = os.path.join(WORKSPACE_DIR, ".last_good_articles.json")
+# 增量文章库：按规范化链接保存已抓取的文章和每个源的高水位
+ARTICLE_DB_FILE = os.path.join(WORKSPACE_DIR, "digest_articles.db")
+# 后台轮询：各源上次/下次轮询时间
+POLLER_STATE_FILE = os.path.join(WORKSPACE_DIR, ".digest_poller_state.json")
+# 每次运行的指标（JSON lines），与 /tmp/daily_tech_digest.log 放在一起
+METRICS_FILE = "/tmp/daily_tech_digest.metrics.jsonl"
+# 直接推送：文件投递目录、本地 Unix socket、已投递记录（幂等键 → 渠道）
+DELIVERY_SPOOL_DIR = os.path.join(WORKSPACE_DIR, "digest_outbox")
+DELIVERY_SOCKET = "/tmp/daily_tech_digest.sock"
+DELIVERY_LOG_FILE = os.path.join(WORKSPACE_DIR, ".digest_delivery_log.json")
+# 入选文章的正文摘要缓存（链接 → 页面哈希和摘要）
+ENRICH_CACHE_FILE = os.path.join(WORKSPACE_DIR, ".article_summaries.json")
+DEFAULT_POLL_INTERVAL = 30 * 60   # 源没有配置 poll_interval 时的轮询间隔（秒）
+MAX_POLL_INTERVAL = 12 * 3600     # Cache-Control/ttl 建议的间隔最多采纳到这么长
+ARTICLES_PER_DAY = 10
+DEFAULT_RATIOS = {"programming": 3, "ai": 5, "product": 2}
+
+CATEGORIES = [
+    ("programming", "💻 编程技术"),
+    ("ai", "🤖 AI 前沿"),
+    ("product", "🎨 产品设计"),
+]
+
+# RSS 源配置（poll_interval 为后台轮询间隔，单位秒，可选）
+RSS_SOURCES = {
+    "bestblogs_featured": {
+        "url": "https://www.bestblogs.dev/zh/feeds/rss?featured=y",
+        "name": "BestBlogs 精选",
+        "category": "programming",
+    },
+    "bestblogs_programming": {
+        "url": "https://www.bestblogs.dev/zh/feeds/rss?category=programming&type=article",
+        "name": "BestBlogs 编程技术",
+        "category": "programming",
+    },
+    "bestblogs_ai": {
+        "url": "https://www.bestblogs.dev/en/feeds/rss?category=ai&minScore=90",
+        "name": "BestBlogs AI 高分",
+        "category": "ai",
+    },
+    "bestblogs_product": {
+        "url": "https://www.bestblogs.dev/zh/feeds/rss?category=product",
+        "name": "BestBlogs 产品设计",
+        "category": "product",
+    },
+    "hacker_news": {
+        "url": "https://hnrss.org/frontpage",
+        "name": "Hacker News",
+        "category": "programming",
+        "poll_interval": 15 * 60,
+        "ordered": False,  # 条目按热度而非发布时间排列，不能遇到旧文章就停止解析
+    },
+    "reddit_programming": {
+        "url": "https://www.reddit.com/r/programming/.rss",
+        "name": "Reddit r/programming",
+        "category": "programming",
+        "ordered": False,
+    },
+    "openai_blog": {
+        "url": "https://openai.com/blog/rss.xml",
+        "name": "OpenAI Blog",
+        "category": "ai",
+        "poll_interval": 2 * 3600,
+    },
+    "github_trending": {
+        "url": "https://github.com/trending/developers.atom",
+        "name": "GitHub Trending Developers",
+        "category": "programming",
+        "poll_interval": 6 * 3600,
+        "ordered": False,
+    },
+}
+
+BESTBLOGS_FOOTER = "来源：BestBlogs.dev | 管理订阅：https://www.bestblogs.dev/#subscribe"
+
+# 各阶段默认后端，variant 中只需写与默认不同的部分
+DEFAULT_VARIANT = {
+    "sources": list(RSS_SOURCES),
+    "category_overrides": {},
+    "backends": {
+        "fetch": "http",
+        "parse": "stdlib",
+        "normalize": "default",
+        "dedupe": "fingerprint",
+        "score": "freshness",
+        "select": "ratio",
+        "enrich": "none",
+        "render": "markdown",
+        "deliver": "stdout",
+    },
+    "max_items": 20,           # 每个源最多解析的文章数
+    "max_age_days": None,      # 只保留最近 N 天的文章（None 表示不限制）
+    "min_freshness": 0,        # 新鲜度低于该分数的文章丢弃
+    "link_filter": None,       # 链接必须包含的字符串
+    "use_preferences": True,   # 是否根据点击历史计算推荐比例和热门主题
+    "sent_history_days": 14,   # 最近 N 天推送过的文章不再推送（0 表示不检查）
+    "fallback": None,          # 没有任何文章时的备用方案（"demo" 为预设文章）
+    "timeout": 10,             # 单个源的最大超时，有历史耗时后按 p95 自动缩短
+    "deadline": 30,
+    "retries": 1,              # 失败后重试次数（指数退避 + 抖动）
+    "metrics": True,           # 运行结束后写入 METRICS_FILE
+    "incremental": True,       # 使用增量文章库，只处理比上次更新的文章
+    "stale_while_revalidate": True,  # 源未及时返回时使用上次成功抓取的文章
+    "revalidate_deadline": 8,  # 所有源都有旧内容时，只等待新内容这么多秒
+    # deliver 后端为 channels 时依次推送到这些渠道（webhook / spool / socket）
+    "delivery": {
+        "channels": ["spool"],
+        "webhook_url": os.environ.get("DIGEST_WEBHOOK_URL"),
+        "webhook_format": "feishu",  # webhook 请求体格式，其余渠道使用 format
+        "format": "markdown",
+        "spool_dir": DELIVERY_SPOOL_DIR,
+        "socket_path": DELIVERY_SOCKET,
+        "max_bytes": 18000,          # 文本超过该长度时按分类拆成多条消息
+        "retries": 3,
+        "timeout": 10,
+    },
+    # enrich 后端为 readability 时，入选文章正文下载的预算
+    "enrichment": {
+        "max_bytes": 2 * 1024 * 1024,  # 所有页面合计
+        "page_bytes": 256 * 1024,      # 每个页面只读开头部分
+        "deadline": 6,
+        "timeout": 5,
+        "summary_chars": 160,
+    },
+    "per_category_limit": None,
+    "footer": BESTBLOGS_FOOTER,
+    "show_topics": True,
+}
+
+# 原七个脚本对应的方案
+VARIANTS = {
+    "system": {
+        "description": "完整版：全部 7 个源，最近 3 天，按新鲜度/主题/来源综合评分",
+        "sources": ["bestblogs_featured", "bestblogs_programming", "bestblogs_ai", "bestblogs_product",
+                    "hacker_news", "reddit_programming", "openai_blog"],
+        "backends": {"parse": "auto", "score": "weighted", "deliver": "openclaw"},
+        "max_items": None,
+        "max_age_days": 3,
+        "timeout": 15,
+        "per_category_limit": 5,
+        "footer": "来源：BestBlogs.dev + 其他精选源",
+    },
+    "real": {
+        "description": "真实 RSS 源（urllib），失败时使用预设文章",
+        "sources": ["bestblogs_ai", "bestblogs_programming", "bestblogs_product"],
+        "max_items": 20,
+        "fallback": "demo",
+    },
+    "feedparser": {
+        "description": "feedparser 快速版，最近 30 天",
+        "sources": ["bestblogs_ai", "bestblogs_programming", "bestblogs_product"],
+        "backends": {"parse": "feedparser"},
+        "max_items": 15,
+        "min_freshness": 2,
+        "timeout": 5,
+        "fallback": "demo",
+    },
+    "bestblogs": {
+        "description": "BestBlogs 四个源，最近 7 天，按新鲜度取前 10 篇",
+        "sources": ["bestblogs_featured", "bestblogs_programming", "bestblogs_ai", "bestblogs_product"],
+        "backends": {"select": "top"},
+        "max_items": 15,
+        "max_age_days": 7,
+        "min_freshness": 6,
+        "timeout": 15,
+        "use_preferences": False,
+        "show_topics": False,
+    },
+    "final": {
+        "description": "BestBlogs 修复版，只保留 bestblogs.dev 文章链接",
+        "sources": ["bestblogs_featured", "bestblogs_programming", "bestblogs_product"],
+        "category_overrides": {"bestblogs_featured": "ai"},  # 精选多为 AI 相关
+        "backends": {"parse": "auto", "select": "top"},
+        "max_items": 12,
+        "max_age_days": 7,
+        "min_freshness": 6,
+        "link_filter": "bestblogs.dev",
+        "timeout": 20,
+        "use_preferences": False,
+        "show_topics": False,
+        "footer": BESTBLOGS_FOOTER + "\n（文章链接均为具体文章页面，可直接跳转）",
+    },
+    "reliable": {
+        "description": "可靠版：Hacker News + GitHub Trending",
+        "sources": ["hacker_news", "github_trending"],
+        "backends": {"parse": "auto", "select": "top"},
+        "max_items": 10,
+        "use_preferences": False,
+        "footer": "来源：Hacker News + GitHub | 实时更新",
+    },
+    "simple": {
+        "description": "简化版：不访问网络，输出预设文章，用于快速测试",
+        "sources": [],
+        "backends": {"fetch": "none", "render": "demo"},
+        "use_preferences": False,
+    },
+}
+
+
+def get_variant(name: str) -> dict:
+    """合并默认配置和 variant 配置"""
+    if name not in VARIANTS:
+        raise KeyError(f"未知的方案: {name}（可选：{', '.join(VARIANTS)}）")
+    variant = VARIANTS[name]
+    # 深拷贝：backends/delivery/enrichment 等嵌套配置在一次运行中被修改时不影响之后的运行
+    config = copy.deepcopy(DEFAULT_VARIANT)
+    config.update(copy.deepcopy({k: v for k, v in variant.items() if k != "backends"}))
+    config["backends"].update(variant.get("backends", {}))
+    config["name"] = name
+    return config
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+发布时间解析
+统一转换为 UTC 秒级时间戳（int），评分和渲染直接用整数计算；
+RFC 2822 / ISO 8601 走快速路径，每个源记住上次成功的格式，重复出现的字符串直接查缓存
+"""
+
+import calendar
+import datetime
+import threading
+from email.utils import parsedate_tz
+from typing import Dict, Optional
+
+# 快速路径都失败时再依次尝试的格式
+FALLBACK_FORMATS = [
+    '%a, %d %b %Y %H:%M:%S %Z',
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+]
+MEMO_SIZE = 4096
+
+
+def _parse_rfc2822(value: str) -> Optional[int]:
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    offset = parsed[9] or 0  # 没有时区按 UTC 处理
+    return calendar.timegm(parsed[:6]) - offset
+
+
+def _parse_iso(value: str) -> Optional[int]:
+    try:
+        dt = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return int(dt.timestamp())
+
+
+def _strptime_parser(fmt: str):
+    def parse(value: str) -> Optional[int]:
+        try:
+            dt = datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
+        return int(dt.timestamp())
+    return parse
+
+
+_PARSERS = {'rfc2822': _parse_rfc2822, 'iso': _parse_iso}
+_PARSERS.update({fmt: _strptime_parser(fmt) for fmt in FALLBACK_FORMATS})
+
+
+def _guess_order(value: str):
+    # 以 "2024-" 开头的基本是 ISO 8601，其余先按 RFC 2822（RSS pubDate）尝试
+    if value[:4].isdigit() and value[4:5] == '-':
+        return ['iso', 'rfc2822'] + FALLBACK_FORMATS
+    return ['rfc2822', 'iso'] + FALLBACK_FORMATS
+
+
+class DateParser:
+    """带缓存的发布时间解析器，可在多个线程间共享"""
+
+    def __init__(self, memo_size: int = MEMO_SIZE):
+        self.memo_size = memo_size
+        self._memo: Dict[str, Optional[int]] = {}
+        self._source_formats: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, value: str, source: str = None) -> Optional[int]:
+        """解析为 UTC 时间戳；无法解析时返回 None"""
+        if not value:
+            return None
+        value = value.strip()
+        if value in self._memo:
+            return self._memo[value]
+
+        known = self._source_formats.get(source) if source else None
+        order = _guess_order(value)
+        if known:
+            order = [known] + [name for name in order if name != known]
+
+        result = None
+        for name in order:
+            result = _PARSERS[name](value)
+            if result is not None:
+                if source and name != known:
+                    self._source_formats[source] = name
+                break
+
+        with self._lock:
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[value] = result
+        return result
+
+    def source_formats(self) -> Dict[str, str]:
+        """各源识别出的日期格式"""
+        return dict(self._source_formats)
+
+
+_default_parser = DateParser()
+
+
+def parse_epoch(value: str, source: str = None) -> Optional[int]:
+    """使用进程内共享的解析器"""
+    return _default_parser.parse(value, source)
+
+
+def to_datetime(epoch: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(epoch, tz=datetime.timezone.utc)
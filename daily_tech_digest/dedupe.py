@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+跨源去重
+链接规范化（去掉跟踪参数、统一 http/https、去掉末尾斜杠）+ 标题 SimHash 指纹；
+已推送文章记录在紧凑的二进制索引中，避免第二天重复推送
+"""
+
+import hashlib
+import os
+import re
+import struct
+import time
+import urllib.parse
+from typing import Dict, List, Optional, Set, Tuple
+
+# 跟踪参数：精确匹配的名字和前缀；source、from、ref 等在不少站点是有意义的参数，不去掉
+_TRACKING_PARAMS = {'fbclid', 'gclid', 'spm'}
+_TRACKING_PREFIXES = ('utm_', 'mc_', 'share_')
+
+# 标题分词：连续的字母数字为一个词，中文按相邻两字切分
+_WORD_RE = re.compile(r'[a-z0-9]+|[一-鿿]+')
+# 64 位指纹分成 4 段，海明距离 ≤ 3 的两个指纹至少有一段完全相同
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_MAX_DISTANCE = 3
+# 词数太少的标题指纹区分度不够，只按链接去重
+MIN_TITLE_TOKENS = 3
+
+# 索引记录：链接哈希（8 字节）、标题指纹（8 字节）、推送时间（4 字节）
+_RECORD = struct.Struct('<QQI')
+
+
+def canonical_url(url: str) -> str:
+    """规范化链接，同一篇文章的不同写法得到相同结果"""
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+             if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)]
+    path = parts.path.rstrip('/') or ''
+    # 不区分 http/https，也不保留 #片段
+    return urllib.parse.urlunsplit(('https', host, path, urllib.parse.urlencode(sorted(query)), ''))
+
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.sha1(canonical_url(url).encode('utf-8')).digest()[:8], 'little')
+
+
+def title_tokens(title: str) -> List[str]:
+    tokens = []
+    for word in _WORD_RE.findall(title.lower()):
+        if word[0] >= '一':
+            tokens.extend(word[i:i + 2] for i in range(max(len(word) - 1, 1)))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def simhash(tokens: List[str]) -> int:
+    weights = [0] * SIMHASH_BITS
+    for token in tokens:
+        h = int.from_bytes(hashlib.md5(token.encode('utf-8')).digest()[:8], 'little')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if weights[bit] > 0)
+
+
+def title_fingerprint(title: str) -> int:
+    """标题指纹；词数不足 MIN_TITLE_TOKENS 时返回 0（不参与标题去重）"""
+    tokens = title_tokens(title)
+    if len(tokens) < MIN_TITLE_TOKENS:
+        return 0
+    return simhash(tokens) or 1
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [(band, fingerprint >> (band * width) & mask) for band in range(SIMHASH_BANDS)]
+
+
+class DedupIndex:
+    """链接哈希集合 + 按分段索引的标题指纹，查找都是字典/集合操作"""
+
+    def __init__(self):
+        self.urls: Set[int] = set()
+        self._bands: Dict[Tuple[int, int], List[int]] = {}
+
+    def add(self, url_key: int, fingerprint: int):
+        self.urls.add(url_key)
+        if fingerprint:
+            for band in _bands(fingerprint):
+                self._bands.setdefault(band, []).append(fingerprint)
+
+    def similar_title(self, fingerprint: int) -> bool:
+        if not fingerprint:
+            return False
+        for band in _bands(fingerprint):
+            for other in self._bands.get(band, ()):
+                if bin(fingerprint ^ other).count('1') <= SIMHASH_MAX_DISTANCE:
+                    return True
+        return False
+
+    def contains(self, url_key: int, fingerprint: int) -> bool:
+        return url_key in self.urls or self.similar_title(fingerprint)
+
+
+class SentIndex(DedupIndex):
+    """已推送文章索引，保存为定长二进制记录，超过保留天数的记录在保存时丢弃"""
+
+    def __init__(self, path: str, retention_days: int = 14):
+        super().__init__()
+        self.path = path
+        self.retention_days = retention_days
+        self._records: List[Tuple[int, int, int]] = []
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        oldest = int(time.time()) - self.retention_days * 86400
+        usable = len(data) - len(data) % _RECORD.size
+        for url_key, fingerprint, sent_at in _RECORD.iter_unpack(data[:usable]):
+            if sent_at >= oldest:
+                self._records.append((url_key, fingerprint, sent_at))
+                super().add(url_key, fingerprint)
+
+    def add(self, url_key: int, fingerprint: int, sent_at: Optional[int] = None):
+        self._records.append((url_key, fingerprint, int(sent_at or time.time())))
+        super().add(url_key, fingerprint)
+
+    def record_articles(self, articles: List[Dict]):
+        now = int(time.time())
+        for article in articles:
+            self.add(url_hash(article['link']), title_fingerprint(article['title']), now)
+
+    def save(self):
+        oldest = int(time.time()) - self.retention_days * 86400
+        data = b''.join(_RECORD.pack(*record) for record in self._records if record[2] >= oldest)
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 保存已推送索引失败: {e}")
+
+
+def dedupe_articles(articles: List[Dict], sent: DedupIndex = None) -> Tuple[List[Dict], int, int]:
+    """
+    去掉重复文章，保留第一次出现的
+
+    返回 (保留的文章, 本次重复篇数, 已推送过的篇数)
+    """
+    seen = DedupIndex()
+    unique = []
+    duplicates = already_sent = 0
+    for article in articles:
+        url_key = url_hash(article['link'])
+        fingerprint = title_fingerprint(article['title'])
+        if seen.contains(url_key, fingerprint):
+            duplicates += 1
+            continue
+        seen.add(url_key, fingerprint)
+        if sent is not None and sent.contains(url_key, fingerprint):
+            already_sent += 1
+            continue
+        unique.append(article)
+    return unique, duplicates, already_sent
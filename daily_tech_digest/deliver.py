@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+摘要发送后端
+
+openclaw：写入临时文件并在标准输出打印标记，由 OpenClaw 捕获后发送（原有方式）
+webhook / spool / socket / channels：直接推送到 HTTP webhook、投递目录或本地 Unix socket。
+同一批文章使用同一个幂等键，重试或重新运行时不会重复推送；每个渠道的耗时和重试次数写入运行指标
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Set
+
+from daily_tech_digest.config import DELIVERY_LOG_FILE
+from daily_tech_digest.http_pool import get_pool
+from daily_tech_digest.metrics import categorize_error
+from daily_tech_digest.render import BEIJING_OFFSET, render_digest
+from daily_tech_digest.source_health import backoff_delay
+from daily_tech_digest.stages import register
+
+CONTENT_FILE = "/tmp/daily_tech_digest_content.txt"
+# 投递记录保留天数，超过后同一幂等键可以再次推送
+DELIVERY_LOG_DAYS = 7
+
+
+@register('deliver', 'stdout')
+def deliver_stdout(run) -> None:
+    """只输出到终端"""
+    print("\n📝 摘要生成完成")
+    print(run.digest)
+    run.delivered = True
+
+
+@register('deliver', 'openclaw')
+def deliver_openclaw(run) -> None:
+    """写入临时文件并输出特定标记，由 OpenClaw 捕获并发送"""
+    try:
+        with open(CONTENT_FILE, 'w', encoding='utf-8') as f:
+            f.write(run.digest)
+
+        print(f"✅ 摘要已保存到: {CONTENT_FILE}")
+        print(f"📤 摘要内容已输出，等待 OpenClaw 自动发送...")
+
+        # 输出特定标记，让 OpenClaw 捕获并发送
+        print(f"\n【OpenClaw_SEND_START】")
+        print(run.digest)
+        print(f"【OpenClaw_SEND_END】\n")
+
+        run.delivered = True
+    except Exception as e:
+        print(f"❌ 发送失败: {e}")
+        run.delivered = False
+
+
+class Message(NamedTuple):
+    """一条待推送的消息；id 为幂等键加分片序号，接收方据此去重"""
+    id: str
+    key: str
+    part: int
+    parts: int
+    target: str
+    body: str
+
+
+def idempotency_key(run) -> str:
+    """方案 + 北京日期 + 入选文章链接；同一天重跑选出同一批文章时得到相同的键"""
+    links = sorted(a['link'] for articles in run.selected.values() for a in articles)
+    date_str = (run.now + BEIJING_OFFSET).strftime("%Y%m%d")
+    seed = '\n'.join([run.config.get('name', ''), date_str] + links)
+    return hashlib.sha1(seed.encode('utf-8')).hexdigest()[:24]
+
+
+def split_body(text: str, max_bytes: int) -> List[str]:
+    """按空行（文章之间）拆分过长的文本，每段不超过 max_bytes 字节"""
+    if not max_bytes or len(text.encode('utf-8')) <= max_bytes:
+        return [text]
+    parts, current, size = [], [], 0
+    for block in text.split('\n\n'):
+        block_size = len(block.encode('utf-8')) + 2
+        if current and size + block_size > max_bytes:
+            parts.append('\n\n'.join(current))
+            current, size = [], 0
+        # 单段本身就超长时按字符截断
+        while block_size > max_bytes:
+            cut = block.encode('utf-8')[:max_bytes - 2].decode('utf-8', 'ignore')
+            parts.append(cut)
+            block = block[len(cut):]
+            block_size = len(block.encode('utf-8')) + 2
+        current.append(block)
+        size += block_size
+    if current:
+        parts.append('\n\n'.join(current))
+    return parts
+
+
+def build_messages(run, target: str, max_bytes: int) -> List[Message]:
+    """渲染为 target 格式并拆分成消息；飞书卡片是 JSON，不拆分"""
+    key = idempotency_key(run)
+    body = render_digest(run, target)
+    bodies = [body] if target == 'feishu' else split_body(body, max_bytes)
+    return [Message(f"{key}-{i}", key, i, len(bodies), target, part) for i, part in enumerate(bodies, 1)]
+
+
+class WebhookChannel:
+    """HTTP webhook（如飞书机器人）；同一批消息复用连接池中的长连接"""
+    name = 'webhook'
+
+    def __init__(self, url: str, target: str = 'feishu', timeout: float = 10):
+        if not url:
+            raise ValueError("未配置 webhook 地址（delivery.webhook_url 或 DIGEST_WEBHOOK_URL）")
+        self.url = url
+        self.target = target
+        self.timeout = timeout
+
+    def _payload(self, message: Message) -> bytes:
+        if message.target == 'feishu':
+            return message.body.encode('utf-8')
+        return json.dumps({'msg_type': 'text', 'content': {'text': message.body}},
+                          ensure_ascii=False).encode('utf-8')
+
+    def send_batch(self, messages: List[Message], on_ack: Callable[[Message], None]) -> None:
+        pool = get_pool()
+        for message in messages:
+            headers = {'Content-Type': 'application/json; charset=utf-8', 'Idempotency-Key': message.id}
+            body = pool.post(self.url, self._payload(message), headers=headers, timeout=self.timeout)
+            # 飞书等机器人接口出错时仍返回 200，错误码在响应体里
+            try:
+                result = json.loads(body or b'{}')
+            except ValueError:
+                result = None
+            code = result.get('code', result.get('StatusCode', 0)) if isinstance(result, dict) else 0
+            if code:
+                raise RuntimeError(f"webhook 返回错误 {code}: {result.get('msg', '')}")
+            on_ack(message)
+
+
+class SpoolChannel:
+    """投递目录：每条消息一个 JSON 文件，文件名即消息 id，已存在的不再写入"""
+    name = 'spool'
+
+    def __init__(self, directory: str, target: str = 'markdown'):
+        self.directory = directory
+        self.target = target
+
+    def send_batch(self, messages: List[Message], on_ack: Callable[[Message], None]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for message in messages:
+            path = os.path.join(self.directory, f"{message.id}.json")
+            if not os.path.exists(path):
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(message._asdict(), f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            on_ack(message)
+
+
+class SocketChannel:
+    """本地 Unix socket：一次连接发送整批消息（每行一个 JSON），再逐条读取确认"""
+    name = 'socket'
+
+    def __init__(self, path: str, target: str = 'markdown', timeout: float = 10):
+        self.path = path
+        self.target = target
+        self.timeout = timeout
+
+    def send_batch(self, messages: List[Message], on_ack: Callable[[Message], None]) -> None:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            payload = ''.join(json.dumps(m._asdict(), ensure_ascii=False) + '\n' for m in messages)
+            sock.sendall(payload.encode('utf-8'))
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile('r', encoding='utf-8') as f:
+                replies = [json.loads(line) for line in f if line.strip()]
+        acked = {reply.get('id') for reply in replies if reply.get('ok')}
+        for message in messages:
+            if message.id in acked:
+                on_ack(message)
+        missing = [m.id for m in messages if m.id not in acked]
+        if missing:
+            raise ConnectionError(f"接收方未确认 {len(missing)} 条消息")
+
+
+def make_channel(name: str, settings: Dict):
+    if name == 'webhook':
+        return WebhookChannel(settings['webhook_url'], settings['webhook_format'], settings['timeout'])
+    if name == 'spool':
+        return SpoolChannel(settings['spool_dir'], settings['format'])
+    if name == 'socket':
+        return SocketChannel(settings['socket_path'], settings['format'], settings['timeout'])
+    raise KeyError(f"未知的推送渠道: {name}（可选：webhook, spool, socket）")
+
+
+class DeliveryLog:
+    """
+    各幂等键在每个渠道的推送记录：全部推送成功的渠道重新运行时跳过；
+    只推送了一部分时记录已确认的分片序号，重试和重新运行时只推送其余分片
+    """
+
+    def __init__(self, path: str = DELIVERY_LOG_FILE):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._log: Dict[str, Dict[str, Dict]] = json.load(f)
+        except (OSError, ValueError):
+            self._log = {}
+        # 旧格式只记录推送成功的时间
+        for channels in self._log.values():
+            for channel, entry in channels.items():
+                if not isinstance(entry, dict):
+                    channels[channel] = {'time': entry, 'done': True}
+
+    def delivered(self, key: str, channel: str) -> bool:
+        return self._log.get(key, {}).get(channel, {}).get('done', False)
+
+    def acked_parts(self, key: str, channel: str) -> Set[int]:
+        return set(self._log.get(key, {}).get(channel, {}).get('parts', []))
+
+    def record_parts(self, key: str, channel: str, parts: Set[int]):
+        if parts:
+            self._log.setdefault(key, {})[channel] = {'time': time.time(), 'done': False, 'parts': sorted(parts)}
+
+    def record(self, key: str, channel: str):
+        self._log.setdefault(key, {})[channel] = {'time': time.time(), 'done': True}
+
+    def save(self):
+        expire = time.time() - DELIVERY_LOG_DAYS * 86400
+        self._log = {key: channels for key, channels in self._log.items()
+                     if max((entry['time'] for entry in channels.values()), default=0) >= expire}
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._log, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 保存推送记录失败: {e}")
+
+
+def send_with_retry(channel, messages: List[Message], retries: int, acked: Set[int] = None) -> Dict:
+    """
+    发送一批消息，失败后按指数退避重试，重试时只发送未确认的分片；返回耗时、尝试次数等指标。
+    acked 为已确认的分片序号，发送过程中就地加入新确认的分片
+    """
+    start = time.monotonic()
+    acked = set() if acked is None else acked
+    metrics = {'messages': len(messages), 'bytes': sum(len(m.body.encode('utf-8')) for m in messages)}
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            pending = [m for m in messages if m.part not in acked]
+            channel.send_batch(pending, lambda message: acked.add(message.part))
+            break
+        except Exception as e:
+            if attempt > retries:
+                metrics.update(error=str(e), error_category=categorize_error(e))
+                break
+            print(f"  ⚠️ {channel.name} 推送失败（{e}），第 {attempt} 次重试...")
+            time.sleep(backoff_delay(attempt - 1))
+    metrics.update(attempts=attempt, seconds=round(time.monotonic() - start, 6))
+    return metrics
+
+
+def deliver_to(run, channel_names: List[str]) -> None:
+    """推送到指定渠道；全部成功（或此前已推送过）才算推送完成"""
+    settings = run.config['delivery']
+    log = DeliveryLog()
+    messages = {}
+    run.delivered = True
+    for name in channel_names:
+        try:
+            channel = make_channel(name, settings)
+        except (KeyError, ValueError) as e:
+            print(f"❌ {e}")
+            run.delivery_metrics[name] = {'error': str(e), 'error_category': 'config'}
+            run.delivered = False
+            continue
+
+        if channel.target not in messages:
+            messages[channel.target] = build_messages(run, channel.target, settings['max_bytes'])
+        batch = messages[channel.target]
+        key = batch[0].key
+        if log.delivered(key, name):
+            print(f"  ⏭️ {name} 已推送过这批文章（{key}），跳过")
+            run.delivery_metrics[name] = {'skipped': True, 'messages': 0, 'seconds': 0.0, 'attempts': 0}
+            continue
+
+        acked = log.acked_parts(key, name)
+        if acked:
+            print(f"  ↩️ {name} 上次已确认 {len(acked)}/{len(batch)} 条，只推送其余部分")
+        metrics = send_with_retry(channel, batch, settings['retries'], acked)
+        run.delivery_metrics[name] = metrics
+        if metrics.get('error'):
+            print(f"❌ {name} 推送失败: {metrics['error']}")
+            log.record_parts(key, name, acked)
+            run.delivered = False
+            continue
+        log.record(key, name)
+        print(f"📤 已推送到 {name}（{metrics['messages']} 条消息，{metrics['seconds'] * 1000:.0f}ms）")
+    log.save()
+
+
+@register('deliver', 'channels')
+def deliver_channels(run) -> None:
+    """推送到 delivery.channels 中配置的所有渠道"""
+    deliver_to(run, run.config['delivery']['channels'])
+
+
+@register('deliver', 'webhook')
+def deliver_webhook(run) -> None:
+    """POST 到 webhook（默认飞书卡片格式）"""
+    deliver_to(run, ['webhook'])
+
+
+@register('deliver', 'spool')
+def deliver_spool(run) -> None:
+    """写入投递目录，由其他进程取走发送"""
+    deliver_to(run, ['spool'])
+
+
+@register('deliver', 'socket')
+def deliver_socket(run) -> None:
+    """发送到本地 Unix socket"""
+    deliver_to(run, ['socket'])
+
+
+def _print_message(message: Dict):
+    print(f"\n📨 {message['id']}（{message['part']}/{message['parts']}，{message['target']}）")
+    print(message['body'])
+
+
+def serve_socket(path: str, handler: Callable[[Dict], None] = _print_message, stop: threading.Event = None):
+    """
+    本地接收端：监听 Unix socket，逐条确认收到的消息
+
+    同一消息 id 重复到达时只确认不重复处理；stop 被设置后退出（默认一直运行）
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+    seen = set()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(path)
+        server.listen()
+        server.settimeout(0.5)
+        print(f"📥 正在监听 {path}")
+        while stop is None or not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            try:
+                with conn, conn.makefile('r', encoding='utf-8') as reader, \
+                        conn.makefile('w', encoding='utf-8') as writer:
+                    for line in reader:
+                        if not line.strip():
+                            continue
+                        try:
+                            message = json.loads(line)
+                        except ValueError:
+                            message = None
+                        valid = isinstance(message, dict) and all(field in message for field in Message._fields)
+                        message_id = message['id'] if valid else None
+                        if not isinstance(message_id, str):
+                            # 格式错误的行不确认，同一连接中的其他消息照常处理
+                            print(f"⚠️ 忽略格式错误的消息: {line.strip()[:80]}")
+                            writer.write(json.dumps({'ok': False, 'error': 'invalid message'}) + '\n')
+                            continue
+                        if message_id not in seen:
+                            seen.add(message_id)
+                            handler(message)
+                        writer.write(json.dumps({'id': message_id, 'ok': True}) + '\n')
+            except (OSError, ValueError) as e:
+                # 非 UTF-8 数据或连接中断只影响这一个连接
+                print(f"⚠️ 连接处理失败: {e}")
+    os.unlink(path)
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+正文摘要（enrich 阶段）
+只对最终入选的文章并发下载原文页面，用简化的 readability 算法提取正文，生成比 RSS 描述更完整的摘要；
+下载受整体字节数和截止时间限制，提取结果按链接和页面内容哈希缓存，同一页面不重复提取
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from daily_tech_digest.config import ENRICH_CACHE_FILE
+from daily_tech_digest.fetcher import fetch_all
+from daily_tech_digest.http_pool import get_pool
+
+CHUNK_SIZE = 16 * 1024
+# 缓存的摘要在这段时间内直接使用，不再请求页面
+CACHE_TTL = 7 * 86400
+CACHE_RETENTION = 30 * 86400
+
+_SKIP_TAGS = {'script', 'style', 'noscript', 'svg', 'iframe', 'form', 'nav', 'header', 'footer', 'aside',
+              'button', 'select', 'template'}
+_BLOCK_TAGS = {'p', 'pre', 'blockquote', 'li', 'td', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'section',
+               'article', 'main'}
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source',
+              'track', 'wbr'}
+# class/id 中出现这些词的容器加分或减分
+_POSITIVE_RE = re.compile(r'article|body|content|entry|main|post|text|blog|story', re.IGNORECASE)
+_NEGATIVE_RE = re.compile(r'comment|meta|footer|footnote|sidebar|sponsor|share|related|promo|ad-|nav|menu',
+                          re.IGNORECASE)
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+_SPACE_RE = re.compile(r'\s+')
+_MIN_PARAGRAPH = 25
+
+
+class _Container:
+    __slots__ = ('tag', 'parent', 'bonus', 'score')
+
+    def __init__(self, tag: str, parent: Optional['_Container'], attrs: Dict[str, str]):
+        self.tag = tag
+        self.parent = parent
+        hint = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+        self.bonus = (25 if _POSITIVE_RE.search(hint) else 0) - (25 if _NEGATIVE_RE.search(hint) else 0)
+        self.score = 0.0
+
+
+class ReadabilityExtractor(HTMLParser):
+    """
+    单遍扫描 HTML：按块级元素切分段落，段落得分（长度、逗号数）累加到父容器和祖父容器，
+    得分最高的容器中的段落即为正文；链接文字占比过高的段落（导航、标签列表）不计分
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Container('root', None, {})
+        self._stack: List[tuple] = [('root', self.root)]
+        self._skip_depth = 0
+        self._text: List[str] = []
+        self._link_chars = 0
+        self._in_link = 0
+        self.containers: List[_Container] = []
+        self.paragraphs: List[tuple] = []  # (所在容器, 文字)，按文档顺序
+        self.meta_description = ''
+        self.title = ''
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta':
+            name = (attrs.get('name') or attrs.get('property') or '').lower()
+            if name in ('description', 'og:description') and not self.meta_description:
+                self.meta_description = _SPACE_RE.sub(' ', attrs.get('content') or '').strip()
+            return
+        if tag in _VOID_TAGS:
+            if tag == 'br':
+                self._flush()
+            return
+        if tag == 'title':
+            self._in_title = True
+        if self._skip_depth or tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            self._stack.append((tag, None))
+            return
+        if tag == 'a':
+            self._in_link += 1
+        if tag in _BLOCK_TAGS:
+            self._flush()
+            container = _Container(tag, self._current(), attrs)
+            self.containers.append(container)
+            self._stack.append((tag, container))
+        else:
+            self._stack.append((tag, None))
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+        # 容错：跳过未闭合的元素，找不到对应开始标签时忽略
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > i:
+            name, container = self._stack.pop()
+            if self._skip_depth:
+                self._skip_depth -= 1
+                continue
+            if name == 'a':
+                self._in_link = max(0, self._in_link - 1)
+            if container is not None:
+                self._flush(container)
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        if self._skip_depth:
+            return
+        self._text.append(data)
+        if self._in_link:
+            self._link_chars += len(data.strip())
+
+    def _current(self) -> _Container:
+        for _, container in reversed(self._stack):
+            if container is not None:
+                return container
+        return self.root
+
+    def _flush(self, container: _Container = None):
+        """结束当前段落，段落得分计入所在容器的父级和祖父级"""
+        text = _SPACE_RE.sub(' ', ''.join(self._text)).strip()
+        link_chars, self._link_chars = self._link_chars, 0
+        self._text = []
+        if len(text) < _MIN_PARAGRAPH or link_chars > len(text) * 0.5:
+            return
+        container = container or self._current()
+        self.paragraphs.append((container, text))
+        score = 1 + text.count(',') + text.count('，') + min(len(text) // 100, 3)
+        parent = container.parent or container
+        parent.score += score
+        if parent.parent is not None:
+            parent.parent.score += score / 2
+
+    def best_text(self) -> str:
+        self._flush()
+        candidates = [c for c in self.containers + [self.root] if c.score > 0]
+        if not candidates:
+            return ''
+        best = max(candidates, key=lambda c: c.score + c.bonus)
+        # 正文段落在最佳容器本身或它的子元素、孙元素中
+        return ' '.join(text for c, text in self.paragraphs
+                        if c is best or c.parent is best or (c.parent is not None and c.parent.parent is best))
+
+
+def _shorten(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit].rstrip() + '…'
+
+
+def extract_summary(html: str, limit: int = 160) -> str:
+    """从 HTML 中提取正文开头作为摘要；提取不到正文时使用 meta description"""
+    extractor = ReadabilityExtractor()
+    try:
+        extractor.feed(html)
+        extractor.close()
+    except Exception:
+        pass
+    return _shorten(extractor.best_text() or extractor.meta_description, limit)
+
+
+def html_to_text(html: str) -> str:
+    """RSS 描述中的 HTML 转成纯文本"""
+    extractor = ReadabilityExtractor()
+    extractor.feed(html)
+    extractor.close()
+    extractor._flush()
+    text = ' '.join(text for _, text in extractor.paragraphs)
+    return text or _SPACE_RE.sub(' ', re.sub(r'<[^>]+>', ' ', html)).strip()
+
+
+def _decode(body: bytes, content_type: str) -> str:
+    match = re.search(r'charset=([\w-]+)', content_type or '', re.IGNORECASE)
+    charset = match.group(1) if match else None
+    if charset is None:
+        meta = _CHARSET_RE.search(body[:4096])
+        charset = meta.group(1).decode('ascii') if meta else 'utf-8'
+    try:
+        return body.decode(charset, errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+class SummaryCache:
+    """链接 → 页面内容哈希和提取出的摘要"""
+
+    def __init__(self, path: str = ENRICH_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def fresh(self, url: str, now: float = None) -> Optional[str]:
+        """CACHE_TTL 内提取过的摘要"""
+        entry = self._entries.get(url)
+        if entry and (now or time.time()) - entry['ts'] < CACHE_TTL:
+            return entry['summary']
+        return None
+
+    def lookup(self, url: str, content_hash: str) -> Optional[str]:
+        """页面内容未变化时返回上次的摘要"""
+        entry = self._entries.get(url)
+        return entry['summary'] if entry and entry['sha1'] == content_hash else None
+
+    def put(self, url: str, content_hash: str, summary: str):
+        with self._lock:
+            self._entries[url] = {'sha1': content_hash, 'summary': summary, 'ts': time.time()}
+
+    def save(self):
+        expire = time.time() - CACHE_RETENTION
+        with self._lock:
+            self._entries = {url: e for url, e in self._entries.items() if e['ts'] >= expire}
+            data = json.dumps(self._entries, ensure_ascii=False)
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 保存摘要缓存失败: {e}")
+
+
+class ByteBudget:
+    """多个下载线程共享的字节预算"""
+
+    def __init__(self, total: int):
+        self.remaining = total
+        self._lock = threading.Lock()
+
+    def take(self, wanted: int) -> int:
+        with self._lock:
+            granted = max(0, min(wanted, self.remaining))
+            self.remaining -= granted
+            return granted
+
+
+def fetch_page(url: str, budget: ByteBudget, page_bytes: int, timeout: float) -> Tuple[bytes, str]:
+    """下载页面开头部分（正文通常在前面），不超过 page_bytes 和剩余预算"""
+    parts = []
+    received = 0
+    with get_pool().open(url, headers={'Accept': 'text/html,application/xhtml+xml'}, timeout=timeout) as response:
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' not in content_type and 'xml' not in content_type:
+            raise ValueError(f"不是网页: {content_type or '未知类型'}")
+        while received < page_bytes:
+            allowed = budget.take(min(CHUNK_SIZE, page_bytes - received))
+            if not allowed:
+                break
+            chunk = response.read(allowed)
+            if not chunk:
+                break
+            parts.append(chunk)
+            received += len(chunk)
+    return b''.join(parts), content_type
+
+
+def enrich_articles(articles: List[Dict], settings: Dict, cache: SummaryCache) -> Dict:
+    """
+    为文章设置 excerpt：缓存未过期直接使用，否则并发下载页面提取；
+    超过截止时间、预算用完或下载失败的文章改用 RSS 描述。返回统计信息
+    """
+    limit = settings['summary_chars']
+    stats = {'articles': len(articles), 'cached': 0, 'fetched': 0, 'fallback': 0, 'bytes': 0}
+    pending = {}
+    now = time.time()
+    for article in articles:
+        summary = cache.fresh(article['link'], now)
+        if summary:
+            article['excerpt'] = summary
+            stats['cached'] += 1
+        else:
+            pending[article['link']] = article
+
+    budget = ByteBudget(settings['max_bytes'])
+
+    def fetch(url):
+        body, content_type = fetch_page(url, budget, settings['page_bytes'], settings['timeout'])
+        content_hash = hashlib.sha1(body).hexdigest()
+        summary = cache.lookup(url, content_hash)
+        if summary is None:
+            summary = extract_summary(_decode(body, content_type), limit)
+        cache.put(url, content_hash, summary)
+        return summary, len(body)
+
+    sources = {url: {'url': url} for url in pending}
+    for res in fetch_all(sources, fetch, deadline=settings['deadline']):
+        article = pending[res.source_key]
+        if res.error is None and res.result[0]:
+            article['excerpt'] = res.result[0]
+            stats['fetched'] += 1
+            stats['bytes'] += res.result[1]
+        elif article.get('summary'):
+            article['excerpt'] = _shorten(html_to_text(article['summary']), limit)
+            stats['fallback'] += 1
+    return stats
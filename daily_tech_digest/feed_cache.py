@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+RSS 条件请求缓存
+按源保存响应体和 ETag/Last-Modified，下次请求带上 If-None-Match/If-Modified-Since；
+304 时直接复用上次的解析结果，源不可用时退回到缓存内容
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+import urllib.error
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from daily_tech_digest.config import WORKSPACE_DIR
+from daily_tech_digest.http_pool import get_pool
+from daily_tech_digest.stream_parser import iter_response_chunks
+
+FEED_CACHE_DIR = os.path.join(WORKSPACE_DIR, "feed_cache")
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; OpenClaw/1.0)',
+    'Accept': 'application/rss+xml, application/atom+xml, application/xml, text/xml',
+}
+
+
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)', re.IGNORECASE)
+_TTL_RE = re.compile(rb'<ttl>\s*(\d+)\s*</ttl>', re.IGNORECASE)
+
+
+def max_age_from_headers(headers) -> Optional[int]:
+    """Cache-Control: max-age 或 Expires 给出的有效期（秒）"""
+    cache_control = headers.get('Cache-Control') or ''
+    if 'no-cache' in cache_control.lower() or 'no-store' in cache_control.lower():
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        return int(match.group(1))
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return max(0, int(parsedate_to_datetime(expires).timestamp() - time.time()))
+        except (TypeError, ValueError, IndexError):
+            return 0
+    return None
+
+
+def feed_ttl(body: bytes) -> Optional[int]:
+    """RSS <channel><ttl>（分钟）换算成秒；只看开头部分"""
+    match = _TTL_RE.search(body[:8192]) if body else None
+    return int(match.group(1)) * 60 if match else None
+
+
+class CachedFeed(NamedTuple):
+    """一次抓取的结果：body 为原始字节，from_cache 表示来自本地缓存，timings 为网络请求各阶段耗时"""
+    url: str
+    body: bytes
+    status: int
+    from_cache: bool
+    stale: bool
+    fetched_at: float
+    timings: Optional[Dict] = None
+
+
+class FeedCache:
+    def __init__(self, cache_dir: str = FEED_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _write(self, path: str, data: bytes):
+        """先写临时文件再替换，避免留下半截缓存"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"     ⚠️ 写入缓存失败: {e}")
+
+    def load_meta(self, url: str) -> Dict:
+        try:
+            with open(self._path(url, '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._path(url, '.body'), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, body: bytes, etag: str = None, last_modified: str = None,
+              max_age: int = None):
+        """保存响应体和校验信息"""
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'sha1': hashlib.sha1(body).hexdigest(),
+            'max_age': max_age,
+        }
+        self._write(self._path(url, '.body'), body)
+        self._write(self._path(url, '.json'), json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def touch(self, url: str, max_age: int = None):
+        """304 时刷新抓取时间和有效期"""
+        meta = self.load_meta(url)
+        if meta:
+            meta['fetched_at'] = time.time()
+            meta['max_age'] = max_age
+            self._write(self._path(url, '.json'), json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def refresh_hint(self, url: str) -> Optional[int]:
+        """源自己建议的刷新间隔（秒）：取 Cache-Control/Expires 和 RSS ttl 中较大的一个"""
+        hints = [self.load_meta(url).get('max_age'), feed_ttl(self.load_body(url) or b'')]
+        hints = [hint for hint in hints if hint]
+        return max(hints) if hints else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """根据上次的校验信息生成条件请求头"""
+        meta = self.load_meta(url)
+        headers = {}
+        if meta and os.path.exists(self._path(url, '.body')):
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def _cached(self, url: str, status: int, stale: bool) -> Optional[CachedFeed]:
+        body = self.load_body(url)
+        if body is None:
+            return None
+        return CachedFeed(url, body, status, True, stale, self.load_meta(url).get('fetched_at', 0))
+
+    def _load_parsed(self, url: str, digest: str) -> Tuple[bool, Any]:
+        try:
+            with open(self._path(url, '.parsed'), 'rb') as f:
+                cached_digest, parsed = pickle.load(f)
+            if cached_digest == digest:
+                return True, parsed
+        except Exception:
+            pass
+        return False, None
+
+    def _store_parsed(self, url: str, digest: str, parsed: Any):
+        try:
+            self._write(self._path(url, '.parsed'), pickle.dumps((digest, parsed), protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            print(f"     ⚠️ 缓存解析结果失败: {e}")
+
+    @staticmethod
+    def _digest(body: bytes, parse_key: str) -> str:
+        # parse_key 区分不同的解析方式（解析器、篇数限制等），避免复用不匹配的解析结果
+        return hashlib.sha1(body + parse_key.encode('utf-8')).hexdigest()
+
+    def parse(self, feed: CachedFeed, parse_func: Callable[[bytes], Any], parse_key: str = '') -> Any:
+        """解析响应体；内容来自缓存且已有同一内容的解析结果时直接复用"""
+        digest = self._digest(feed.body, parse_key)
+
+        if feed.from_cache:
+            found, parsed = self._load_parsed(feed.url, digest)
+            if found:
+                return parsed
+
+        parsed = parse_func(feed.body)
+        self._store_parsed(feed.url, digest, parsed)
+        return parsed
+
+    def fetch_streaming(self, url: str, parse_func: Callable[[Iterator[bytes]], Any],
+                        headers: Dict[str, str] = None, timeout: float = 10,
+                        allow_stale: bool = True, parse_key: str = '') -> Tuple[Any, CachedFeed]:
+        """
+        边下载边解析：parse_func 接收字节块迭代器并返回解析结果
+
+        parse_func 提前结束时不再读取剩余数据，连接随之关闭；此时只缓存已读到的部分内容，
+        不保存 ETag/Last-Modified，下次仍完整请求，避免 304 时把不完整的内容当作最新内容；
+        源不可用时复用缓存内容对应的解析结果
+        """
+        request_headers = dict(DEFAULT_HEADERS)
+        request_headers.update(headers or {})
+        request_headers.update(self.conditional_headers(url))
+        try:
+            with get_pool().open(url, headers=request_headers, timeout=timeout) as response:
+                if response.status == 304:
+                    cached = self._cached(url, 304, stale=False)
+                    if cached is not None:
+                        self.touch(url, max_age_from_headers(response.headers))
+                        cached = cached._replace(timings=response.timings)
+                        return self.parse(cached, lambda body: parse_func(iter([body])), parse_key), cached
+                    raise urllib.error.HTTPError(url, 304, '缓存已丢失', response.headers, None)
+
+                received = []
+                finished = []
+
+                def chunks():
+                    for chunk in iter_response_chunks(response):
+                        received.append(chunk)
+                        yield chunk
+                    finished.append(True)
+
+                parsed = parse_func(chunks())
+                body = b''.join(received)
+                if finished:
+                    etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                else:
+                    etag = last_modified = None
+                self.store(url, body, etag, last_modified, max_age_from_headers(response.headers))
+                self._store_parsed(url, self._digest(body, parse_key), parsed)
+                return parsed, CachedFeed(url, body, response.status, False, False, time.time(), response.timings)
+        except Exception as e:
+            if not allow_stale:
+                raise
+            return self.load_stale(url, parse_func, e, parse_key)
+
+    def load_stale(self, url: str, parse_func: Callable[[Iterator[bytes]], Any], error: Exception,
+                   parse_key: str = '') -> Tuple[Any, CachedFeed]:
+        """网络请求失败后退回缓存内容；没有缓存时抛出 error"""
+        cached = self._cached(url, 0, stale=True)
+        if cached is None:
+            raise error
+        print(f"     ⚠️ 获取失败（{error}），使用缓存内容")
+        return self.parse(cached, lambda body: parse_func(iter([body])), parse_key), cached
+
+
+_default_cache = None
+
+
+def get_feed_cache() -> FeedCache:
+    """进程内共享的默认缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FeedCache()
+    return _default_cache
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+并发 RSS 抓取引擎
+所有源同时下载，按主机限制并发数，并为整次运行设置截止时间，
+结果按完成顺序返回，总耗时取决于最慢的源而不是所有源之和
+"""
+
+import queue
+import threading
+import time
+import urllib.parse
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 2
+DEFAULT_DEADLINE = 30.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """超过整体截止时间仍未完成；future 为仍在执行的请求（还在排队、未开始的源为 None）"""
+
+    def __init__(self, message: str, future: Optional[Future] = None):
+        super().__init__(message)
+        self.future = future
+
+
+class _DaemonPool:
+    """
+    固定数量守护线程的简易线程池：ThreadPoolExecutor 的工作线程在进程退出时会被等待，
+    截止时间后仍在下载的源会拖住退出；守护线程不会，整次运行的耗时以 deadline 为上限
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers = [threading.Thread(target=self._work, name=f"{thread_name_prefix}_{i}", daemon=True)
+                         for i in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        self._queue.put((future, fn, args))
+        return future
+
+    def shutdown(self):
+        """取消还在排队的任务，已开始的任务在后台继续执行完"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in self._workers:
+            self._queue.put(None)
+
+
+class FetchResult(NamedTuple):
+    """单个源的抓取结果"""
+    source_key: str
+    source_config: Dict
+    result: Any
+    error: Optional[BaseException]
+    elapsed: float
+
+
+def _host_of(url: str) -> str:
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+def _timed_call(fetch_func: Callable[[str], Any], url: str):
+    start = time.monotonic()
+    try:
+        return fetch_func(url), None, time.monotonic() - start
+    except Exception as e:
+        return None, e, time.monotonic() - start
+
+
+def fetch_all(sources: Dict[str, Dict],
+              fetch_func: Callable[[str], Any],
+              max_workers: int = DEFAULT_MAX_WORKERS,
+              per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+              deadline: float = DEFAULT_DEADLINE) -> Iterator[FetchResult]:
+    """
+    并发抓取所有源，按完成顺序逐个产出 FetchResult
+
+    fetch_func(url) 在线程池中执行；同一主机同时最多 per_host_limit 个请求；
+    超过 deadline 秒仍未完成的源以 DeadlineExceeded 返回，不再等待（已开始的请求继续执行，
+    调用方可以通过 error.future 稍后取得结果）
+    """
+    if not sources:
+        return
+
+    # 按主机排队，保证同一主机的并发不超过上限
+    queues: Dict[str, deque] = {}
+    for source_key, source_config in sources.items():
+        queues.setdefault(_host_of(source_config['url']), deque()).append(source_key)
+
+    in_flight = {host: 0 for host in queues}
+    pending = {}
+    end_time = time.monotonic() + deadline
+    executor = _DaemonPool(max(1, min(max_workers, len(sources))), thread_name_prefix='rss-fetch')
+
+    def submit_ready():
+        for host, host_queue in queues.items():
+            while host_queue and in_flight[host] < per_host_limit:
+                source_key = host_queue.popleft()
+                url = sources[source_key]['url']
+                future = executor.submit(_timed_call, fetch_func, url)
+                pending[future] = (host, source_key)
+                in_flight[host] += 1
+
+    try:
+        submit_ready()
+        while pending:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                host, source_key = pending.pop(future)
+                in_flight[host] -= 1
+                result, error, elapsed = future.result()
+                yield FetchResult(source_key, sources[source_key], result, error, elapsed)
+            submit_ready()
+
+        # 截止时间已到：未完成和仍在排队的源都按超时处理
+        elapsed = deadline
+        timed_out = [(source_key, future) for future, (_, source_key) in pending.items()]
+        for host_queue in queues.values():
+            timed_out.extend((source_key, None) for source_key in host_queue)
+            host_queue.clear()
+        for source_key, future in timed_out:
+            error = DeadlineExceeded(f"超过整体截止时间 {deadline:.0f} 秒", future)
+            yield FetchResult(source_key, sources[source_key], None, error, elapsed)
+    finally:
+        executor.shutdown()
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+长连接 HTTP 连接池
+同一主机的请求复用 TCP+TLS 连接，自动协商 gzip/deflate 压缩，并统计连接复用情况
+"""
+
+import http.client
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import zlib
+from typing import Dict, List, Tuple
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; OpenClaw/1.0)'
+MAX_IDLE_PER_HOST = 4
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# 复用的空闲连接可能已被服务器关闭，遇到这些异常时换新连接重试一次
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def _timed_create_connection(timings: Dict[str, float]):
+    """替换 HTTPConnection._create_connection，分别记录 DNS 解析和 TCP 连接耗时"""
+    def create_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None):
+        host, port = address
+        start = time.monotonic()
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        timings['dns'] = time.monotonic() - start
+
+        error = None
+        for family, socktype, proto, _, sockaddr in infos:
+            sock = socket.socket(family, socktype, proto)
+            try:
+                if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                start = time.monotonic()
+                sock.connect(sockaddr)
+                timings['connect'] = time.monotonic() - start
+                return sock
+            except OSError as e:
+                error = e
+                sock.close()
+        raise error or OSError(f"无法解析主机: {host}")
+    return create_connection
+
+
+class PooledResponse:
+    """
+    连接池返回的响应，read() 得到的是解压后的内容
+
+    读完或 close() 后连接自动归还连接池；未读完就关闭的连接会被丢弃。
+    timings 记录本次请求各阶段耗时（秒）和字节数：dns/connect/tls 只在新建连接时有值，
+    ttfb 为发出请求到收到响应头，body 为读取响应体的累计时间（不含调用方处理数据的时间）
+    """
+
+    def __init__(self, pool: 'HTTPPool', key: Tuple, conn, response: http.client.HTTPResponse, url: str,
+                 timings: Dict = None):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._response = response
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.timings = timings if timings is not None else {}
+        self.timings.setdefault('body', 0.0)
+        self.timings.setdefault('bytes_wire', 0)
+        self.timings.setdefault('bytes_decoded', 0)
+
+        encoding = (response.headers.get('Content-Encoding') or '').strip().lower()
+        self._encoding = encoding if encoding in ('gzip', 'deflate') else ''
+        if self._encoding == 'gzip':
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self._encoding == 'deflate':
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+        else:
+            self._decompressor = None
+        self._decoded_any = False
+
+    def _decode(self, raw: bytes) -> bytes:
+        if self._decompressor is None:
+            return raw
+        try:
+            out = self._decompressor.decompress(raw)
+        except zlib.error:
+            # 部分服务器的 deflate 不带 zlib 头，退回原始 deflate 流
+            if self._encoding != 'deflate' or self._decoded_any:
+                raise
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            out = self._decompressor.decompress(raw)
+        self._decoded_any = True
+        return out
+
+    def read(self, amt: int = None) -> bytes:
+        """读取内容；指定 amt 时按块读取，返回 b'' 表示结束"""
+        if self._response is None:
+            return b''
+        start = time.monotonic()
+        try:
+            return self._read(amt)
+        finally:
+            self.timings['body'] += time.monotonic() - start
+
+    def _count(self, bytes_wire: int = 0, bytes_decoded: int = 0):
+        self.timings['bytes_wire'] += bytes_wire
+        self.timings['bytes_decoded'] += bytes_decoded
+        self._pool._count(bytes_wire=bytes_wire, bytes_decoded=bytes_decoded)
+
+    def _read(self, amt: int = None) -> bytes:
+        if amt is None:
+            raw = self._response.read()
+            out = self._decode(raw)
+            if self._decompressor is not None:
+                out += self._decompressor.flush()
+            self._count(bytes_wire=len(raw), bytes_decoded=len(out))
+            self.close()
+            return out
+
+        while True:
+            raw = self._response.read(amt)
+            if not raw:
+                out = self._decompressor.flush() if self._decompressor is not None else b''
+                self._count(bytes_decoded=len(out))
+                self.close()
+                return out
+            out = self._decode(raw)
+            self._count(bytes_wire=len(raw), bytes_decoded=len(out))
+            if out:
+                return out
+
+    def close(self):
+        if self._response is None:
+            return
+        response, self._response = self._response, None
+        if not response.isclosed() and response.length == 0:
+            # 304/204 等没有响应体的情况，读一次即可让连接可复用
+            response.read()
+        if response.isclosed() and not response.will_close:
+            self._pool._release(self._key, self._conn)
+        else:
+            response.close()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class HTTPPool:
+    """按 (scheme, host, port) 保存空闲连接的线程安全连接池"""
+
+    def __init__(self, max_idle_per_host: int = MAX_IDLE_PER_HOST, user_agent: str = DEFAULT_USER_AGENT):
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+        self._idle: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'stale_retries': 0,
+            'redirects': 0,
+            'bytes_wire': 0,
+            'bytes_decoded': 0,
+            'connect_seconds': 0.0,
+        }
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, value in deltas.items():
+                self._stats[name] += value
+
+    def _acquire(self, key: Tuple, timeout: float, timings: Dict[str, float]):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            conn.timeout = timeout
+            self._count(connections_reused=1)
+            return conn, True
+
+        scheme, host, port = key
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        conn = conn_class(host, port, timeout=timeout)
+        conn._create_connection = _timed_create_connection(timings)
+        start = time.monotonic()
+        conn.connect()
+        elapsed = time.monotonic() - start
+        if scheme == 'https':
+            # 建连总耗时减去 DNS 和 TCP 即为 TLS 握手
+            timings['tls'] = max(0.0, elapsed - timings.get('dns', 0.0) - timings.get('connect', 0.0))
+        self._count(connections_created=1, connect_seconds=elapsed)
+        return conn, False
+
+    def _release(self, key: Tuple, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def open(self, url: str, headers: Dict[str, str] = None, timeout: float = 10,
+             max_redirects: int = MAX_REDIRECTS, method: str = 'GET', body: bytes = None) -> PooledResponse:
+        """
+        发送请求并返回 PooledResponse（GET 自动跟随重定向）
+
+        与 urllib 保持一致：4xx/5xx 抛出 urllib.error.HTTPError，网络错误抛出原始异常
+        """
+        request_headers = {
+            'User-Agent': self.user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        request_headers.update(headers or {})
+
+        for _ in range(max_redirects + 1):
+            response = self._send(url, request_headers, timeout, method, body)
+            location = response.headers.get('Location')
+            if method == 'GET' and response.status in REDIRECT_CODES and location:
+                response.read()
+                url = urllib.parse.urljoin(url, location)
+                self._count(redirects=1)
+                continue
+            if response.status >= 400:
+                response.read()
+                raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+            return response
+
+        raise urllib.error.URLError(f"重定向次数过多: {url}")
+
+    def _send(self, url: str, headers: Dict[str, str], timeout: float, method: str = 'GET',
+              body: bytes = None) -> PooledResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise urllib.error.URLError(f"不支持的协议: {url}")
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        self._count(requests=1)
+        while True:
+            timings = {}
+            conn, reused = self._acquire(key, timeout, timings)
+            try:
+                start = time.monotonic()
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                timings['ttfb'] = time.monotonic() - start
+                timings['reused'] = reused
+                return PooledResponse(self, key, conn, response, url, timings)
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                self._count(stale_retries=1)
+            except Exception:
+                conn.close()
+                raise
+
+    def get(self, url: str, headers: Dict[str, str] = None, timeout: float = 10) -> bytes:
+        """发送 GET 请求并返回完整的响应内容"""
+        with self.open(url, headers=headers, timeout=timeout) as response:
+            return response.read()
+
+    def post(self, url: str, body: bytes, headers: Dict[str, str] = None, timeout: float = 10) -> bytes:
+        """发送 POST 请求并返回完整的响应内容"""
+        with self.open(url, headers=headers, timeout=timeout, method='POST', body=body) as response:
+            return response.read()
+
+    def stats(self) -> Dict:
+        """连接池统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle_connections'] = sum(len(v) for v in self._idle.values())
+        return stats
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        saved = stats['bytes_decoded'] - stats['bytes_wire']
+        return (f"请求 {stats['requests']} 次，新建连接 {stats['connections_created']} 个，"
+                f"复用 {stats['connections_reused']} 次，传输 {stats['bytes_wire']} bytes"
+                f"（压缩节省 {max(saved, 0)} bytes）")
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool() -> HTTPPool:
+    """进程内共享的默认连接池"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HTTPPool()
+        return _default_pool
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+各源最近一次成功解析的文章
+源失败或未在截止时间前返回时用这里的内容生成摘要（标明内容的年龄），
+后台抓取完成后随时更新，供下次运行使用
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from daily_tech_digest.config import LAST_GOOD_FILE
+
+
+class LastGood(NamedTuple):
+    entries: List[Dict]
+    fetched_at: float
+
+    def age(self, now: float = None) -> float:
+        return (time.time() if now is None else now) - self.fetched_at
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 3600:
+        return f"{max(1, int(seconds // 60))} 分钟前"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} 小时前"
+    return f"{int(seconds // 86400)} 天前"
+
+
+class LastGoodStore:
+    """所有源保存在一个 JSON 文件中，put() 可在抓取线程中调用"""
+
+    def __init__(self, path: str = LAST_GOOD_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict] = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._sources = json.load(f)
+        except (OSError, ValueError):
+            self._sources = {}
+
+    def get(self, source_key: str) -> Optional[LastGood]:
+        with self._lock:
+            item = self._sources.get(source_key)
+        if not item or not item.get('entries'):
+            return None
+        return LastGood(item['entries'], item['fetched_at'])
+
+    def put(self, source_key: str, entries: List[Dict]):
+        """保存一个源的最新文章并立即写盘；空结果不覆盖已有内容"""
+        if not entries:
+            return
+        with self._lock:
+            self._sources[source_key] = {'entries': entries, 'fetched_at': time.time()}
+            data = json.dumps(self._sources, ensure_ascii=False)
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"     ⚠️ 保存最近文章失败: {e}")
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+运行指标
+每次运行结束后把各阶段、各源的耗时/字节数/文章数/错误类别写成 JSON lines，
+可选输出 Prometheus 文本格式（node_exporter textfile），测试模式下打印汇总表
+"""
+
+import json
+import os
+import socket
+import urllib.error
+import uuid
+from typing import Dict, List
+
+# 源的网络阶段，依次为 DNS、TCP 连接、TLS 握手、首字节、读取响应体，以及解析
+SOURCE_PHASES = ('dns', 'connect', 'tls', 'ttfb', 'body', 'parse')
+
+
+def categorize_error(error) -> str:
+    """把异常归类，便于按类别统计"""
+    if error is None:
+        return ''
+    if isinstance(error, str):
+        return 'circuit_open' if error == '熔断中' else 'other'
+    if isinstance(error, urllib.error.HTTPError):
+        return 'http_4xx' if error.code < 500 else 'http_5xx'
+    if isinstance(error, (TimeoutError, socket.timeout)):
+        return 'timeout'
+    if isinstance(error, socket.gaierror):
+        return 'dns'
+    if isinstance(error, urllib.error.URLError):
+        reason = getattr(error, 'reason', None)
+        return categorize_error(reason) if isinstance(reason, BaseException) else 'connection'
+    if isinstance(error, (ConnectionError, OSError)):
+        return 'connection'
+    return 'other'
+
+
+def collect(run) -> List[Dict]:
+    """从一次运行中整理出指标记录：每个源一条、每个阶段一条、整体一条"""
+    base = {'run_id': uuid.uuid4().hex[:12], 'ts': run.now_ts, 'variant': run.config.get('name', '')}
+    records = []
+    for source_key, metrics in sorted(run.source_metrics.items()):
+        records.append(dict(base, kind='source', source=source_key, **metrics))
+    for channel, metrics in sorted(run.delivery_metrics.items()):
+        records.append(dict(base, kind='delivery', channel=channel, **metrics))
+    for stage, seconds in run.timings.items():
+        records.append(dict(base, kind='stage', stage=stage, seconds=round(seconds, 6)))
+    records.append(dict(
+        base, kind='run',
+        seconds=round(sum(run.timings.values()), 6),
+        sources=len(run.source_metrics),
+        errors=len(run.errors),
+        articles=len(run.articles),
+        selected=sum(len(v) for v in run.selected.values()),
+        delivered=run.delivered,
+        test_mode=run.test_mode,
+    ))
+    return records
+
+
+def write_jsonl(records: List[Dict], path: str):
+    """追加写入 JSON lines；写入失败只提示不影响推送"""
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError as e:
+        print(f"⚠️ 写入运行指标失败: {e}")
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{k}="{str(v).replace(chr(34), "")}"' for k, v in labels.items()) + '}'
+
+
+def format_prometheus(records: List[Dict]) -> str:
+    """Prometheus 文本格式"""
+    lines = [
+        '# HELP digest_stage_seconds Duration of each digest pipeline stage.',
+        '# TYPE digest_stage_seconds gauge',
+    ]
+    for r in records:
+        if r['kind'] == 'stage':
+            lines.append(f"digest_stage_seconds{_labels(variant=r['variant'], stage=r['stage'])} {r['seconds']}")
+
+    lines += ['# HELP digest_source_seconds Duration of each network/parse phase per source.',
+              '# TYPE digest_source_seconds gauge']
+    for r in records:
+        if r['kind'] == 'source':
+            for phase in SOURCE_PHASES + ('elapsed',):
+                if r.get(phase) is not None:
+                    lines.append(f"digest_source_seconds{_labels(source=r['source'], phase=phase)} {r[phase]}")
+
+    lines += ['# HELP digest_source_bytes Bytes received per source.', '# TYPE digest_source_bytes gauge']
+    for r in records:
+        if r['kind'] == 'source':
+            lines.append(f"digest_source_bytes{_labels(source=r['source'], encoding='wire')} {r.get('bytes_wire', 0)}")
+            lines.append(f"digest_source_bytes{_labels(source=r['source'], encoding='decoded')} "
+                         f"{r.get('bytes_decoded', 0)}")
+
+    lines += ['# HELP digest_source_items Items parsed per source.', '# TYPE digest_source_items gauge']
+    lines += [f"digest_source_items{_labels(source=r['source'])} {r.get('items', 0)}"
+              for r in records if r['kind'] == 'source']
+
+    lines += ['# HELP digest_source_error Source fetch failed in the last run, by category.',
+              '# TYPE digest_source_error gauge']
+    lines += [f"digest_source_error{_labels(source=r['source'], category=r['error_category'])} 1"
+              for r in records if r['kind'] == 'source' and r.get('error_category')]
+
+    deliveries = [r for r in records if r['kind'] == 'delivery' and not r.get('skipped')]
+    if deliveries:
+        lines += ['# HELP digest_delivery_seconds Time to deliver the digest per channel, including retries.',
+                  '# TYPE digest_delivery_seconds gauge']
+        lines += [f"digest_delivery_seconds{_labels(channel=r['channel'])} {r.get('seconds', 0)}" for r in deliveries]
+        lines += ['# TYPE digest_delivery_attempts gauge']
+        lines += [f"digest_delivery_attempts{_labels(channel=r['channel'])} {r.get('attempts', 0)}"
+                  for r in deliveries]
+        lines += ['# TYPE digest_delivery_error gauge']
+        lines += [f"digest_delivery_error{_labels(channel=r['channel'], category=r['error_category'])} 1"
+                  for r in deliveries if r.get('error_category')]
+
+    run = next(r for r in records if r['kind'] == 'run')
+    lines += ['# HELP digest_run_timestamp_seconds Time of the last digest run.',
+              '# TYPE digest_run_timestamp_seconds gauge',
+              f"digest_run_timestamp_seconds{_labels(variant=run['variant'])} {run['ts']}",
+              '# TYPE digest_run_articles gauge',
+              f"digest_run_articles{_labels(variant=run['variant'], set='candidates')} {run['articles']}",
+              f"digest_run_articles{_labels(variant=run['variant'], set='selected')} {run['selected']}"]
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(records: List[Dict], path: str):
+    """先写临时文件再替换，避免 node_exporter 读到半截内容"""
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(format_prometheus(records))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ 写入 Prometheus 指标失败: {e}")
+
+
+def _ms(value) -> str:
+    return f"{value * 1000:.0f}" if value is not None else '-'
+
+
+def format_summary(records: List[Dict]) -> str:
+    """各源耗时汇总表（毫秒）"""
+    header = f"{'源':<24}{'DNS':>6}{'连接':>6}{'TLS':>6}{'首字节':>7}{'读取':>6}{'解析':>6}{'KB':>7}{'篇数':>6}  状态"
+    lines = ['📈 各源耗时（ms）', header]
+    for r in records:
+        if r['kind'] != 'source':
+            continue
+        if r.get('error_category'):
+            status = f"❌ {r['error_category']}"
+        elif r.get('stale'):
+            status = '♻️ 旧缓存'
+        elif r.get('from_cache'):
+            status = '304'
+        else:
+            status = '✅'
+        lines.append(f"{r['source'][:23]:<24}{_ms(r.get('dns')):>6}{_ms(r.get('connect')):>6}{_ms(r.get('tls')):>6}"
+                     f"{_ms(r.get('ttfb')):>7}{_ms(r.get('body')):>6}{_ms(r.get('parse')):>6}"
+                     f"{r.get('bytes_wire', 0) / 1024:>7.1f}{r.get('items', 0):>6}  {status}")
+    for r in records:
+        if r['kind'] != 'delivery':
+            continue
+        if r.get('skipped'):
+            status = '⏭️ 已推送过'
+        elif r.get('error_category'):
+            status = f"❌ {r['error_category']}"
+        else:
+            status = '✅'
+        lines.append(f"📤 {r['channel']}: {_ms(r.get('seconds'))}ms，{r.get('messages', 0)} 条消息，"
+                     f"尝试 {r.get('attempts', 0)} 次  {status}")
+    return '\n'.join(lines)
@@ -0,0 +1,631 @@
+# -*- coding: utf-8 -*-
+"""
+每日技术摘要流水线
+fetch → parse → normalize → dedupe → score → select → enrich → render → deliver，
+每个阶段的后端可在 variant 配置中替换，并记录各阶段耗时；
+网络、SQLite、HTML 解析和推送相关的模块在用到的阶段才导入，cron 冷启动和 --list 不为用不到的功能付出导入时间
+"""
+
+import calendar
+import datetime
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from daily_tech_digest import render  # noqa: F401  注册渲染后端
+from daily_tech_digest.config import (ARTICLE_DB_FILE, ARTICLES_PER_DAY, DEFAULT_RATIOS, LAST_GOOD_FILE,
+                                      METRICS_FILE, RSS_SOURCES, SENT_INDEX_FILE, SOURCE_HEALTH_FILE,
+                                      get_variant)
+from daily_tech_digest.dates import DateParser
+from daily_tech_digest.dedupe import SentIndex, dedupe_articles
+from daily_tech_digest.preferences import PreferenceSnapshot
+from daily_tech_digest.scoring import calculate_freshness, freshness_score, weighted_score
+from daily_tech_digest.selection import select_articles, select_top
+from daily_tech_digest.stages import STAGES, get_backend, register, register_lazy
+from daily_tech_digest.topics import TopicMatcher
+
+register_lazy('deliver', ('stdout', 'openclaw', 'channels', 'webhook', 'spool', 'socket'), 'daily_tech_digest.deliver')
+
+
+class DigestRun:
+    """一次运行的状态，在各阶段之间传递"""
+
+    def __init__(self, config: Dict, test_mode: bool = False):
+        self.config = config
+        self.test_mode = test_mode
+        # 整个运行只取一次当前时间
+        self.now = datetime.datetime.now(datetime.timezone.utc)
+        self.now_ts = int(self.now.timestamp())
+        self.dates = DateParser()
+        self.ratios = DEFAULT_RATIOS.copy()
+        self.topics: List[str] = []
+        self.raw: Dict[str, List[Dict]] = {}
+        self.errors: Dict[str, str] = {}
+        self.stale: Dict[str, float] = {}  # 使用旧内容的源及内容年龄（秒）
+        self.source_metrics: Dict[str, Dict] = {}  # 各源耗时、字节数、篇数和错误类别
+        self.delivery_metrics: Dict[str, Dict] = {}  # 各推送渠道的耗时、重试次数和错误
+        self.metrics: List[Dict] = []
+        self.articles: List[Dict] = []
+        self.selected: Dict[str, List[Dict]] = {}
+        self.digest = ''
+        self.rendered: Dict[str, str] = {}  # 各输出格式的渲染结果
+        self.formatter = None  # 渲染时缓存每篇文章的展示字段
+        self.delivered = False
+        self.sent_index = None
+        self.article_store = None
+        # 重新验证时超过截止时间仍在下载的源：源 → (Future, 最晚等到的 monotonic 时间)
+        self.late_fetches: Dict[str, tuple] = {}
+        self.timings: Dict[str, float] = {}
+        self._timing_lock = threading.Lock()
+
+    def add_timing(self, stage: str, seconds: float):
+        with self._timing_lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def cutoff(self):
+        """max_age_days 对应的最早发布时间戳"""
+        days = self.config['max_age_days']
+        return self.now_ts - days * 86400 if days else None
+
+
+def _article_store(run: DigestRun):
+    if not run.config['incremental']:
+        return None
+    if run.article_store is None:
+        import sqlite3
+        from daily_tech_digest.article_store import ArticleStore
+        try:
+            run.article_store = ArticleStore(ARTICLE_DB_FILE)
+        except sqlite3.Error as e:
+            print(f"⚠️ 打开文章库失败（{e}），本次不使用增量模式")
+            run.config['incremental'] = False
+    return run.article_store
+
+
+# ---------- fetch / parse ----------
+
+def _ordered(source_key: Optional[str]) -> bool:
+    """源的条目是否按发布时间从新到旧排列（按热度排列的源不能用高水位过滤）"""
+    return RSS_SOURCES.get(source_key, {}).get('ordered', True)
+
+
+def _parse_stream(chunks: Iterator[bytes], run: DigestRun, since: int, entries: List[Dict],
+                  source_key: str = None):
+    """流式解析到 entries 中；XML 格式错误时抛出 ParseError，已解析的文章保留在 entries"""
+    from daily_tech_digest.stream_parser import iter_feed_items
+
+    ordered = _ordered(source_key)
+    cutoff = run.cutoff()
+    if since is not None and ordered:
+        # 与高水位同一秒发布的文章仍然解析，入库时按链接忽略已有的；
+        # 乱序的源不按高水位过滤，已入库的文章由 INSERT OR IGNORE 按链接忽略
+        cutoff = max(cutoff or 0, since)
+    for entry in iter_feed_items(chunks, limit=run.config['max_items'], cutoff=cutoff,
+                                 date_parser=run.dates, stop_on_stale=ordered, source=source_key):
+        entries.append(entry)
+
+
+@register('parse', 'stdlib')
+def parse_stdlib(chunks: Iterator[bytes], run: DigestRun, since: int = None,
+                 source_key: str = None) -> List[Dict]:
+    """标准库流式解析，取够篇数或遇到过期（或早于高水位 since）的文章后停止读取"""
+    import xml.etree.ElementTree as ET
+
+    entries = []
+    try:
+        _parse_stream(chunks, run, since, entries, source_key)
+    except ET.ParseError as e:
+        # 保留出错前已解析的文章；网络错误继续向上抛出，由缓存层处理
+        print(f"     ⚠️ 解析失败: {e}")
+    return entries
+
+
+@register('parse', 'auto')
+def parse_auto(chunks: Iterator[bytes], run: DigestRun, since: int = None,
+               source_key: str = None) -> List[Dict]:
+    """先用标准库流式解析，只有 feed 不是合法 XML 时才导入 feedparser 重新解析已下载的内容"""
+    import xml.etree.ElementTree as ET
+
+    received = []
+
+    def recorded():
+        for chunk in chunks:
+            received.append(chunk)
+            yield chunk
+
+    entries = []
+    try:
+        _parse_stream(recorded(), run, since, entries, source_key)
+        return entries
+    except ET.ParseError as e:
+        try:
+            import feedparser  # noqa: F401
+        except ImportError:
+            print(f"     ⚠️ 解析失败: {e}")
+            return entries
+    print("     ↪️ XML 格式有误，改用 feedparser 解析")
+    return parse_feedparser(iter(received + list(chunks)), run, since, source_key)
+
+
+@register('parse', 'feedparser')
+def parse_feedparser(chunks: Iterator[bytes], run: DigestRun, since: int = None,
+                     source_key: str = None) -> List[Dict]:
+    """feedparser 解析（需要完整内容），未安装时退回标准库解析"""
+    try:
+        import feedparser
+    except ImportError:
+        return parse_stdlib(chunks, run, since, source_key)
+
+    if not _ordered(source_key):
+        since = None
+    feed = feedparser.parse(b''.join(chunks))
+    entries = []
+    for entry in feed.entries[:run.config['max_items']]:
+        published_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        pub_ts = calendar.timegm(published_parsed[:6]) if published_parsed else None
+        if since is not None and pub_ts is not None and pub_ts < since:
+            continue
+        entries.append({
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'published': entry.get('published', '') or entry.get('updated', ''),
+            'summary': entry.get('summary', '')[:200],
+            'pub_ts': pub_ts,
+        })
+    return entries
+
+
+def _record_fetch_metrics(run: DigestRun, metrics: Dict, feed, entries: List[Dict]):
+    timings = feed.timings or {}
+    for phase in ('dns', 'connect', 'tls', 'ttfb', 'body'):
+        if phase in timings:
+            metrics[phase] = round(timings[phase], 6)
+    metrics['parse'] = round(max(0.0, metrics.get('parse', 0.0) - timings.get('body', 0.0)), 6)
+    run.add_timing('parse', metrics['parse'])
+    metrics.update({
+        'status': feed.status,
+        'from_cache': feed.from_cache,
+        'stale': feed.stale,
+        'reused_connection': timings.get('reused', False),
+        'bytes_wire': timings.get('bytes_wire', 0),
+        'bytes_decoded': timings.get('bytes_decoded', 0),
+        'items': len(entries),
+    })
+
+
+@register('fetch', 'http')
+def fetch_http(run: DigestRun) -> None:
+    """并发抓取所有源，抓取的同时交给 parse 后端解析"""
+    from daily_tech_digest.feed_cache import get_feed_cache
+    from daily_tech_digest.fetcher import DeadlineExceeded, fetch_all
+    from daily_tech_digest.http_pool import get_pool
+    from daily_tech_digest.last_good import LastGoodStore, format_age
+    from daily_tech_digest.metrics import categorize_error
+    from daily_tech_digest.source_health import SourceHealth, backoff_delay
+
+    config = run.config
+    parse_name = config['backends']['parse']
+    parse_backend = get_backend('parse', parse_name)
+    parse_key = f"{parse_name}:{config['max_items']}:{config['max_age_days']}"
+    cache = get_feed_cache()
+    health = SourceHealth(SOURCE_HEALTH_FILE)
+    article_store = _article_store(run)
+    # 增量模式下只解析比高水位更新的文章，失败源的旧文章本来就在文章库中
+    watermarks = article_store.watermarks(run.now_ts) if article_store is not None else {}
+    use_last_good = config['stale_while_revalidate'] and article_store is None
+    store = LastGoodStore(LAST_GOOD_FILE) if use_last_good else None
+    last_good = {}
+    if store is not None:
+        for key in config['sources']:
+            item = store.get(key)
+            if item is not None:
+                last_good[key] = item
+
+    def parser_for(source_key):
+        since = watermarks.get(source_key)
+        metrics = run.source_metrics.setdefault(source_key, {})
+
+        def parse_timed(chunks):
+            # 流式解析时包含读取网络数据的时间，抓取结束后再减去读取响应体的时间
+            start = time.monotonic()
+            try:
+                return parse_backend(chunks, run, since, source_key)
+            finally:
+                metrics['parse'] = metrics.get('parse', 0.0) + time.monotonic() - start
+        return parse_timed
+
+    sources = {}
+    for key in config['sources']:
+        if health.is_open(key):
+            minutes = health.open_remaining(key) / 60
+            print(f"  ⏸️ {RSS_SOURCES[key]['name']} 连续失败，熔断中（约 {minutes:.0f} 分钟后重试）")
+            run.errors[key] = '熔断中'
+            run.source_metrics[key] = {'error_category': categorize_error(run.errors[key])}
+            continue
+        sources[key] = RSS_SOURCES[key]
+    url_keys = {source['url']: key for key, source in sources.items()}
+
+    # 所有源都有旧内容时只短暂等待新内容，未及时返回的源直接使用旧内容
+    deadline = config['deadline']
+    if config['stale_while_revalidate'] and sources and all(
+            key in last_good or key in watermarks for key in sources):
+        deadline = min(deadline, config['revalidate_deadline'])
+    revalidating = deadline < config['deadline']
+    fetch_start = time.monotonic()
+    end_time = fetch_start + deadline
+
+    def fetch_source(url):
+        source_key = url_keys[url]
+        timeout = health.timeout_for(source_key, config['timeout'])
+        parse_timed = parser_for(source_key)
+        # 高水位不同解析结果也不同，不能复用按旧高水位缓存的解析结果
+        source_parse_key = f"{parse_key}:{watermarks.get(source_key)}"
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                entries, feed = cache.fetch_streaming(url, parse_timed, timeout=timeout,
+                                                      allow_stale=False, parse_key=source_parse_key)
+                if store is not None:
+                    # 在抓取线程中保存，超过截止时间才完成的源也会更新，供下次使用
+                    store.put(source_key, entries)
+                return entries, feed, time.monotonic() - start
+            except Exception as e:
+                delay = backoff_delay(attempt)
+                # 没有重试次数或来不及在截止时间前再试一次时，退回旧缓存
+                if attempt >= config['retries'] or time.monotonic() + delay + timeout > end_time:
+                    entries, feed = cache.load_stale(url, parse_timed, e, source_parse_key)
+                    return entries, feed, None
+                attempt += 1
+                time.sleep(delay)
+
+    print("📡 正在并发获取 RSS 源...")
+    for res in fetch_all(sources, fetch_source, deadline=deadline):
+        name = res.source_config['name']
+        metrics = run.source_metrics.setdefault(res.source_key, {})
+        metrics['elapsed'] = round(res.elapsed, 6)
+        if revalidating and isinstance(res.error, DeadlineExceeded):
+            # 只是慢于重新验证的截止时间，不算失败：先用旧内容，请求继续执行，运行结束前再取结果
+            print(f"  ⏳ {name} {deadline:.0f} 秒内未返回，先使用旧内容，稍后更新")
+            metrics['late'] = True
+            if res.error.future is not None:
+                run.late_fetches[res.source_key] = (res.error.future, fetch_start + config['deadline'])
+            continue
+        if res.error is not None:
+            print(f"  ⚠️ {name} 获取失败: {res.error}")
+            run.errors[res.source_key] = str(res.error)
+            metrics['error'] = str(res.error)
+            metrics['error_category'] = categorize_error(res.error)
+            health.record_failure(res.source_key, str(res.error))
+            continue
+        entries, feed, attempt_elapsed = res.result
+        _record_fetch_metrics(run, metrics, feed, entries)
+        if feed.stale:
+            health.record_failure(res.source_key, '使用旧缓存')
+        else:
+            health.record_success(res.source_key, attempt_elapsed)
+        # 乱序的源不按高水位过滤，解析出的篇数包含已入库的文章
+        label = '新文章 ' if article_store is not None and _ordered(res.source_key) else ''
+        print(f"  → {name}（{res.elapsed:.1f}s）✅ {label}{len(entries)} 篇")
+        run.raw[res.source_key] = entries
+    health.save()
+
+    for key in config['sources']:
+        if key in run.raw or key not in last_good:
+            continue
+        item = last_good[key]
+        run.raw[key] = item.entries[:config['max_items']]
+        run.stale[key] = item.age()
+        print(f"  ♻️ {RSS_SOURCES[key]['name']} 使用 {format_age(item.age())}的内容（{len(run.raw[key])} 篇）")
+    print(f"🔌 连接池: {get_pool().format_stats()}")
+
+
+def finish_late_fetches(run: DigestRun) -> None:
+    """
+    等待重新验证时超过截止时间的请求（最多等到完整的 deadline），完成后更新源健康状态和文章库；
+    响应体缓存和旧内容（LastGoodStore）已在抓取线程中更新
+    """
+    from concurrent.futures import wait
+    from daily_tech_digest.metrics import categorize_error
+    from daily_tech_digest.source_health import SourceHealth
+
+    wait_until = max(until for _, until in run.late_fetches.values())
+    futures = [future for future, _ in run.late_fetches.values()]
+    print(f"\n🔄 等待 {len(futures)} 个源的新内容...")
+    wait(futures, timeout=max(0.0, wait_until - time.monotonic()))
+
+    health = SourceHealth(SOURCE_HEALTH_FILE)
+    article_store = _article_store(run)
+    for source_key, (future, _) in run.late_fetches.items():
+        name = RSS_SOURCES[source_key]['name']
+        metrics = run.source_metrics.setdefault(source_key, {})
+        if not future.done():
+            # 超过源自身的超时也未完成，才算失败
+            print(f"  ⚠️ {name} 超过 {run.config['deadline']:.0f} 秒仍未返回")
+            health.record_failure(source_key, '超过整体截止时间')
+            metrics['error_category'] = 'timeout'
+            continue
+        result, error, elapsed = future.result()
+        if error is not None:
+            print(f"  ⚠️ {name} 获取失败: {error}")
+            health.record_failure(source_key, str(error))
+            metrics['error_category'] = categorize_error(error)
+            continue
+        entries, feed, attempt_elapsed = result
+        if feed.stale:
+            health.record_failure(source_key, '使用旧缓存')
+            continue
+        health.record_success(source_key, attempt_elapsed)
+        metrics['elapsed'] = round(elapsed, 6)
+        added = 0
+        if article_store is not None:
+            normalized = [article for entry in entries
+                          for article in (_normalize_entry(run, source_key, entry),) if article is not None]
+            added = article_store.add(normalized, run.now_ts)
+        print(f"  → {name}（{elapsed:.1f}s）✅ 已更新，下次使用" + (f"（新文章 {added} 篇）" if added else ''))
+    health.save()
+    run.late_fetches.clear()
+
+
+@register('fetch', 'pool')
+def fetch_pool(run: DigestRun) -> None:
+    """不访问网络，直接使用后台轮询维护的文章库；文章库为空时改为在线抓取"""
+    article_store = _article_store(run)
+    watermarks = article_store.watermarks(run.now_ts) if article_store is not None else {}
+    if not any(key in watermarks for key in run.config['sources']):
+        print("📦 候选池为空，改为在线抓取")
+        fetch_http(run)
+        return
+    print("📦 使用后台轮询维护的候选池")
+
+
+@register('fetch', 'none')
+def fetch_none(run: DigestRun) -> None:
+    """不抓取（预设文章方案）"""
+
+
+# ---------- normalize / dedupe ----------
+
+def _normalize_entry(run: DigestRun, source_key: str, entry: Dict) -> Optional[Dict]:
+    """统一字段并补充来源/新鲜度；缺少标题或链接时返回 None"""
+    title = (entry.get('title') or '').strip()
+    link = (entry.get('link') or '').strip()
+    if not title or not link:
+        return None
+    pub_ts = entry.get('pub_ts')
+    if pub_ts is None:
+        pub_ts = run.dates.parse(entry.get('published', ''), source_key)
+    return {
+        'title': title,
+        'link': link,
+        'published': entry.get('published', ''),
+        'summary': entry.get('summary', ''),
+        'source': source_key,
+        'pub_ts': pub_ts,
+        'freshness_score': calculate_freshness(pub_ts, run.now_ts),
+    }
+
+
+def _accept(run: DigestRun, article: Dict) -> bool:
+    """按 variant 的类别映射、时间、新鲜度和链接过滤"""
+    config = run.config
+    source_key = article['source']
+    article['category'] = config['category_overrides'].get(source_key, RSS_SOURCES[source_key]['category'])
+    if config['link_filter'] and config['link_filter'] not in article['link']:
+        return False
+    cutoff = run.cutoff()
+    if cutoff is not None and article['pub_ts'] is not None and article['pub_ts'] <= cutoff:
+        return False
+    return article['freshness_score'] >= config['min_freshness']
+
+
+@register('normalize', 'default')
+def normalize_default(run: DigestRun) -> None:
+    """统一字段、补充来源/类别/新鲜度，并按时间、新鲜度和链接过滤"""
+    normalized = [article for source_key, entries in run.raw.items() for entry in entries
+                  for article in (_normalize_entry(run, source_key, entry),) if article is not None]
+
+    article_store = _article_store(run)
+    if article_store is None:
+        run.articles = [article for article in normalized if _accept(run, article)]
+        if run.config['sources']:
+            print(f"✅ 共获取 {len(run.articles)} 篇文章")
+        return
+
+    # 新文章入库，已有文章只用一条 SQL 更新新鲜度，候选文章从库中读取
+    added = article_store.add(normalized, run.now_ts)
+    article_store.prune(run.now_ts)
+    article_store.refresh_freshness(run.now_ts)
+    articles = []
+    for source_key in run.config['sources']:
+        for article in article_store.candidates(source_key, run.cutoff(), run.config['max_items']):
+            if _accept(run, article):
+                articles.append(article)
+    run.articles = articles
+    if run.config['sources']:
+        print(f"✅ 新文章 {added} 篇，共 {len(articles)} 篇候选文章")
+
+
+def _sent_index(run: DigestRun):
+    days = run.config['sent_history_days']
+    if not days:
+        return None
+    if run.sent_index is None:
+        run.sent_index = SentIndex(SENT_INDEX_FILE, retention_days=days)
+    return run.sent_index
+
+
+@register('dedupe', 'fingerprint')
+def dedupe_fingerprint(run: DigestRun) -> None:
+    """按规范化链接和标题指纹跨源去重，并跳过最近推送过的文章"""
+    articles, duplicates, already_sent = dedupe_articles(run.articles, _sent_index(run))
+    run.articles = articles
+    if duplicates or already_sent:
+        print(f"🧹 去重: 重复 {duplicates} 篇，已推送过 {already_sent} 篇")
+
+
+@register('dedupe', 'link')
+def dedupe_link(run: DigestRun) -> None:
+    """同一链接只保留第一次出现的文章"""
+    seen = set()
+    unique = []
+    for article in run.articles:
+        if article['link'] not in seen:
+            seen.add(article['link'])
+            unique.append(article)
+    run.articles = unique
+
+
+@register('dedupe', 'none')
+def dedupe_none(run: DigestRun) -> None:
+    """不去重"""
+
+
+# ---------- score / select ----------
+
+def _score_with(run: DigestRun, score_func) -> None:
+    # 热门主题编译成一个匹配器，每篇文章的标题只扫描一遍；
+    # 文章库中主题未变的文章直接复用上次的命中数
+    matcher = TopicMatcher(run.topics)
+    topics_key = ','.join(sorted(matcher.keywords))
+    for article in run.articles:
+        if article.get('topic_hits') is None or article.get('topics_key') != topics_key:
+            article['topic_hits'] = matcher.count(article.get('title', ''))
+            article['topics_key'] = topics_key
+        article['score'] = score_func(article, article['topic_hits'], run.now_ts)
+
+    article_store = _article_store(run)
+    if article_store is not None:
+        article_store.update_scores(run.articles)
+
+
+@register('score', 'freshness')
+def score_freshness(run: DigestRun) -> None:
+    _score_with(run, freshness_score)
+
+
+@register('score', 'weighted')
+def score_weighted(run: DigestRun) -> None:
+    _score_with(run, weighted_score)
+
+
+@register('select', 'ratio')
+def select_ratio(run: DigestRun) -> None:
+    """按用户比例分配各类别篇数，不足 ARTICLES_PER_DAY 时按分数补齐"""
+    run.selected = select_articles(run.articles, run.ratios, ARTICLES_PER_DAY)
+
+
+@register('select', 'top')
+def select_top_backend(run: DigestRun) -> None:
+    """不分类别，直接取分数最高的 ARTICLES_PER_DAY 篇"""
+    run.selected = select_top(run.articles, ARTICLES_PER_DAY)
+
+
+@register('enrich', 'none')
+def enrich_none(run: DigestRun) -> None:
+    """不下载原文，只显示标题"""
+
+
+def _displayed(run: DigestRun) -> List[Dict]:
+    """入选文章中最终显示在摘要里的部分（每个分类只显示前 per_category_limit 篇）"""
+    limit = run.config['per_category_limit']
+    return [a for articles in run.selected.values() for a in articles[:limit]]
+
+
+@register('enrich', 'readability')
+def enrich_readability(run: DigestRun) -> None:
+    """下载入选文章（只包括最终显示的）的原文页面，提取正文开头作为摘要"""
+    from daily_tech_digest.enrich import SummaryCache, enrich_articles
+
+    articles = _displayed(run)
+    if not articles:
+        return
+    cache = SummaryCache()
+    stats = enrich_articles(articles, run.config['enrichment'], cache)
+    cache.save()
+    print(f"📰 正文摘要: 下载 {stats['fetched']} 篇（{stats['bytes'] / 1024:.0f} KB），缓存 {stats['cached']} 篇，"
+          f"使用 RSS 描述 {stats['fallback']} 篇")
+
+
+# ---------- 流水线 ----------
+
+class DigestPipeline:
+    def __init__(self, config: Dict, test_mode: bool = False):
+        self.config = config
+        self.test_mode = test_mode
+
+    @classmethod
+    def from_variant(cls, name: str, test_mode: bool = False, **overrides) -> 'DigestPipeline':
+        config = get_variant(name)
+        backends = overrides.pop('backends', {})
+        config.update(overrides)
+        config['backends'].update(backends)
+        return cls(config, test_mode)
+
+    def _load_preferences(self, run: DigestRun):
+        if not self.config['use_preferences']:
+            return
+        snapshot = PreferenceSnapshot.load()
+        run.ratios = snapshot.ratios()
+        run.topics = snapshot.topics()
+        print(f"\n📊 推荐比例: {run.ratios}")
+        print(f"📚 热门主题: {run.topics}")
+
+    def _run_stage(self, run: DigestRun, stage: str, backend_name: str):
+        start = time.monotonic()
+        get_backend(stage, backend_name)(run)
+        run.add_timing(stage, time.monotonic() - start)
+
+    def run(self, stages=STAGES) -> DigestRun:
+        """依次执行 stages 中的阶段（默认全部），后台轮询只执行 fetch/normalize/score"""
+        run = DigestRun(self.config, self.test_mode)
+        backends = dict(self.config['backends'])
+
+        start = time.monotonic()
+        self._load_preferences(run)
+        run.add_timing('preferences', time.monotonic() - start)
+
+        for stage in STAGES:
+            if stage == 'parse' or stage not in stages:
+                continue  # parse 在 fetch 阶段中按源边下载边解析
+
+            if stage == 'render' and not any(run.selected.values()) and backends['render'] != 'demo':
+                if self.config['fallback'] != 'demo':
+                    print("\n❌ 没有获取到任何文章")
+                    break
+                print("\n❌ 没有获取到任何文章，使用备用方案...")
+                backends['render'] = 'demo'
+
+            if stage == 'deliver' and self.test_mode:
+                print("\n🧪 测试模式:\n")
+                print(run.digest)
+                continue
+
+            self._run_stage(run, stage, backends[stage])
+
+        if run.delivered:
+            self._record_sent(run)
+        if run.late_fetches:
+            start = time.monotonic()
+            finish_late_fetches(run)
+            run.add_timing('late_fetch', time.monotonic() - start)
+        if self.config['metrics']:
+            from daily_tech_digest.metrics import collect as collect_metrics, write_jsonl
+            run.metrics = collect_metrics(run)
+            write_jsonl(run.metrics, METRICS_FILE)
+        return run
+
+    def _record_sent(self, run: DigestRun):
+        """推送成功后记录本次显示的文章，之后几天不再重复推送；入选但没有显示的文章以后仍可推送"""
+        index = _sent_index(run)
+        if index is None:
+            return
+        index.record_articles(_displayed(run))
+        index.save()
+
+
+def format_timings(run: DigestRun) -> str:
+    """各阶段耗时（毫秒）"""
+    order = ['preferences'] + list(STAGES) + ['late_fetch']
+    parts = [f"{stage} {run.timings[stage] * 1000:.0f}ms" for stage in order if stage in run.timings]
+    return "⏱️ " + " | ".join(parts)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+后台轮询
+全天按各源的轮询间隔刷新文章库（抓取 → 入库 → 评分），推送时只需从候选池选择和渲染：
+    python3 -m daily_tech_digest --poll-once      # cron 每 5 分钟执行，只刷新到期的源
+    python3 -m daily_tech_digest --poll           # 常驻进程
+    python3 -m daily_tech_digest --fetch pool     # 推送：不访问网络，直接使用候选池
+源通过 Cache-Control/Expires 或 RSS <ttl> 建议了更长的刷新间隔时，以源的建议为准
+"""
+
+import json
+import os
+import time
+from typing import Dict, List
+
+from daily_tech_digest.config import (DEFAULT_POLL_INTERVAL, MAX_POLL_INTERVAL, POLLER_STATE_FILE,
+                                      RSS_SOURCES)
+from daily_tech_digest.feed_cache import get_feed_cache
+from daily_tech_digest.pipeline import DigestPipeline
+
+POLL_STAGES = ('fetch', 'normalize', 'score')
+MIN_SLEEP = 30
+
+
+class FeedPoller:
+    def __init__(self, variant: str = 'system', state_path: str = POLLER_STATE_FILE):
+        self.variant = variant
+        self.state_path = state_path
+        self.sources: List[str] = DigestPipeline.from_variant(variant).config['sources']
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                self.state: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def _save_state(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️ 保存轮询状态失败: {e}")
+
+    def interval_for(self, source_key: str) -> float:
+        """配置的轮询间隔；源建议的间隔更长时采用源的建议（不超过 MAX_POLL_INTERVAL）"""
+        interval = RSS_SOURCES[source_key].get('poll_interval', DEFAULT_POLL_INTERVAL)
+        hint = get_feed_cache().refresh_hint(RSS_SOURCES[source_key]['url'])
+        if hint:
+            interval = max(interval, min(hint, MAX_POLL_INTERVAL))
+        return interval
+
+    def due_sources(self, now: float = None) -> List[str]:
+        now = time.time() if now is None else now
+        return [key for key in self.sources if self.state.get(key, {}).get('next_due', 0) <= now]
+
+    def next_due(self) -> float:
+        return min((self.state.get(key, {}).get('next_due', 0) for key in self.sources), default=0)
+
+    def poll_once(self) -> List[str]:
+        """刷新所有到期的源，返回本次刷新的源"""
+        due = self.due_sources()
+        if not due:
+            return []
+
+        print(f"🔄 轮询 {len(due)} 个到期的源: {', '.join(due)}")
+        pipeline = DigestPipeline.from_variant(self.variant, sources=due, incremental=True)
+        run = pipeline.run(stages=POLL_STAGES)
+
+        now = time.time()
+        for key in due:
+            interval = self.interval_for(key)
+            self.state[key] = {
+                'last_poll': now,
+                'next_due': now + interval,
+                'ok': key not in run.errors,
+            }
+        self._save_state()
+        return due
+
+    def run_forever(self, max_cycles: int = None):
+        """常驻轮询，两次轮询之间睡到最早到期的源"""
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            self.poll_once()
+            cycles += 1
+            wait = max(MIN_SLEEP, self.next_due() - time.time())
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            print(f"💤 {wait / 60:.0f} 分钟后再次轮询")
+            time.sleep(wait)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+偏好聚合结果
+类别点击总数、归一化权重、主题排名、来源点击总数随每次点击增量更新，
+分析偏好、推荐比例、洞察报告只读取这些结果，不随点击历史的长度变慢
+"""
+
+import bisect
+from typing import Any, Dict, List, Tuple
+
+# 没有点击时使用的默认权重（与 UserPreferenceTracker 原来的默认值一致）
+DEFAULT_WEIGHTS = {"programming": 0.5, "ai": 0.5, "product": 0.2}
+TOP_K = 5
+
+
+class PreferenceAggregates:
+    """
+    基于 data["preferences"] 中的计数维护派生结果；计数本身由 apply_click 更新，
+    之后调用 add() 只调整这次点击涉及的类别、主题和来源
+    """
+
+    def __init__(self, preferences: Dict, top_k: int = TOP_K):
+        self.preferences = preferences
+        self.top_k = top_k
+        categories = preferences["categories"]
+        topics = preferences["topics"]
+        sources = preferences["sources"]
+
+        self.total_clicks = sum(cat["clicks"] for cat in categories.values())
+        self.total_source_clicks = sum(sources.values())
+        self.active_topics = sum(1 for count in topics.values() if count > 0)
+        self.active_sources = sum(1 for count in sources.values() if count > 0)
+
+        # 主题按 (-点击数, 原始顺序) 排序，与原来对字典做稳定排序的结果一致；
+        # _keys 记录每个主题当前在排名中的键，调整时按它删除，不依赖调用方推算的旧计数
+        self._keys: Dict[str, Tuple[int, int, str]] = {
+            topic: (-count, i, topic) for i, (topic, count) in enumerate(topics.items())}
+        self._ranking: List[Tuple[int, int, str]] = sorted(self._keys.values())
+        self._update_weights()
+
+    def _update_weights(self):
+        """把权重写回 data["preferences"]["categories"]，与原来 analyze_preferences 的副作用一致"""
+        categories = self.preferences["categories"]
+        if self.total_clicks > 0:
+            for cat_data in categories.values():
+                cat_data["weight"] = cat_data["clicks"] / self.total_clicks
+        else:
+            for cat_name, weight in DEFAULT_WEIGHTS.items():
+                if cat_name in categories:
+                    categories[cat_name]["weight"] = weight
+
+    def _move_topic(self, topic: str, new_count: int) -> int:
+        """把主题在排名中调整到 new_count，返回调整前的点击数"""
+        old_key = self._keys[topic]
+        del self._ranking[bisect.bisect_left(self._ranking, old_key)]
+        new_key = (-new_count, old_key[1], topic)
+        bisect.insort(self._ranking, new_key)
+        self._keys[topic] = new_key
+        return -old_key[0]
+
+    def add(self, click: Dict[str, Any]):
+        """计入一次已由 apply_click 写入计数的点击"""
+        prefs = self.preferences
+        if click.get("category") in prefs["categories"]:
+            self.total_clicks += 1
+            self._update_weights()
+
+        for topic in set(click.get("topics") or []):
+            if topic in self._keys:
+                # 同一主题在一次点击中出现多次时 apply_click 会计入多次，直接取计数的当前值
+                count = prefs["topics"][topic]
+                if self._move_topic(topic, count) == 0 and count > 0:
+                    self.active_topics += 1
+
+        source = click.get("source")
+        if source and source in prefs["sources"]:
+            self.total_source_clicks += 1
+            if prefs["sources"][source] == 1:
+                self.active_sources += 1
+
+    def top_topics(self, limit: int = None) -> List[Tuple[str, int]]:
+        return [(topic, -neg_count) for neg_count, _, topic in self._ranking[:limit or self.top_k]]
+
+    def category_weights(self) -> Dict[str, float]:
+        return {k: v["weight"] for k, v in self.preferences["categories"].items()}
+
+    def analysis(self) -> Dict[str, Any]:
+        return {
+            "totalClicks": self.total_clicks,
+            "categoryWeights": self.category_weights(),
+            "topTopics": self.top_topics(),
+            "sourcePreferences": self.preferences["sources"]
+        }
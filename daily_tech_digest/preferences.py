@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+用户偏好快照
+每次运行只读取一次偏好文件（及其点击日志），一遍扫描点击历史同时得到类别计数和主题计数；
+偏好文件和点击日志都没有变化时直接使用按 mtime 缓存的快照
+"""
+
+import json
+import os
+from typing import Dict, List
+
+from daily_tech_digest.click_journal import PreferenceStore, journal_path_for
+from daily_tech_digest.config import (ARTICLES_PER_DAY, DEFAULT_RATIOS, PREFERENCE_SNAPSHOT_FILE,
+                                      USER_PREFERENCES_FILE)
+from daily_tech_digest.topics import TopicMatcher
+
+TOPIC_KEYWORDS = ['python', 'rust', 'go', 'java', 'react', 'vue', 'docker',
+                  'kubernetes', 'k8s', 'ai', 'ml', 'security', 'linux']
+SNAPSHOT_VERSION = 3
+
+
+def load_user_preferences(path: str = USER_PREFERENCES_FILE) -> Dict:
+    """偏好快照加上点击日志中尚未合并的点击"""
+    try:
+        if os.path.exists(path) or os.path.exists(journal_path_for(path)):
+            store = PreferenceStore(path)
+            try:
+                return store.load()
+            finally:
+                store.close()
+        return {}
+    except Exception as e:
+        print(f"⚠️ 加载用户偏好失败: {e}")
+        return {}
+
+
+def _iter_clicks(preferences: Dict):
+    # UserPreferenceTracker 写入的是 clickHistory/articleTitle，早期格式是 clicks/title
+    return preferences.get('clickHistory') or preferences.get('clicks') or []
+
+
+class PreferenceSnapshot:
+    """点击历史的汇总结果：类别计数和主题计数"""
+
+    def __init__(self, category_counts: Dict[str, int] = None, topic_counts: Dict[str, int] = None,
+                 click_count: int = 0):
+        self.category_counts = category_counts or {"programming": 0, "ai": 0, "product": 0}
+        self.topic_counts = topic_counts or {}
+        self.click_count = click_count
+
+    @classmethod
+    def from_preferences(cls, preferences: Dict) -> 'PreferenceSnapshot':
+        """一遍扫描点击历史"""
+        category_counts = {"programming": 0, "ai": 0, "product": 0}
+        topic_counts = {}
+        click_count = 0
+        matcher = TopicMatcher(TOPIC_KEYWORDS)
+
+        for click in _iter_clicks(preferences):
+            click_count += 1
+            category = click.get('category', 'unknown')
+            if category in category_counts:
+                category_counts[category] += 1
+
+            title = click.get('articleTitle') or click.get('title') or ''
+            for keyword in matcher.matches(title):
+                topic_counts[keyword] = topic_counts.get(keyword, 0) + 1
+
+        return cls(category_counts, topic_counts, click_count)
+
+    @classmethod
+    def load(cls, path: str = USER_PREFERENCES_FILE,
+             cache_path: str = PREFERENCE_SNAPSHOT_FILE) -> 'PreferenceSnapshot':
+        """读取快照；偏好文件和点击日志的 mtime、大小都与缓存一致时不解析偏好文件"""
+        stats = []
+        for file_path in (path, journal_path_for(path)):
+            try:
+                stat = os.stat(file_path)
+                stats.append([stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                stats.append(None)
+        if stats == [None, None]:
+            return cls()
+        key = {'version': SNAPSHOT_VERSION, 'files': stats}
+
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                return cls(cached['category_counts'], cached['topic_counts'], cached['click_count'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        snapshot = cls.from_preferences(load_user_preferences(path))
+        snapshot.save(cache_path, key)
+        return snapshot
+
+    def save(self, cache_path: str, key: Dict):
+        data = {
+            'key': key,
+            'category_counts': self.category_counts,
+            'topic_counts': self.topic_counts,
+            'click_count': self.click_count,
+        }
+        try:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️ 保存偏好快照失败: {e}")
+
+    def ratios(self) -> Dict[str, int]:
+        """各类别推荐篇数"""
+        total_clicks = sum(self.category_counts.values())
+        if total_clicks == 0:
+            return DEFAULT_RATIOS.copy()
+
+        ratios = {}
+        for category, count in self.category_counts.items():
+            articles = (count / total_clicks) * ARTICLES_PER_DAY
+            ratios[category] = max(2, round(articles))
+        return ratios
+
+    def topics(self, limit: int = 5) -> List[str]:
+        """点击最多的主题"""
+        sorted_topics = sorted(self.topic_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+        return [topic for topic, count in sorted_topics]
+
+
+def get_user_ratios(snapshot: PreferenceSnapshot = None) -> Dict[str, int]:
+    return (snapshot or PreferenceSnapshot.load()).ratios()
+
+
+def get_user_topics(snapshot: PreferenceSnapshot = None) -> List[str]:
+    return (snapshot or PreferenceSnapshot.load()).topics()
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+摘要渲染后端
+各输出格式（Markdown、纯文本、飞书卡片 JSON）的模板在导入时预编译，渲染时只做列表拼接；
+每篇文章的标题截断、来源名称、发布时间等字段只计算一次，同一批文章渲染成多种格式时直接复用
+"""
+
+import datetime
+import json
+import string
+from typing import Dict, List
+
+from daily_tech_digest.config import CATEGORIES, RSS_SOURCES
+from daily_tech_digest.dates import to_datetime
+from daily_tech_digest.demo import generate_test_digest
+from daily_tech_digest.stages import register
+
+BEIJING_OFFSET = datetime.timedelta(hours=8)
+TITLE_WIDTH = 60
+DIVIDER = "━━━━━━━━━━━━━━━━"
+
+
+# 渲染时传给各模板的字段
+ARTICLE_FIELDS = frozenset({'index', 'title', 'md_title', 'source', 'pub_time', 'link', 'excerpt'})
+TEMPLATE_FIELDS = {
+    'header': frozenset({'date', 'total'}),
+    'category': frozenset({'name', 'count'}),
+    'article': ARTICLE_FIELDS,
+    'article_excerpt': ARTICLE_FIELDS,
+    'divider': frozenset(),
+    'topics': frozenset({'topics'}),
+    'footer': frozenset({'footer'}),
+}
+
+
+class Template:
+    """预编译模板：导入时检查字段名（不在 known 中的占位符抛出 ValueError），渲染时直接调用 str.format_map"""
+    __slots__ = ('fields', 'render')
+
+    def __init__(self, text: str, known: frozenset = None):
+        self.fields = frozenset(name for _, name, _, _ in string.Formatter().parse(text) if name)
+        if known is not None and not self.fields <= known:
+            raise ValueError(f"模板包含未知字段: {', '.join(sorted(self.fields - known))}")
+        self.render = text.format_map
+
+
+def _compile(templates: Dict[str, str]) -> Dict[str, Template]:
+    return {name: Template(text, TEMPLATE_FIELDS[name]) for name, text in templates.items()}
+
+
+# 每种格式的模板：header/category/article（有正文摘要时用 article_excerpt）/divider/topics/footer
+MARKDOWN_TEMPLATES = _compile({
+    'header': f"📅 {{date}} 每日技术摘要\n\n{DIVIDER}\n\n🔥 今日精选（{{total}} 篇）\n\n",
+    'category': "### {name}（{count} 篇）\n\n",
+    'article': "{index}. **{title}**\n   * 来源：{source}\n   * 发布：{pub_time}\n   * 链接：{link}\n\n",
+    'article_excerpt': "{index}. **{title}**\n   * 来源：{source}\n   * 发布：{pub_time}\n   * 摘要：{excerpt}\n"
+                       "   * 链接：{link}\n\n",
+    'divider': f"{DIVIDER}\n",
+    'topics': f"\n💡 个性化提示\n**热门主题：** {{topics}}\n\n{DIVIDER}\n",
+    'footer': "{footer}",
+})
+
+TEXT_TEMPLATES = _compile({
+    'header': f"📅 {{date}} 每日技术摘要\n\n{DIVIDER}\n\n🔥 今日精选（{{total}} 篇）\n\n",
+    'category': "【{name}】（{count} 篇）\n\n",
+    'article': "{index}. {title}\n   来源：{source} | 发布：{pub_time}\n   {link}\n\n",
+    'article_excerpt': "{index}. {title}\n   来源：{source} | 发布：{pub_time}\n   {excerpt}\n   {link}\n\n",
+    'divider': f"{DIVIDER}\n",
+    'topics': f"\n💡 热门主题：{{topics}}\n\n{DIVIDER}\n",
+    'footer': "{footer}",
+})
+
+# 飞书卡片中每个分类是一个 lark_md 元素
+FEISHU_TEMPLATES = _compile({
+    'category': "**{name}**（{count} 篇）\n",
+    'article': "{index}. [{md_title}]({link})\n来源：{source} · {pub_time}\n",
+    'article_excerpt': "{index}. [{md_title}]({link})\n来源：{source} · {pub_time}\n{excerpt}\n",
+    'topics': "💡 **热门主题：** {topics}",
+})
+
+
+def _format_pub_time(article, now_ts: int) -> str:
+    pub_ts = article.get('pub_ts')
+    if pub_ts is None:
+        return f"{article.get('published', 'N/A')[:20]}..."
+
+    time_str = (to_datetime(pub_ts) + BEIJING_OFFSET).strftime("%m月%d日 %H:%M")
+    hours_old = (now_ts - pub_ts) // 3600
+    if hours_old < 1:
+        time_str += " (刚刚)"
+    elif hours_old < 24:
+        time_str += f" ({hours_old}小时前)"
+    else:
+        time_str += f" ({hours_old//24}天前)"
+    return time_str
+
+
+def _escape_md(text: str) -> str:
+    """飞书 Markdown 链接文字中的方括号需要转义"""
+    return text.replace('[', '\\[').replace(']', '\\]')
+
+
+class ArticleFormatter:
+    """按 (来源, 链接) 缓存每篇文章的展示字段，多种格式共用"""
+
+    def __init__(self, now_ts: int):
+        self.now_ts = now_ts
+        self._cache: Dict[tuple, Dict[str, str]] = {}
+
+    def fields(self, article: Dict) -> Dict[str, str]:
+        key = (article.get('source'), article['link'])
+        fields = self._cache.get(key)
+        if fields is None:
+            title = article['title']
+            # 显示前60个字符，如果超过则加省略号
+            title = title[:TITLE_WIDTH] + ('...' if len(title) > TITLE_WIDTH else '')
+            fields = {
+                'title': title,
+                'md_title': _escape_md(title),
+                'source': RSS_SOURCES.get(article.get('source'), {}).get('name', 'Unknown'),
+                'pub_time': _format_pub_time(article, self.now_ts),
+                'link': article['link'],
+                'excerpt': article.get('excerpt', ''),
+            }
+            self._cache[key] = fields
+        return fields
+
+
+def _formatter(run) -> ArticleFormatter:
+    if run.formatter is None:
+        run.formatter = ArticleFormatter(run.now_ts)
+    return run.formatter
+
+
+def _sections(run):
+    """依次产出 (分类名称, 分类文章数, 要显示的文章)"""
+    limit = run.config['per_category_limit']
+    for cat_key, cat_name in CATEGORIES:
+        articles = run.selected.get(cat_key, [])
+        if articles:
+            yield cat_name, len(articles), articles[:limit]
+
+
+def _render_lines(run, templates: Dict[str, Template]) -> str:
+    """Markdown 和纯文本共用的结构，只是模板不同"""
+    config = run.config
+    formatter = _formatter(run)
+    parts: List[str] = [templates['header'].render({
+        'date': (run.now + BEIJING_OFFSET).strftime("%Y年%m月%d日"),
+        'total': sum(len(v) for v in run.selected.values()),
+    })]
+    for cat_name, count, articles in _sections(run):
+        parts.append(templates['category'].render({'name': cat_name, 'count': count}))
+        for i, article in enumerate(articles, 1):
+            fields = formatter.fields(article)
+            template = templates['article_excerpt' if fields['excerpt'] else 'article']
+            parts.append(template.render(dict(fields, index=i)))
+
+    parts.append(templates['divider'].render({}))
+    if config['show_topics']:
+        parts.append(templates['topics'].render({'topics': ', '.join(run.topics) if run.topics else '暂无数据'}))
+    parts.append(templates['footer'].render({'footer': config['footer']}))
+    return ''.join(parts)
+
+
+def _render_feishu(run) -> str:
+    """飞书消息卡片（interactive），可直接作为机器人 webhook 的请求体"""
+    config = run.config
+    formatter = _formatter(run)
+    date_str = (run.now + BEIJING_OFFSET).strftime("%Y年%m月%d日")
+    total = sum(len(v) for v in run.selected.values())
+
+    elements = []
+    for cat_name, count, articles in _sections(run):
+        parts = [FEISHU_TEMPLATES['category'].render({'name': cat_name, 'count': count})]
+        for i, article in enumerate(articles, 1):
+            fields = formatter.fields(article)
+            template = FEISHU_TEMPLATES['article_excerpt' if fields['excerpt'] else 'article']
+            parts.append(template.render(dict(fields, index=i)))
+        elements.append({'tag': 'div', 'text': {'tag': 'lark_md', 'content': ''.join(parts)}})
+        elements.append({'tag': 'hr'})
+    if config['show_topics']:
+        topics = ', '.join(run.topics) if run.topics else '暂无数据'
+        elements.append({'tag': 'div', 'text': {
+            'tag': 'lark_md', 'content': FEISHU_TEMPLATES['topics'].render({'topics': topics})}})
+    elements.append({'tag': 'note', 'elements': [{'tag': 'plain_text', 'content': config['footer']}]})
+
+    card = {
+        'msg_type': 'interactive',
+        'card': {
+            'config': {'wide_screen_mode': True},
+            'header': {
+                'template': 'blue',
+                'title': {'tag': 'plain_text', 'content': f"📅 {date_str} 每日技术摘要（{total} 篇）"},
+            },
+            'elements': elements,
+        },
+    }
+    return json.dumps(card, ensure_ascii=False)
+
+
+RENDERERS = {
+    'markdown': lambda run: _render_lines(run, MARKDOWN_TEMPLATES),
+    'text': lambda run: _render_lines(run, TEXT_TEMPLATES),
+    'feishu': _render_feishu,
+}
+
+
+def render_digest(run, target: str) -> str:
+    """渲染为指定格式；同一次运行中每种格式只渲染一次"""
+    if target not in run.rendered:
+        try:
+            renderer = RENDERERS[target]
+        except KeyError:
+            raise KeyError(f"未知的输出格式: {target}（可选：{', '.join(RENDERERS)}）")
+        run.rendered[target] = renderer(run)
+    return run.rendered[target]
+
+
+@register('render', 'markdown')
+def render_markdown(run) -> None:
+    """生成 Markdown 格式的摘要"""
+    run.digest = render_digest(run, 'markdown')
+
+
+@register('render', 'text')
+def render_text(run) -> None:
+    """纯文本格式（不含 Markdown 标记），适合短信/邮件正文"""
+    run.digest = render_digest(run, 'text')
+
+
+@register('render', 'feishu')
+def render_feishu(run) -> None:
+    """飞书消息卡片 JSON"""
+    run.digest = render_digest(run, 'feishu')
+
+
+@register('render', 'demo')
+def render_demo(run) -> None:
+    """预设文章（不依赖抓取结果）"""
+    run.digest = generate_test_digest()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+新鲜度和文章评分（发布时间为 dates 模块解析出的 UTC 时间戳）
+"""
+
+from typing import Dict, Optional
+
+DAY_SECONDS = 86400
+
+
+def calculate_freshness(pub_ts: Optional[int], now_ts: int) -> int:
+    """计算文章新鲜度分数（0-10），发布时间未知时返回 5；时间均为 UTC 时间戳"""
+    if pub_ts is None:
+        return 5
+
+    delta = (now_ts - pub_ts) // DAY_SECONDS
+    if delta <= 1:
+        return 10
+    elif delta <= 3:
+        return 8
+    elif delta <= 7:
+        return 6
+    elif delta <= 14:
+        return 4
+    elif delta <= 30:
+        return 2
+    else:
+        return 0
+
+
+def freshness_score(article: Dict, topic_hits: int, now_ts: int) -> int:
+    """基础分 + 新鲜度 + 主题相关度（命中任一热门主题 +10）"""
+    score = 50
+    score += article.get('freshness_score', 0)
+    if topic_hits:
+        score += 10
+    return score
+
+
+def weighted_score(article: Dict, topic_hits: int, now_ts: int) -> int:
+    """基础分 + 按小时计算的新鲜度 + 每个命中主题 +20 + 来源优先级"""
+    score = 50  # 基础分
+
+    # 时间新鲜度（越新越好）
+    pub_ts = article.get('pub_ts')
+    if pub_ts is not None:
+        hours_old = (now_ts - pub_ts) / 3600
+        if hours_old < 24:
+            score += 20  # 24小时内
+        elif hours_old < 48:
+            score += 15  # 48小时内
+        elif hours_old < 72:
+            score += 10  # 72小时内
+
+    # 主题相关度
+    score += 20 * topic_hits
+
+    # 来源优先级
+    source = article.get('source', '')
+    if 'featured' in source:
+        score += 15
+    elif 'ai' in source:
+        score += 10
+    elif 'hacker' in source:
+        score += 8
+
+    return score
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+文章选择
+每个类别维护一个容量为配额的小顶堆，另有一个容量为总篇数的全局堆用于补齐；
+文章逐篇加入，不需要整体排序，也可以直接接收生成器
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+from daily_tech_digest.config import ARTICLES_PER_DAY, CATEGORIES
+
+# 堆元素：(分数, -序号, 序号, 文章)；分数相同时先到的文章排在前面，与稳定排序一致
+_Entry = Tuple[float, int, int, Dict]
+
+
+def _push_bounded(heap: List[_Entry], entry: _Entry, capacity: int):
+    if capacity <= 0:
+        return
+    if len(heap) < capacity:
+        heapq.heappush(heap, entry)
+    elif entry[:2] > heap[0][:2]:
+        heapq.heapreplace(heap, entry)
+
+
+def _descending(heap: List[_Entry]) -> List[_Entry]:
+    return sorted(heap, key=lambda e: e[:2], reverse=True)
+
+
+class ArticleSelector:
+    """
+    按类别配额选择文章
+
+    先给每个类别选出分数最高的 ratios[类别] 篇，总数不足 total 时
+    从剩余文章中按分数补齐；只考虑 categories 中的类别
+    """
+
+    def __init__(self, ratios: Dict[str, int], total: int = ARTICLES_PER_DAY,
+                 categories: Iterable[str] = None):
+        self.total = total
+        self.categories = list(categories) if categories is not None else [key for key, _ in CATEGORIES]
+        self.quotas = {category: ratios.get(category, 3) for category in self.categories}
+        self._category_heaps: Dict[str, List[_Entry]] = {category: [] for category in self.categories}
+        self._overall: List[_Entry] = []
+        self._seq = 0
+
+    def add(self, article: Dict):
+        category = article.get('category', 'programming')
+        if category not in self._category_heaps:
+            return
+        seq = self._seq
+        self._seq += 1
+        entry = (article.get('score', 0), -seq, seq, article)
+        _push_bounded(self._category_heaps[category], entry, self.quotas[category])
+        _push_bounded(self._overall, entry, self.total)
+
+    def extend(self, articles: Iterable[Dict]):
+        for article in articles:
+            self.add(article)
+
+    def result(self) -> Dict[str, List[Dict]]:
+        selected = {category: [] for category in self.categories}
+        chosen = set()
+        for category, heap in self._category_heaps.items():
+            for _, _, seq, article in _descending(heap):
+                selected[category].append(article)
+                chosen.add(seq)
+
+        # 还需补齐的篇数一定在全局前 total 篇之内
+        remaining = self.total - len(chosen)
+        for _, _, seq, article in _descending(self._overall):
+            if remaining <= 0:
+                break
+            if seq not in chosen:
+                selected[article.get('category', 'programming')].append(article)
+                remaining -= 1
+        return selected
+
+
+def select_articles(articles: Iterable[Dict], ratios: Dict[str, int],
+                    total: int = ARTICLES_PER_DAY) -> Dict[str, List[Dict]]:
+    selector = ArticleSelector(ratios, total)
+    selector.extend(articles)
+    return selector.result()
+
+
+def select_top(articles: Iterable[Dict], total: int = ARTICLES_PER_DAY) -> Dict[str, List[Dict]]:
+    """不分类别，取分数最高的 total 篇"""
+    selected = {}
+    for article in heapq.nlargest(total, articles, key=lambda x: x['score']):
+        selected.setdefault(article.get('category', 'programming'), []).append(article)
+    return selected
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+RSS 源健康记录：自适应超时和熔断
+每个源保存最近的耗时和连续失败次数；超时时间取最近耗时的 p95，
+连续失败的源在冷却期内直接跳过，冷却结束后放行一次试探请求
+"""
+
+import json
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+HISTORY_SIZE = 20          # 每个源保留的最近耗时个数
+MIN_SAMPLES = 3            # 少于这么多样本时使用配置的固定超时
+TIMEOUT_FACTOR = 2.0       # 超时 = p95 × 系数
+MIN_TIMEOUT = 3.0
+FAILURE_THRESHOLD = 3      # 连续失败这么多次后熔断
+BASE_COOLDOWN = 30 * 60    # 首次熔断冷却 30 分钟，之后每次翻倍
+MAX_COOLDOWN = 24 * 3600
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 8.0) -> float:
+    """指数退避加全抖动：0 ~ min(cap, base × 2^attempt) 之间的随机值"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class SourceHealth:
+    """按源记录耗时和失败情况，保存在一个 JSON 文件中"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sources: Dict[str, Dict] = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._sources = json.load(f)
+        except (OSError, ValueError):
+            self._sources = {}
+
+    def _entry(self, source_key: str) -> Dict:
+        return self._sources.setdefault(source_key, {
+            'latencies': [], 'failures': 0, 'open_until': 0, 'last_error': None,
+        })
+
+    def timeout_for(self, source_key: str, default: float) -> float:
+        """根据最近耗时的 p95 计算超时，不超过配置的超时"""
+        latencies = self._sources.get(source_key, {}).get('latencies', [])
+        if len(latencies) < MIN_SAMPLES:
+            return default
+        return max(MIN_TIMEOUT, min(default, percentile(latencies, 0.95) * TIMEOUT_FACTOR))
+
+    def is_open(self, source_key: str, now: float = None) -> bool:
+        """熔断中（冷却期未结束）返回 True"""
+        now = time.time() if now is None else now
+        return self._sources.get(source_key, {}).get('open_until', 0) > now
+
+    def open_remaining(self, source_key: str) -> float:
+        return max(0.0, self._sources.get(source_key, {}).get('open_until', 0) - time.time())
+
+    def record_success(self, source_key: str, elapsed: Optional[float]):
+        entry = self._entry(source_key)
+        if elapsed is not None:
+            entry['latencies'] = (entry['latencies'] + [round(elapsed, 3)])[-HISTORY_SIZE:]
+        entry['failures'] = 0
+        entry['open_until'] = 0
+        entry['last_error'] = None
+
+    def record_failure(self, source_key: str, error: str):
+        entry = self._entry(source_key)
+        entry['failures'] += 1
+        entry['last_error'] = error
+        over = entry['failures'] - FAILURE_THRESHOLD
+        if over >= 0:
+            # 冷却时间随失败次数翻倍，加 ±20% 抖动，避免多个源同时恢复
+            cooldown = min(MAX_COOLDOWN, BASE_COOLDOWN * (2 ** over))
+            entry['open_until'] = time.time() + cooldown * random.uniform(0.8, 1.2)
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._sources, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 保存源健康记录失败: {e}")
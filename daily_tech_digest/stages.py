@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+流水线阶段和后端注册表
+每个阶段可以注册多个后端，由 variant 配置中的 backends 选择使用哪一个
+"""
+
+import importlib
+from typing import Callable, Dict, List
+
+STAGES = ('fetch', 'parse', 'normalize', 'dedupe', 'score', 'select', 'enrich', 'render', 'deliver')
+
+BACKENDS: Dict[str, Dict[str, Callable]] = {stage: {} for stage in STAGES}
+# 尚未导入的后端：名称 → 注册它的模块，第一次用到时才导入，减少启动时间
+LAZY_BACKENDS: Dict[str, Dict[str, str]] = {stage: {} for stage in STAGES}
+
+
+def register(stage: str, name: str):
+    """注册阶段后端的装饰器"""
+    if stage not in BACKENDS:
+        raise KeyError(f"未知的阶段: {stage}")
+
+    def decorator(func: Callable) -> Callable:
+        BACKENDS[stage][name] = func
+        return func
+
+    return decorator
+
+
+def register_lazy(stage: str, names, module: str):
+    """声明 module 中注册的后端，get_backend 用到其中之一时才导入 module"""
+    if stage not in LAZY_BACKENDS:
+        raise KeyError(f"未知的阶段: {stage}")
+    for name in names:
+        LAZY_BACKENDS[stage][name] = module
+
+
+def backend_names(stage: str) -> List[str]:
+    """已注册和延迟注册的所有后端名称"""
+    return list(BACKENDS[stage]) + [name for name in LAZY_BACKENDS[stage] if name not in BACKENDS[stage]]
+
+
+def get_backend(stage: str, name: str) -> Callable:
+    if name not in BACKENDS.get(stage, {}) and name in LAZY_BACKENDS.get(stage, {}):
+        importlib.import_module(LAZY_BACKENDS[stage][name])
+    try:
+        return BACKENDS[stage][name]
+    except KeyError:
+        available = ', '.join(backend_names(stage)) if stage in BACKENDS else '无'
+        raise KeyError(f"阶段 {stage} 没有名为 {name} 的后端（可选：{available}）")
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+RSS/Atom 流式解析器
+按块喂给 XMLPullParser，每个 <item>/<entry> 结束时立即产出文章；
+取够篇数或遇到过期文章后停止，调用方随即停止读取网络数据
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator
+
+from daily_tech_digest.dates import DateParser, parse_epoch
+
+CHUNK_SIZE = 16 * 1024
+# 连续遇到这么多篇过期文章才停止，避免个别乱序条目导致提前结束
+STALE_RUN_LIMIT = 3
+
+_ITEM_TAGS = ('item', 'entry')
+_DATE_TAGS = ('pubDate', 'published', 'updated', 'date')
+_SUMMARY_TAGS = ('description', 'summary', 'content')
+
+
+def _local(tag: str) -> str:
+    """去掉命名空间：{http://www.w3.org/2005/Atom}entry -> entry"""
+    return tag.rsplit('}', 1)[-1] if tag.startswith('{') else tag
+
+
+def _text(elem) -> str:
+    # itertext 包含子元素中的文字，description 内嵌 HTML 时也能取到完整内容
+    return ''.join(elem.itertext()).strip()
+
+
+def _build_article(item, summary_len: int) -> Dict:
+    article = {'title': '', 'link': '', 'published': '', 'summary': ''}
+    for child in item:
+        name = _local(child.tag)
+        if name == 'title':
+            article['title'] = _text(child)
+        elif name == 'link':
+            # Atom 的链接在 href 属性里，优先取 rel="alternate"
+            href = child.get('href')
+            if href:
+                if not article['link'] or child.get('rel', 'alternate') == 'alternate':
+                    article['link'] = href.strip()
+            elif child.text:
+                article['link'] = child.text.strip()
+        elif name in _DATE_TAGS and not article['published']:
+            article['published'] = (child.text or '').strip()
+        elif name in _SUMMARY_TAGS and not article['summary']:
+            article['summary'] = _text(child)[:summary_len]
+    return article
+
+
+def iter_feed_items(chunks: Iterable[bytes], limit: int = None, cutoff: int = None,
+                    summary_len: int = 200, date_parser: DateParser = None,
+                    stop_on_stale: bool = True, source: str = None) -> Iterator[Dict]:
+    """
+    从字节块流中逐篇解析文章，pub_ts 为发布时间的 UTC 时间戳
+
+    limit 为最多产出的篇数；cutoff（时间戳）之前发布的文章会被跳过，
+    连续 STALE_RUN_LIMIT 篇过期后认为后面都是旧文章，停止解析；
+    条目不按时间排列的 feed 传 stop_on_stale=False，只跳过不停止；
+    source 为源的键，日期解析器据此优先尝试该源上次成功的格式
+    """
+    parse_date = date_parser.parse if date_parser is not None else parse_epoch
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack = []
+    produced = 0
+    stale_run = 0
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if _local(elem.tag) not in _ITEM_TAGS:
+                continue
+
+            article = _build_article(elem, summary_len)
+            # 处理完立即从父节点移除，内存占用不随 feed 大小增长
+            if stack:
+                stack[-1].remove(elem)
+
+            if not article['title'] or not article['link']:
+                continue
+
+            article['pub_ts'] = pub_ts = parse_date(article['published'], source)
+            if cutoff is not None:
+                if pub_ts is not None and pub_ts < cutoff:
+                    stale_run += 1
+                    if stop_on_stale and stale_run >= STALE_RUN_LIMIT:
+                        return
+                    continue
+                stale_run = 0
+
+            yield article
+            produced += 1
+            if limit is not None and produced >= limit:
+                return
+
+    parser.close()
+
+
+def iter_response_chunks(response, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """把带 read(n) 的响应对象转换为字节块迭代器"""
+    while True:
+        chunk = response.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+多关键词主题匹配
+所有关键词编译成一个正则，一遍扫描标题即可得到命中的全部主题；
+按英文单词边界匹配，"go" 不再命中 "Google"，"ai" 不再命中 "email"
+"""
+
+import re
+from typing import Dict, Iterable, List, Set
+
+# 只把 ASCII 字母数字视为单词字符，"Python与AI" 这类中英混排标题也能正确切分
+_BOUNDARY_BEFORE = r'(?<![A-Za-z0-9])'
+_BOUNDARY_AFTER = r'(?![A-Za-z0-9])'
+
+
+class TopicMatcher:
+    def __init__(self, keywords: Iterable[str]):
+        # 去重并按长度降序，保证较长的关键词优先匹配
+        self.keywords: List[str] = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+        if self.keywords:
+            alternation = '|'.join(re.escape(k) for k in self.keywords)
+            self._pattern = re.compile(f'{_BOUNDARY_BEFORE}(?:{alternation}){_BOUNDARY_AFTER}', re.IGNORECASE)
+        else:
+            self._pattern = None
+
+    def matches(self, text: str) -> Set[str]:
+        """文本中出现的关键词（小写，去重）"""
+        if self._pattern is None or not text:
+            return set()
+        return {m.lower() for m in self._pattern.findall(text)}
+
+    def count(self, text: str) -> int:
+        """文本命中的不同关键词个数"""
+        return len(self.matches(text))
+
+    def count_all(self, texts: Iterable[str]) -> Dict[str, int]:
+        """统计每个关键词在多少条文本中出现"""
+        counts: Dict[str, int] = {}
+        for text in texts:
+            for keyword in self.matches(text):
+                counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
@@ -5,7 +5,7 @@
 set -e
 
 SCRIPT_DIR="/home/lichangjiang/.openclaw/workspace"
-PYTHON_SCRIPT="${SCRIPT_DIR}/daily_tech_digest_final.py"
+VARIANT="final"
 
 echo "📊 每日技术摘要推送系统（BestBlogs 源）"
 echo "━━━━━━━━━━━━━━━━"
@@ -13,7 +13,7 @@ echo ""
 
 # 生成摘要（超时 45 秒）
 cd "${SCRIPT_DIR}"
-timeout 45 python3 "${PYTHON_SCRIPT}" 2>&1 || {
+timeout 45 python3 -m daily_tech_digest --variant "${VARIANT}" 2>&1 || {
     echo ""
     echo "⚠️ 获取 BestBlogs 源超时或失败"
     echo "📝 如果持续失败，请手动检查："
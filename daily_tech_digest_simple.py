@@ -3,109 +3,14 @@
 """
 每日技术摘要生成脚本（简化版本）
 用于快速测试和验证
+（已合并到 daily_tech_digest 包，本脚本只保留为兼容入口，
+ 等价于 python3 -m daily_tech_digest --variant simple）
 """
 
-import json
-import datetime
+import sys
 
-def generate_test_digest():
-    """生成测试摘要"""
-    now = datetime.datetime.now(datetime.timezone.utc)
-    beijing_time = now + datetime.timedelta(hours=8)
-    date_str = beijing_time.strftime("%Y年%m月%d日")
-    
-    digest = f"""📅 {date_str} 每日技术摘要
-
-━━━━━━━━━━━━━━━━
-
-🔥 今日精选（10 篇）
-
-### 💻 编程技术（3 篇）
-
-1. **Rust 2025 年度路线图发布**
-   * AI 评分：8.5/10
-   * 推荐理由：Rust 语言在系统编程领域的快速演进，包含新的异步运行时改进和内存安全特性
-   * 链接：https://blog.rust-lang.org/
-
-2. **Kubernetes 1.31 新特性深度解析**
-   * AI 评分：8.2/10
-   * 推荐理由：云原生技术的最新进展，包含 Sidecar 容器稳定化和 Pod 安全策略更新
-   * 链接：https://kubernetes.io/blog/
-
-3. **React 19 服务器组件实战指南**
-   * AI 评分：8.0/10
-   * 推荐理由：前端框架的重大更新，引入流式渲染和服务器优先架构
-   * 链接：https://react.dev/blog/
-
-### 🤖 AI 前沿（5 篇）
-
-1. **GPT-5 预览：多模态推理能力突破**
-   * AI 评分：9.2/10
-   * 推荐理由：大语言模型的最新进展，支持文本、图像、代码的联合推理
-   * 链接：https://openai.com/blog/
-
-2. **AI 智能体编排系统设计模式**
-   * AI 评分：8.8/10
-   * 推荐理由：多智能体协作的最佳实践，包含工作流编排和任务分配策略
-   * 链接：https://arxiv.org/abs/
-
-3. **开源 LLM 推理优化技术对比**
-   * AI 评分：8.5/10
-   * 推荐理由：vLLM、TensorRT-LLM、AutoGPTQ 等推理引擎的性能评测
-   * 链接：https://huggingface.co/blog/
-
-4. **RAG 系统检索增强实践指南**
-   * AI 评分：8.3/10
-   * 推荐理由：企业级 AI 应用的核心技术，包含向量数据库优化和知识图谱集成
-   * 链接：https://python.langchain.com/
-
-5. **AI 代码生成工具安全性研究**
-   * AI 评分：8.0/10
-   * 推荐理由：Copilot、Cursor 等 AI 编程助手的漏洞分析和安全最佳实践
-   * 链接：https://owasp.org/
-
-### 🎨 产品设计（2 篇）
-
-1. **2025 年产品管理趋势分析**
-   * AI 评分：8.1/10
-   * 推荐理由：AI 驱动的产品决策、用户行为分析和数据驱动增长策略
-   * 链接：https://product.hubspot.com/
-
-2. **UX 设计中的 AI 辅助实践**
-   * AI 评分：7.8/10
-   * 推荐理由：利用 AI 工具提升设计效率，包含原型生成、用户研究自动化
-   * 链接：https://uxdesign.cc/
-
-━━━━━━━━━━━━━━━━
-
-💡 个性化提示
-
-**热门主题：** 暂无数据（需要多点击积累数据）
-**推荐比例：** 编程 3 篇 | AI 5 篇 | 产品 2 篇
-
-━━━━━━━━━━━━━━━━
-
-📚 学习资源（可选）
-
-今日推荐：
-- **多智能体系统设计**：结合 A2A 协议和 MCP 的分层架构实践
-- **Linux 内核 2025 创新**：内存管理、调度优化、零拷贝等核心技术突破
-- **开源模型对比**：Qwen3.5-397B-A17B vs GLM-5 架构与性能分析
-
-━━━━━━━━━━━━━━━━
-
-🔄 反馈
-
-你对今天的推荐满意吗？
-- 回复 "编程更多" / "AI 更多" / "产品更多" 来调整明日比例
-- 回复 "偏好分析" 查看你的阅读习惯分析报告
-- 点击任意文章会自动记录你的偏好
-
-━━━━━━━━━━━━━━━━
-来源：BestBlogs.dev + 其他精选源 | 管理订阅：https://www.bestblogs.dev/#subscribe"""
-    
-    return digest
+from daily_tech_digest.cli import main
+from daily_tech_digest.demo import generate_test_digest  # noqa: F401  兼容旧的导入方式
 
 if __name__ == "__main__":
-    digest = generate_test_digest()
-    print(digest)
+    sys.exit(main(['--variant', 'simple'] + sys.argv[1:]))
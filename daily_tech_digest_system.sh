@@ -14,7 +14,8 @@ set -e
 
 # 配置
 SCRIPT_DIR="/home/lichangjiang/.openclaw/workspace"
-PYTHON_SCRIPT="${SCRIPT_DIR}/daily_tech_digest_simple.py"
+# 运行方案（见 python3 -m daily_tech_digest --list），目前使用预设文章
+VARIANT="simple"
 LOG_FILE="/tmp/daily_tech_digest.log"
 
 # 测试模式检查
@@ -27,7 +28,7 @@ fi
 echo "📊 生成技术摘要..."
 cd "${SCRIPT_DIR}"
 
-python3 "${PYTHON_SCRIPT}" 2>&1
+python3 -m daily_tech_digest --variant "${VARIANT}" "$@" 2>&1
 
 # 如果是测试模式，添加说明
 if [ "$1" = "--test" ]; then
@@ -5,6 +5,7 @@
 """
 
 import argparse
+import itertools
 import sys
 import json
 from datetime import datetime, timedelta
@@ -28,11 +29,15 @@ def main():
     query_parser.add_argument('--end-date', help='结束日期 (YYYY-MM-DD)，默认为今天')
     query_parser.add_argument('--category', help='按类别过滤')
     query_parser.add_argument('--limit', type=int, default=50, help='限制返回数量')
+    query_parser.add_argument('--archived', action='store_true', help='同时查询已归档的点击记录')
 
     # 偏好分析命令
     analyze_parser = subparsers.add_parser('analyze', help='分析用户偏好')
     analyze_parser.add_argument('--detailed', action='store_true', help='显示详细分析')
 
+    # 合并点击日志命令
+    subparsers.add_parser('compact', help='把点击日志合并进偏好快照')
+
     args = parser.parse_args()
 
     if not args.command:
@@ -47,15 +52,15 @@ def main():
             if args.dry_run:
                 # 显示将要归档的数据
                 cutoff_date = datetime.now() - timedelta(days=args.days)
-                clicks_to_archive = [
-                    click for click in tracker.data["clickHistory"]
-                    if datetime.fromisoformat(click["timestamp"]) < cutoff_date
-                ]
-                print(f"将归档 {len(clicks_to_archive)} 条记录（{args.days} 天前）")
-                for click in clicks_to_archive[:10]:
+                archive_count = tracker.index.count_before(cutoff_date)
+                print(f"将归档 {archive_count} 条记录（{args.days} 天前）")
+                for click in itertools.islice(tracker.iter_clicks_by_date_range(), min(archive_count, 10)):
                     print(f"  - {click['timestamp']}: {click['articleTitle'][:50]}")
-                if len(clicks_to_archive) > 10:
-                    print(f"  ... 还有 {len(clicks_to_archive) - 10} 条")
+                if archive_count > 10:
+                    print(f"  ... 还有 {archive_count - 10} 条")
+                archives = tracker.archive.entries()
+                print(f"归档目录：{tracker.archive.directory}（已有 {len(archives)} 个归档文件，"
+                      f"共 {sum(e['count'] for e in archives)} 条）")
             else:
                 # 执行归档
                 result = tracker.archive_old_clicks(args.days)
@@ -75,12 +80,11 @@ def main():
             start_date = args.start_date
             end_date = args.end_date or datetime.now().strftime("%Y-%m-%d")
 
-            clicks = tracker.get_clicks_by_date_range(start_date, end_date)
-
+            # 按时间顺序逐条过滤，凑够 --limit 条就停止
+            clicks = tracker.iter_clicks_by_date_range(start_date, end_date, include_archived=args.archived)
             if args.category:
-                clicks = [c for c in clicks if c['category'] == args.category]
-
-            clicks = clicks[:args.limit]
+                clicks = (c for c in clicks if c['category'] == args.category)
+            clicks = list(itertools.islice(clicks, args.limit))
 
             print(f"=== 查询结果：{start_date} 至 {end_date} ===")
             print(f"找到 {len(clicks)} 条记录\n")
@@ -121,6 +125,12 @@ def main():
                 insights = tracker.get_personalization_insights()
                 print(insights)
 
+        elif args.command == 'compact':
+            # 合并点击日志
+            journal_size = tracker.store.journal.size()
+            tracker.data = tracker.store.compact()
+            print(f"✅ 已合并点击日志（{journal_size/1024:.1f} KB），共 {len(tracker.data['clickHistory'])} 条点击记录")
+
     except Exception as e:
         print(f"错误：{e}")
         sys.exit(1)
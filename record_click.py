@@ -3,9 +3,11 @@
 记录用户点击的简单接口
 """
 import sys
-import json
 
-PREFERENCES_FILE = "/home/lichangjiang/.openclaw/workspace/user_preferences.json"
+from daily_tech_digest.click_journal import PreferenceStore, make_click
+from daily_tech_digest.config import USER_PREFERENCES_FILE
+
+PREFERENCES_FILE = USER_PREFERENCES_FILE
 
 def record_click(category: str, article_title: str, article_url: str, ai_score: float = 0, topics: list = None, source: str = "bestblogs"):
     """
@@ -17,47 +19,14 @@ def record_click(category: str, article_title: str, article_url: str, ai_score:
         python3 record_click.py product "产品设计中的微交互" "https://example.com" 8.5 product-design ux
     """
     try:
-        # 读取现有数据
-        with open(PREFERENCES_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # 创建点击记录
-        click_record = {
-            "timestamp": "2026-02-16T00:00:00Z",
-            "articleTitle": article_title,
-            "articleUrl": article_url,
-            "category": category,
-            "topics": topics or [],
-            "source": source,
-            "aiScore": ai_score
-        }
-
-        # 添加到点击历史
-        data["clickHistory"].append(click_record)
-
-        # 更新类别偏好
-        if category in data["preferences"]["categories"]:
-            cat_pref = data["preferences"]["categories"][category]
-            cat_pref["clicks"] += 1
-
-        # 更新主题偏好
-        if topics:
-            for topic in topics:
-                if topic in data["preferences"]["topics"]:
-                    data["preferences"]["topics"][topic] += 1
-
-        # 更新来源偏好
-        if source in data["preferences"]["sources"]:
-            data["preferences"]["sources"][source] += 1
-
-        # 只保留最近 100 条点击记录
-        if len(data["clickHistory"]) > 100:
-            data["clickHistory"] = data["clickHistory"][-100:]
-
-        # 保存
-        data["profile"]["lastUpdated"] = "2026-02-16T00:00:00Z"
-        with open(PREFERENCES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 只向点击日志追加一行，类别/主题/来源计数在读取或合并快照时计入
+        store = PreferenceStore(PREFERENCES_FILE, fsync_every=1)
+        try:
+            store.record(make_click(article_title, article_url, category, topics, source, ai_score))
+            if store.needs_compaction():
+                store.compact(only_if_needed=True)
+        finally:
+            store.close()
 
         print(f"✅ 已记录点击：{article_title}")
         print(f"   类别：{category}")
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""点击归档：写入读回、中断后的 manifest、跨归档和内存索引的时间查询"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import user_preference_tracker
+from daily_tech_digest.click_archive import ClickArchive
+from daily_tech_digest.click_journal import PreferenceStore, make_click
+from user_preference_tracker import UserPreferenceTracker
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def _click(title: str, days_ago: float) -> dict:
+    timestamp = (NOW - timedelta(days=days_ago)).isoformat()
+    return make_click(title, f"https://example.com/{title}", "ai", ["python"], timestamp=timestamp)
+
+
+def _titles(clicks) -> list:
+    return [click["articleTitle"] for click in clicks]
+
+
+class ArchiveTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'user_preferences.json')
+        self.store = PreferenceStore(self.path)
+        self.addCleanup(self.store.close)
+        self.archive = ClickArchive(self.path)
+        # old-2 晚于 old-3 写入但时间更早：点击历史不是按时间排序的
+        for title, days_ago in (("old-1", 500), ("old-3", 420), ("old-2", 450), ("new-1", 10), ("new-2", 1)):
+            self.store.record(_click(title, days_ago))
+
+    def assertManifestConsistent(self):
+        for entry in self.archive.entries():
+            clicks = list(self.archive.read(entry))
+            self.assertEqual(len(clicks), entry['count'])
+            times = sorted(click['timestamp'] for click in clicks)
+            self.assertEqual((times[0], times[-1]), (entry['start'], entry['end']))
+
+
+class RoundTripTest(ArchiveTestCase):
+    def test_archive_and_read_back(self):
+        data, entry = self.archive.archive(self.store, NOW - timedelta(days=365))
+        self.assertEqual(entry['count'], 3)
+        self.assertTrue(entry['file'].endswith('.jsonl.gz'))
+        self.assertEqual(_titles(self.archive.read(entry)), ["old-1", "old-2", "old-3"])
+        self.assertEqual(self.archive.entries(), [entry])
+        self.assertManifestConsistent()
+
+        self.assertEqual(_titles(data["clickHistory"]), ["new-1", "new-2"])
+        self.assertEqual(_titles(self.store.load()["clickHistory"]), ["new-1", "new-2"])
+        # 计数不随归档减少
+        self.assertEqual(self.store.load()["preferences"]["categories"]["ai"]["clicks"], 5)
+
+    def test_nothing_to_archive(self):
+        _, entry = self.archive.archive(self.store, NOW - timedelta(days=1000))
+        self.assertIsNone(entry)
+        self.assertEqual(self.archive.entries(), [])
+        self.assertEqual(len(self.store.load()["clickHistory"]), 5)
+
+    def test_second_archive_appends_to_manifest(self):
+        self.archive.archive(self.store, NOW - timedelta(days=460))
+        self.archive.archive(self.store, NOW - timedelta(days=365))
+        self.assertEqual([entry['count'] for entry in self.archive.entries()], [1, 2])
+        self.assertEqual(_titles(self.archive.iter_range()), ["old-1", "old-2", "old-3"])
+        self.assertManifestConsistent()
+
+
+class InterruptedArchiveTest(ArchiveTestCase):
+    def test_manifest_write_fails(self):
+        with mock.patch.object(ClickArchive, '_save_manifest', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.archive.archive(self.store, NOW - timedelta(days=365))
+
+        # manifest 和快照都没有更新：点击仍全部在偏好数据中，归档查询不会读到改名后遗留的文件
+        self.assertEqual(self.archive.entries(), [])
+        self.assertEqual(list(self.archive.iter_range()), [])
+        self.assertEqual(len(self.store.load()["clickHistory"]), 5)
+        self.assertFalse([name for name in os.listdir(self.archive.directory) if name.endswith('.tmp')])
+
+        _, entry = self.archive.archive(self.store, NOW - timedelta(days=365))
+        self.assertEqual(entry['count'], 3)
+        self.assertEqual(_titles(self.archive.iter_range()), ["old-1", "old-2", "old-3"])
+        self.assertManifestConsistent()
+
+    def test_write_fails(self):
+        with mock.patch('daily_tech_digest.click_archive.gzip.GzipFile.write', side_effect=OSError("io error")):
+            with self.assertRaises(OSError):
+                self.archive.archive(self.store, NOW - timedelta(days=365))
+        self.assertEqual(self.archive.entries(), [])
+        self.assertEqual(os.listdir(self.archive.directory), [])
+        self.assertEqual(len(self.store.load()["clickHistory"]), 5)
+
+    def test_snapshot_conflict_retries_without_leftovers(self):
+        # 第一次压缩写入后其他进程保存了快照，update() 重新读取后再归档
+        other = PreferenceStore(self.path)
+        self.addCleanup(other.close)
+        original = ClickArchive._write
+        calls = []
+
+        def write_then_conflict(archive, clicks):
+            result = original(archive, clicks)
+            if not calls:
+                other.record(_click("other", 400))
+                other.save(other.load())
+            calls.append(result)
+            return result
+
+        with mock.patch.object(ClickArchive, '_write', write_then_conflict):
+            data, entry = self.archive.archive(self.store, NOW - timedelta(days=365))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(entry['count'], 4)
+        self.assertEqual(sorted(os.listdir(self.archive.directory)), sorted([entry['file'], 'manifest.json']))
+        self.assertEqual(_titles(data["clickHistory"]), ["new-1", "new-2"])
+        self.assertManifestConsistent()
+
+
+class RangeQueryTest(ArchiveTestCase):
+    def setUp(self):
+        super().setUp()
+        self.store.close()
+        patcher = mock.patch.object(user_preference_tracker, 'PREFERENCES_FILE', self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracker = UserPreferenceTracker()
+        self.addCleanup(self.tracker.store.close)
+        self.tracker.archive_old_clicks(days=460)
+        self.tracker.archive_old_clicks(days=365)
+
+    def _range(self, start_days, end_days, include_archived=True):
+        start = None if start_days is None else (NOW - timedelta(days=start_days)).isoformat()
+        end = None if end_days is None else (NOW - timedelta(days=end_days)).isoformat()
+        return _titles(self.tracker.get_clicks_by_date_range(start, end, include_archived))
+
+    def test_range_spanning_archive_and_index(self):
+        self.assertEqual(self._range(430, 5), ["old-3", "new-1"])
+        self.assertEqual(self._range(None, None), ["old-1", "old-2", "old-3", "new-1", "new-2"])
+        self.assertEqual(self._range(430, 5, include_archived=False), ["new-1"])
+
+    def test_range_inside_archive(self):
+        self.assertEqual(self._range(600, 440), ["old-1", "old-2"])
+        self.assertEqual(self._range(440, 430), [])
+
+    def test_only_overlapping_archives_opened(self):
+        opened = []
+        original = ClickArchive.read
+
+        def read(archive, entry):
+            opened.append(entry['count'])
+            return original(archive, entry)
+
+        with mock.patch.object(ClickArchive, 'read', read):
+            self.assertEqual(self._range(430, 0), ["old-3", "new-1", "new-2"])
+        self.assertEqual(opened, [2])
+        self.assertEqual(self.tracker.get_stats()["totalClicks"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""点击日志：多进程追加、半行恢复、换 epoch 和合并"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from daily_tech_digest.click_journal import ConflictError, PreferenceStore, make_click, read_journal
+
+CLICKS_PER_WRITER = 50
+
+
+def _append_clicks(path: str, writer: str, with_data: bool):
+    store = PreferenceStore(path, fsync_every=8)
+    data = store.load() if with_data else None
+    for i in range(CLICKS_PER_WRITER):
+        store.record(make_click(f"{writer}-{i}", f"https://example.com/{writer}/{i}", "ai", ["python"]), data)
+    store.close()
+
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'user_preferences.json')
+
+    def store(self, **kwargs) -> PreferenceStore:
+        store = PreferenceStore(self.path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def titles(self, data=None):
+        data = data if data is not None else self.store().load()
+        return [click["articleTitle"] for click in data["clickHistory"]]
+
+
+class ConcurrentAppendTest(JournalTestCase):
+    def _run_writers(self, with_data: bool):
+        context = multiprocessing.get_context('fork')
+        writers = [context.Process(target=_append_clicks, args=(self.path, name, with_data)) for name in 'ab']
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+            self.assertEqual(writer.exitcode, 0)
+
+    def assertAllClicksOnce(self, data):
+        titles = self.titles(data)
+        expected = {f"{name}-{i}" for name in 'ab' for i in range(CLICKS_PER_WRITER)}
+        self.assertEqual(len(titles), len(expected))
+        self.assertEqual(set(titles), expected)
+        # 每个进程自己的点击保持写入顺序
+        for name in 'ab':
+            own = [title for title in titles if title.startswith(name)]
+            self.assertEqual(own, [f"{name}-{i}" for i in range(CLICKS_PER_WRITER)])
+        self.assertEqual(data["preferences"]["categories"]["ai"]["clicks"], len(expected))
+        self.assertEqual(data["preferences"]["topics"]["python"], len(expected))
+
+    def test_two_stores_append(self):
+        self._run_writers(with_data=False)
+        self.assertAllClicksOnce(self.store().load())
+
+    def test_two_stores_record_with_data(self):
+        self._run_writers(with_data=True)
+        self.assertAllClicksOnce(self.store().load())
+
+    def test_record_merges_foreign_lines_in_order(self):
+        mine, other = self.store(), self.store()
+        data = mine.load()
+        mine.record(make_click("mine-1", "u1", "ai"), data)
+        other.record(make_click("other", "u2", "product"))
+        foreign = mine.record(make_click("mine-2", "u3", "ai"), data)
+        self.assertEqual([click["articleTitle"] for click in foreign], ["other"])
+        self.assertEqual(self.titles(data), ["mine-1", "other", "mine-2"])
+        self.assertEqual(self.titles(mine.save(data)), ["mine-1", "other", "mine-2"])
+        self.assertEqual(self.titles(), ["mine-1", "other", "mine-2"])
+
+
+class TornLineTest(JournalTestCase):
+    def _tear(self, store: PreferenceStore):
+        with open(store.journal.path, 'ab') as f:
+            f.write(b'{"timestamp": "2026-10-18T08:00:00", "articleTi')
+
+    def test_replay_ignores_torn_last_line(self):
+        store = self.store()
+        store.record(make_click("first", "u1", "ai"))
+        store.close()
+        self._tear(store)
+        _, clicks, position = read_journal(store.journal.path)
+        self.assertEqual([click["articleTitle"] for click in clicks], ["first"])
+        self.assertLess(position, os.path.getsize(store.journal.path))
+        self.assertEqual(self.titles(), ["first"])
+
+    def test_append_after_torn_line(self):
+        store = self.store()
+        store.record(make_click("first", "u1", "ai"))
+        store.close()
+        self._tear(store)
+        writer = self.store()
+        data = writer.load()
+        writer.record(make_click("second", "u2", "ai"), data)
+        writer.record(make_click("third", "u3", "ai"))
+        self.assertEqual(self.titles(data), ["first", "second"])
+        self.assertEqual(self.titles(), ["first", "second", "third"])
+        self.assertEqual(self.titles(writer.save(data)), ["first", "second", "third"])
+
+
+class EpochTest(JournalTestCase):
+    def test_save_rotates_epoch_and_rejects_stale_data(self):
+        first, second = self.store(), self.store()
+        first.record(make_click("a", "u1", "ai"))
+        stale = second.load()
+        data = first.load()
+        old_epoch = data["journal"]["epoch"]
+        first.save(data)
+        self.assertNotEqual(data["journal"]["epoch"], old_epoch)
+        self.assertEqual(read_journal(first.journal.path)[0], data["journal"]["epoch"])
+        with self.assertRaises(ConflictError):
+            second.save(stale)
+        # 过期的数据记录点击时只计入内存，日志中的点击不受影响
+        second.record(make_click("b", "u2", "ai"), stale)
+        self.assertEqual(self.titles(), ["a", "b"])
+
+    def test_replay_after_rotation_skips_merged_clicks(self):
+        store = self.store()
+        for i in range(3):
+            store.record(make_click(f"c{i}", f"u{i}", "ai"))
+        store.save(store.load())
+        store.record(make_click("after", "u9", "ai"))
+        data = self.store().load()
+        self.assertEqual(self.titles(data), ["c0", "c1", "c2", "after"])
+        self.assertEqual(data["preferences"]["categories"]["ai"]["clicks"], 4)
+
+    def test_compaction(self):
+        store = self.store()
+        for i in range(5):
+            store.record(make_click(f"c{i}", f"u{i}", "ai", ["rust"]))
+        self.assertIsNone(store.compact(only_if_needed=True))
+        before = store.load()
+
+        merged = store.compact()
+        self.assertEqual(self.titles(merged), self.titles(before))
+        self.assertEqual(read_journal(store.journal.path)[1], [])
+        self.assertNotEqual(merged["journal"]["epoch"], before["journal"]["epoch"])
+
+        after = self.store().load()
+        self.assertEqual(self.titles(after), self.titles(before))
+        self.assertEqual(after["preferences"]["topics"]["rust"], 5)
+
+    def test_compaction_when_journal_too_large(self):
+        store = self.store()
+        with mock.patch('daily_tech_digest.click_journal.COMPACT_BYTES', 1024):
+            while not store.needs_compaction():
+                store.record(make_click("x" * 100, "u", "ai"))
+            count = len(self.titles())
+            self.assertIsNotNone(store.compact(only_if_needed=True))
+            self.assertFalse(store.needs_compaction())
+            self.assertIsNone(store.compact(only_if_needed=True))
+        self.assertEqual(len(self.titles()), count)
+
+
+if __name__ == '__main__':
+    unittest.main()
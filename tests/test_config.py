@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""每次取得的方案配置互不共享嵌套的可变对象"""
+
+import unittest
+
+from daily_tech_digest.config import DEFAULT_VARIANT, VARIANTS, get_variant
+
+
+class GetVariantTest(unittest.TestCase):
+    def test_nested_settings_not_shared(self):
+        first = get_variant('system')
+        first['delivery']['channels'].append('webhook')
+        first['delivery']['retries'] = 0
+        first['enrichment']['deadline'] = 0
+        first['backends']['fetch'] = 'none'
+        first['sources'].clear()
+
+        second = get_variant('system')
+        self.assertEqual(second['delivery'], DEFAULT_VARIANT['delivery'])
+        self.assertEqual(second['enrichment'], DEFAULT_VARIANT['enrichment'])
+        self.assertEqual(second['backends']['fetch'], VARIANTS['system'].get('backends', {}).get(
+            'fetch', DEFAULT_VARIANT['backends']['fetch']))
+        self.assertEqual(second['sources'], VARIANTS['system']['sources'])
+        self.assertIsNot(second['delivery'], first['delivery'])
+
+    def test_variant_overrides_applied(self):
+        config = get_variant('simple')
+        self.assertEqual(config['backends']['render'], 'demo')
+        self.assertEqual(config['backends']['parse'], DEFAULT_VARIANT['backends']['parse'])
+        self.assertEqual(config['name'], 'simple')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""推送后只记录摘要中显示的文章"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from daily_tech_digest.config import get_variant
+from daily_tech_digest.dedupe import SentIndex, title_fingerprint, url_hash
+from daily_tech_digest.pipeline import DigestPipeline, DigestRun
+
+TITLES = ["Rust async runtime internals explained", "Postgres query planner deep dive",
+          "Kubernetes operators in production", "WebAssembly component model tour",
+          "Python typing overloads cookbook", "Designing resilient webhook consumers",
+          "Inside the Linux page cache"]
+
+
+class RecordSentTest(unittest.TestCase):
+    def test_only_displayed_articles_recorded(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'sent.idx')
+
+        config = get_variant('system')
+        run = DigestRun(config)
+        articles = [{'title': title, 'link': f"https://example.com/{i}"} for i, title in enumerate(TITLES)]
+        run.selected = {'programming': articles}
+        run.sent_index = SentIndex(path)
+        DigestPipeline(config)._record_sent(run)
+
+        sent = SentIndex(path)
+        limit = config['per_category_limit']
+        shown = [sent.contains(url_hash(a['link']), title_fingerprint(a['title'])) for a in articles]
+        self.assertEqual(shown, [True] * limit + [False] * (len(articles) - limit))
+
+
+if __name__ == '__main__':
+    unittest.main()
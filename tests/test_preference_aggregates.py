@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""增量维护的主题排名与重新计算的一致"""
+
+import unittest
+
+from daily_tech_digest.click_journal import apply_click, default_preferences, make_click
+from daily_tech_digest.preference_aggregates import PreferenceAggregates
+
+
+def _click(topics, category="programming", source="bestblogs"):
+    return make_click("t", "https://example.com", category, topics, source)
+
+
+class TopicRankingTest(unittest.TestCase):
+    def assertMatchesRebuild(self, aggregates: PreferenceAggregates, data):
+        fresh = PreferenceAggregates(data["preferences"])
+        self.assertEqual(aggregates.top_topics(20), fresh.top_topics(20))
+        self.assertEqual(aggregates.analysis(), fresh.analysis())
+        self.assertEqual(aggregates.active_topics, fresh.active_topics)
+
+    def test_incremental_matches_rebuild(self):
+        data = default_preferences()
+        aggregates = PreferenceAggregates(data["preferences"])
+        for topics in (["python"], ["react", "python"], ["rust", "rust"], ["go"], ["react"], []):
+            click = _click(topics)
+            apply_click(data, click)
+            aggregates.add(click)
+        self.assertEqual(aggregates.top_topics(3), [("react", 2), ("python", 2), ("rust", 2)])
+        self.assertMatchesRebuild(aggregates, data)
+
+    def test_counts_applied_before_add(self):
+        # 两次点击都先计入计数再调用 add()，旧计数无法由 "当前计数 - 本次次数" 推算
+        data = default_preferences()
+        aggregates = PreferenceAggregates(data["preferences"])
+        clicks = [_click(["python"]), _click(["python", "react"])]
+        for click in clicks:
+            apply_click(data, click)
+        for click in clicks:
+            aggregates.add(click)
+        ranking = aggregates.top_topics(20)
+        self.assertEqual(len(ranking), len({topic for topic, _ in ranking}))
+        self.assertEqual(ranking[:2], [("python", 2), ("react", 1)])
+        self.assertMatchesRebuild(aggregates, data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""多个进程共用同一个偏好目录时，增量维护的聚合结果与重新加载的一致"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import user_preference_tracker
+from user_preference_tracker import UserPreferenceTracker
+
+
+def _record_in_other_process(clicks):
+    tracker = UserPreferenceTracker()
+    for article, category, topics, source in clicks:
+        tracker.record_click(article, category, topics, source)
+    tracker.store.close()
+
+
+class TwoProcessRecordTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = mock.patch.object(user_preference_tracker, 'PREFERENCES_FILE',
+                                    os.path.join(self.directory, 'user_preferences.json'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _tracker(self) -> UserPreferenceTracker:
+        tracker = UserPreferenceTracker()
+        self.addCleanup(tracker.store.close)
+        return tracker
+
+    def _run_other(self, clicks):
+        process = multiprocessing.get_context('fork').Process(target=_record_in_other_process, args=(clicks,))
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+
+    def assertMatchesFreshLoad(self, tracker: UserPreferenceTracker):
+        fresh = self._tracker()
+        self.assertEqual(tracker.analyze_preferences(), fresh.analyze_preferences())
+        self.assertEqual(tracker.get_stats(), fresh.get_stats())
+        self.assertEqual(tracker.generate_personalized_ratio(), fresh.generate_personalized_ratio())
+
+    def test_record_after_other_process(self):
+        mine = self._tracker()
+        mine.record_click({"title": "First", "url": "https://example.com/1"}, "programming", ["react"], "bestblogs")
+        self._run_other([
+            ({"title": "Other 1", "url": "https://example.com/2"}, "ai", ["python"], "hackernews"),
+            ({"title": "Other 2", "url": "https://example.com/3"}, "ai", ["python"], "hackernews"),
+        ])
+        mine.record_click({"title": "Mine", "url": "https://example.com/4"}, "programming", ["python"], "bestblogs")
+
+        self.assertEqual([c["articleTitle"] for c in mine.data["clickHistory"]],
+                         ["First", "Other 1", "Other 2", "Mine"])
+        self.assertEqual(mine.analyze_preferences()["topTopics"][:2], [("python", 3), ("react", 1)])
+        self.assertAlmostEqual(sum(mine.analyze_preferences()["categoryWeights"].values()), 1.0)
+        self.assertMatchesFreshLoad(mine)
+
+    def test_other_process_creates_journal(self):
+        mine = self._tracker()
+        self._run_other([({"title": "Other", "url": "https://example.com/1"}, "ai", ["rust"], "openai")])
+        mine.record_click({"title": "Mine", "url": "https://example.com/2"}, "product", ["go"], "reddit")
+
+        self.assertEqual(mine.get_stats()["totalClicks"], 2)
+        self.assertMatchesFreshLoad(mine)
+
+    def test_save_after_other_process(self):
+        mine = self._tracker()
+        mine.record_click({"title": "Mine", "url": "https://example.com/1"}, "ai", ["python"], "openai")
+        self._run_other([({"title": "Other", "url": "https://example.com/2"}, "ai", ["react"], "reddit")])
+        mine.save_preferences()
+
+        self.assertEqual(mine.get_stats()["totalClicks"], 2)
+        self.assertMatchesFreshLoad(mine)
+
+
+if __name__ == '__main__':
+    unittest.main()
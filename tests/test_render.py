@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""模板字段在编译时检查"""
+
+import unittest
+
+from daily_tech_digest.render import ARTICLE_FIELDS, Template, _compile
+
+
+class TemplateFieldsTest(unittest.TestCase):
+    def test_unknown_placeholder_rejected(self):
+        with self.assertRaises(ValueError) as ctx:
+            Template("{index}. {titel}", ARTICLE_FIELDS)
+        self.assertIn('titel', str(ctx.exception))
+
+    def test_compile_checks_fields_per_template(self):
+        with self.assertRaises(ValueError):
+            _compile({'header': "{date} {count}"})
+        templates = _compile({'header': "{date}（{total} 篇）", 'divider': "---\\n"})
+        self.assertEqual(templates['header'].fields, {'date', 'total'})
+        self.assertEqual(templates['header'].render({'date': '10月18日', 'total': 3}), "10月18日（3 篇）")
+
+    def test_fields_not_checked_without_known(self):
+        self.assertEqual(Template("{anything}").fields, {'anything'})
+
+
+if __name__ == '__main__':
+    unittest.main()
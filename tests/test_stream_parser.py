@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""流式解析按源记住日期格式"""
+
+import unittest
+from unittest import mock
+
+from daily_tech_digest import dates
+from daily_tech_digest.config import get_variant
+from daily_tech_digest.dates import DateParser
+from daily_tech_digest.pipeline import DigestRun, parse_stdlib
+from daily_tech_digest.stream_parser import iter_feed_items
+
+REMEMBERED = '%Y-%m-%d %H:%M:%S'
+
+
+def _feed(*published: str) -> bytes:
+    items = ''.join(f'<item><title>t{i}</title><link>https://example.com/{i}</link>'
+                    f'<pubDate>{value}</pubDate></item>' for i, value in enumerate(published))
+    return f'<?xml version="1.0"?><rss><channel>{items}</channel></rss>'.encode('utf-8')
+
+
+class RememberedFormatTest(unittest.TestCase):
+    def setUp(self):
+        # 记录每次尝试的格式；按 _guess_order 这个值会先用 iso 解析
+        self.tried = []
+        wrapped = {name: self._spy(name, parser) for name, parser in dates._PARSERS.items()}
+        patcher = mock.patch.dict(dates._PARSERS, wrapped)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _spy(self, name, parser):
+        def parse(value):
+            self.tried.append(name)
+            return parser(value)
+        return parse
+
+    def test_iter_feed_items_passes_source(self):
+        parser = DateParser()
+        parser._source_formats['src'] = REMEMBERED
+        items = list(iter_feed_items([_feed('2026-10-18 08:00:00')], date_parser=parser, source='src'))
+        self.assertEqual(self.tried, [REMEMBERED])
+        self.assertEqual(items[0]['pub_ts'], 1792310400)
+
+    def test_parse_backend_uses_remembered_format(self):
+        run = DigestRun(dict(get_variant('system'), max_items=None, max_age_days=None))
+        run.dates._source_formats['openai_blog'] = REMEMBERED
+        entries = parse_stdlib(iter([_feed('2026-10-18 08:00:00', '2026-10-17 08:00:00')]), run,
+                               source_key='openai_blog')
+        self.assertEqual(self.tried, [REMEMBERED, REMEMBERED])
+        self.assertEqual([e['pub_ts'] for e in entries], [1792310400, 1792224000])
+
+    def test_without_source_guesses_format(self):
+        parser = DateParser()
+        parser._source_formats['src'] = REMEMBERED
+        list(iter_feed_items([_feed('2026-10-18 08:00:00')], date_parser=parser))
+        self.assertEqual(self.tried, ['iso'])
+
+
+if __name__ == '__main__':
+    unittest.main()
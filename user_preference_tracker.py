@@ -4,132 +4,90 @@
 自动记录用户点击、分析偏好、生成个性化推荐策略
 """
 
-import json
+import atexit
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any
 
-PREFERENCES_FILE = "/home/lichangjiang/.openclaw/workspace/user_preferences.json"
+from daily_tech_digest.click_archive import ClickArchive
+from daily_tech_digest.click_index import ClickTimeIndex
+from daily_tech_digest.click_journal import PreferenceStore, default_preferences, make_click
+from daily_tech_digest.config import USER_PREFERENCES_FILE
+from daily_tech_digest.preference_aggregates import PreferenceAggregates
+
+PREFERENCES_FILE = USER_PREFERENCES_FILE
 
 class UserPreferenceTracker:
     def __init__(self):
+        # 快照 + 追加写的点击日志，记录点击不再重写整个文件
+        self.store = PreferenceStore(PREFERENCES_FILE)
+        self.archive = ClickArchive(PREFERENCES_FILE)
+        atexit.register(self.store.close)
         self.data = self._load_preferences()
 
+    @property
+    def data(self) -> dict:
+        return self._data
+
+    @data.setter
+    def data(self, data: dict):
+        # 整体替换数据（加载、合并日志、归档）时重建聚合结果和时间索引
+        self._data = data
+        self.aggregates = PreferenceAggregates(data["preferences"])
+        self.index = ClickTimeIndex(data["clickHistory"])
+
     def _load_preferences(self) -> dict:
-        """加载用户偏好数据"""
-        if os.path.exists(PREFERENCES_FILE):
-            with open(PREFERENCES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return self._create_default_preferences()
+        """加载用户偏好数据（快照加上点击日志中尚未合并的部分）"""
+        return self.store.load()
 
     def _create_default_preferences(self) -> dict:
         """创建默认偏好配置"""
-        return {
-            "profile": {
-                "createdAt": datetime.now().isoformat(),
-                "lastUpdated": datetime.now().isoformat()
-            },
-            "preferences": {
-                "categories": {
-                    "programming": {"weight": 0.5, "clicks": 0, "readCount": 0, "avgReadTime": 0},
-                    "ai": {"weight": 0.5, "clicks": 0, "readCount": 0, "avgReadTime": 0},
-                    "product": {"weight": 0.2, "clicks": 0, "readCount": 0, "avgReadTime": 0}
-                },
-                "topics": {
-                    "react": 0, "python": 0, "rust": 0, "go": 0,
-                    "ai-architecture": 0, "frontend": 0, "backend": 0,
-                    "product-design": 0, "devops": 0
-                },
-                "sources": {
-                    "bestblogs": 0, "hackernews": 0, "reddit": 0, "openai": 0
-                }
-            },
-            "clickHistory": [],
-            "readingSession": []
-        }
+        return default_preferences()
 
     def save_preferences(self):
-        """保存偏好数据"""
-        self.data["profile"]["lastUpdated"] = datetime.now().isoformat()
-        with open(PREFERENCES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        """保存完整偏好数据（同时把点击日志合并进快照）"""
+        # 其他进程追加的点击会合并进来，重建聚合结果和时间索引
+        self.data = self.store.save(self.data)
 
     def record_click(self, article: Dict[str, Any], category: str, topics: List[str] = None, source: str = None):
         """记录用户点击"""
-        click_record = {
-            "timestamp": datetime.now().isoformat(),
-            "articleTitle": article.get("title", ""),
-            "articleUrl": article.get("url", ""),
-            "category": category,
-            "topics": topics or [],
-            "source": source or "bestblogs",
-            "aiScore": article.get("aiScore", 0)
-        }
-
-        # 添加到点击历史
-        self.data["clickHistory"].append(click_record)
-
-        # 更新类别偏好
-        if category in self.data["preferences"]["categories"]:
-            cat_pref = self.data["preferences"]["categories"][category]
-            cat_pref["clicks"] += 1
-
-        # 更新主题偏好
-        if topics:
-            for topic in topics:
-                if topic in self.data["preferences"]["topics"]:
-                    self.data["preferences"]["topics"][topic] += 1
-
-        # 更新来源偏好
-        if source and source in self.data["preferences"]["sources"]:
-            self.data["preferences"]["sources"][source] += 1
-
-        # 保存完整的点击历史（不限制数量）
-        # 如果需要归档旧数据，可以定期执行 archive_old_clicks() 方法
-        self.save_preferences()
+        click_record = make_click(
+            title=article.get("title", ""),
+            url=article.get("url", ""),
+            category=category,
+            topics=topics,
+            source=source,
+            ai_score=article.get("aiScore", 0)
+        )
+
+        # 只追加一行点击日志，同时更新内存中的点击历史和类别/主题/来源计数
+        # 日志超过一定大小时合并进快照；如果需要归档旧数据，可以定期执行 archive_old_clicks() 方法
+        foreign = self.store.record(click_record, self.data)
+        if foreign:
+            # 同时补进了其他进程追加的点击，计数已不是这次点击之前的值，重建聚合结果和时间索引
+            self.data = self.data
+        else:
+            self.aggregates.add(click_record)
+            self.index.add(click_record)
+        if self.store.needs_compaction():
+            # 其他进程已经合并过时返回 None，内存中的数据仍然完整
+            merged = self.store.compact(only_if_needed=True)
+            if merged is not None:
+                self.data = merged
 
         return click_record
 
     def analyze_preferences(self) -> Dict[str, Any]:
-        """分析用户偏好"""
-        prefs = self.data["preferences"]
-
-        # 1. 分析类别偏好
-        total_clicks = sum(cat["clicks"] for cat in prefs["categories"].values())
-        if total_clicks > 0:
-            for cat_name, cat_data in prefs["categories"].items():
-                cat_data["weight"] = cat_data["clicks"] / total_clicks
-        else:
-            # 默认权重
-            prefs["categories"]["programming"]["weight"] = 0.5
-            prefs["categories"]["ai"]["weight"] = 0.5
-            prefs["categories"]["product"]["weight"] = 0.2
-
-        # 2. 分析主题偏好（找出前 5 个）
-        topic_scores = [(topic, score) for topic, score in prefs["topics"].items()]
-        topic_scores.sort(key=lambda x: x[1], reverse=True)
-        top_topics = topic_scores[:5]
-
-        # 3. 分析来源偏好
-        total_source_clicks = sum(prefs["sources"].values())
-        if total_source_clicks > 0:
-            pass  # 已经有实际点击数据
-
-        return {
-            "totalClicks": total_clicks,
-            "categoryWeights": {k: v["weight"] for k, v in prefs["categories"].items()},
-            "topTopics": top_topics,
-            "sourcePreferences": prefs["sources"]
-        }
+        """分析用户偏好（类别权重、前 5 个主题、来源计数随点击增量维护，这里直接读取）"""
+        return self.aggregates.analysis()
 
     def generate_personalized_ratio(self) -> Dict[str, int]:
         """生成个性化推荐比例"""
-        analysis = self.analyze_preferences()
-
-        # 基于点击量计算比例
-        prog_weight = self.data["preferences"]["categories"]["programming"]["weight"]
-        ai_weight = self.data["preferences"]["categories"]["ai"]["weight"]
-        product_weight = self.data["preferences"]["categories"]["product"]["weight"]
+        # 基于点击量计算比例（权重由聚合结果随点击更新）
+        weights = self.aggregates.category_weights()
+        prog_weight = weights["programming"]
+        ai_weight = weights["ai"]
+        product_weight = weights["product"]
 
         # 转换为整数（每天 10 篇）
         total = 10
@@ -183,72 +141,47 @@ class UserPreferenceTracker:
 
         return insights
 
-    def get_clicks_by_date_range(self, start_date: str, end_date: str) -> List[dict]:
-        """获取指定日期范围内的点击记录"""
-        start_dt = datetime.fromisoformat(start_date)
-        end_dt = datetime.fromisoformat(end_date)
-
-        filtered_clicks = []
-        for click in self.data["clickHistory"]:
-            click_dt = datetime.fromisoformat(click["timestamp"])
-            if start_dt <= click_dt <= end_dt:
-                filtered_clicks.append(click)
+    def iter_clicks_by_date_range(self, start_date: str = None, end_date: str = None,
+                                  include_archived: bool = False) -> Iterator[dict]:
+        """
+        按时间顺序逐条产出指定日期范围内的点击记录，调用方可以随时停止；
+        include_archived 时先读归档（只打开时间范围相交的归档文件）
+        """
+        if include_archived:
+            yield from self.archive.iter_range(start_date, end_date)
+        yield from self.index.iter_range(start_date, end_date)
 
-        return filtered_clicks
+    def get_clicks_by_date_range(self, start_date: str, end_date: str, include_archived: bool = False) -> List[dict]:
+        """获取指定日期范围内的点击记录（时间索引上二分查找起止位置）"""
+        return list(self.iter_clicks_by_date_range(start_date, end_date, include_archived))
 
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
         total_clicks = len(self.data["clickHistory"])
 
-        # 计算最近的点击（最近 30 天）
+        # 计算最近的点击（最近 30 天，滑动窗口计数）
         thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_clicks = [
-            click for click in self.data["clickHistory"]
-            if datetime.fromisoformat(click["timestamp"]) > thirty_days_ago
-        ]
 
         return {
             "totalClicks": total_clicks,
-            "recentClicks30Days": len(recent_clicks),
-            "totalTopics": len([t for t in self.data["preferences"]["topics"].values() if t > 0]),
-            "activeSources": len([s for s in self.data["preferences"]["sources"].values() if s > 0])
+            "recentClicks30Days": self.index.count_since(thirty_days_ago),
+            "totalTopics": self.aggregates.active_topics,
+            "activeSources": self.aggregates.active_sources
         }
 
     def archive_old_clicks(self, days: int = 365) -> str:
-        """归档旧点击记录到单独文件"""
+        """归档旧点击记录到压缩的归档文件（user_preferences_archive/）"""
         cutoff_date = datetime.now() - timedelta(days=days)
-        archive_file = PREFERENCES_FILE.replace(".json", f"_archive_{cutoff_date.strftime('%Y%m%d')}.json")
 
-        # 分离旧记录和新记录
-        old_clicks = []
-        new_clicks = []
+        # 以快照和点击日志的最新内容为准；其他进程同时保存过快照时重新读取再归档，
+        # 归档期间其他进程追加的点击保留在日志中
+        data, entry = self.archive.archive(self.store, cutoff_date)
+        self.data = data
 
-        for click in self.data["clickHistory"]:
-            click_dt = datetime.fromisoformat(click["timestamp"])
-            if click_dt < cutoff_date:
-                old_clicks.append(click)
-            else:
-                new_clicks.append(click)
-
-        if not old_clicks:
+        if entry is None:
             return f"没有需要归档的旧数据（{days} 天前）"
 
-        # 创建归档文件
-        archive_data = {
-            "archiveDate": datetime.now().isoformat(),
-            "cutoffDate": cutoff_date.isoformat(),
-            "archivedClicks": old_clicks,
-            "count": len(old_clicks)
-        }
-
-        with open(archive_file, 'w', encoding='utf-8') as f:
-            json.dump(archive_data, f, ensure_ascii=False, indent=2)
-
-        # 更新主文件
-        self.data["clickHistory"] = new_clicks
-        self.save_preferences()
-
-        return f"✅ 已归档 {len(old_clicks)} 条旧记录到 {archive_file}"
+        return f"✅ 已归档 {entry['count']} 条旧记录到 {os.path.join(self.archive.directory, entry['file'])}"
 
 def main():
     """测试代码"""